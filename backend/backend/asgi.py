@@ -1,7 +1,8 @@
 """!
 @brief Point d'entrée ASGI pour les serveurs web asynchrones (Uvicorn, Daphne).
 
-Permet de gérer des connexions asynchrones (WebSockets) si nécessaire dans le futur.
+Route les requêtes HTTP vers Django et les connexions WebSocket vers
+les consumers Channels de l'application `planning_poker`.
 Expose l'application callable `application`.
 """
 
@@ -11,4 +12,15 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
\ No newline at end of file
+# Initialise Django avant d'importer les consumers (qui dépendent des modèles)
+django_asgi_app = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+
+from planning_poker.routing import websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    'http': django_asgi_app,
+    'websocket': AllowedHostsOriginValidator(URLRouter(websocket_urlpatterns)),
+})
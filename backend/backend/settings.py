@@ -11,6 +11,7 @@ variables sensibles depuis un fichier `.env`.
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Chargement des variables d'environnement
 load_dotenv()
@@ -40,6 +41,9 @@ CORS_ALLOWED_ORIGINS = os.environ.get('CORS_ORIGINS', '').split(',')
 
 ## @brief Applications activées dans ce projet.
 INSTALLED_APPS = [
+    # Serveur ASGI : doit précéder staticfiles pour que `runserver` gère les WebSockets
+    'daphne',
+
     # Applications Django de base
     'django.contrib.admin',
     'django.contrib.auth',
@@ -51,12 +55,15 @@ INSTALLED_APPS = [
     # Applications tierces
     'rest_framework', #< Pour l'API REST
     'corsheaders',    #< Pour gérer les requêtes du Front React
+    'channels',       #< Pour le temps réel (WebSockets)
 
     # Applications locales
     'planning_poker', #< Notre application principale
 ]
 
+## @brief Chaîne des middlewares. `MetricsMiddleware` est en tête pour mesurer toute la requête.
 MIDDLEWARE = [
+    'planning_poker.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware', 
@@ -86,19 +93,220 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'backend.wsgi.application'
 
+## @brief Application ASGI (HTTP + WebSocket via Django Channels).
+ASGI_APPLICATION = 'backend.asgi.application'
+
+# ==============================================================================
+# API REST (DJANGO REST FRAMEWORK)
+# ==============================================================================
+
+## @brief Configuration de DRF : JSON rendu et lu par orjson, MessagePack si le client le demande
+## (`Accept: application/msgpack`), interface navigable seulement en mode debug.
+## Voir `planning_poker/renderers.py`.
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'planning_poker.renderers.ORJSONRenderer',
+        'planning_poker.renderers.MessagePackRenderer',
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'planning_poker.renderers.ORJSONParser',
+        'planning_poker.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# ==============================================================================
+# TEMPS RÉEL (DJANGO CHANNELS)
+# ==============================================================================
+
+## @brief Couche de messages utilisée pour diffuser les événements de jeu.
+## En mémoire par défaut (un seul processus) ; définir `CHANNEL_REDIS_URL`
+## dès que plusieurs workers servent l'application.
+if os.environ.get('CHANNEL_REDIS_URL'):
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {'hosts': [os.environ['CHANNEL_REDIS_URL']]},
+        }
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}
+    }
+
+
+# ==============================================================================
+# CACHE
+# ==============================================================================
+
+## @brief Cache Django (décompte des votes par session).
+## En mémoire locale par défaut ; définir `CACHE_REDIS_URL` pour le partager entre workers.
+if os.environ.get('CACHE_REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['CACHE_REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+
+## @brief Durée de vie (en secondes) du décompte des votes d'une session dans le cache.
+TALLY_TIMEOUT = int(os.environ.get('TALLY_TIMEOUT', 3600))
+
+## @brief Durée de vie (en secondes) d'une réponse du cache de réponses (détail de session, liste
+## des joueurs) ; 0 désactive ce cache. Voir `planning_poker/response_cache.py`.
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+
+## @brief Attente maximale (en secondes) du calcul simultané d'une réponse identique avant de la calculer soi-même.
+## La coalescence agit sous ASGI (daphne, un thread par requête pour les vues synchrones) et sous
+## WSGI à threads (`gunicorn --threads N`) ; des workers WSGI à un seul thread ne traitent qu'une
+## requête à la fois.
+SINGLE_FLIGHT_TIMEOUT = float(os.environ.get('SINGLE_FLIGHT_TIMEOUT', 10))
+
+
+## @brief Durée maximale (en secondes) d'attente d'une requête de long-polling.
+LONG_POLL_TIMEOUT = float(os.environ.get('LONG_POLL_TIMEOUT', 25))
+
+## @brief Intervalle (en secondes) de relecture de la version pendant un long-polling, avec la couche
+## de messages en mémoire seulement (écritures des autres workers non diffusées). Avec Redis
+## (`CHANNEL_REDIS_URL`, attendu en production), la version n'est relue qu'à chaque événement.
+LONG_POLL_INTERVAL = float(os.environ.get('LONG_POLL_INTERVAL', 1))
+
+## @brief Écart maximal (en versions) servi en delta par `/sessions/{id}/delta/` ; au-delà, instantané complet.
+CHANGELOG_MAX_DELTA = int(os.environ.get('CHANGELOG_MAX_DELTA', 500))
+
+
+## @brief Nombre de stories écrites par `bulk_create` lors d'un import de backlog.
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 500))
+
+
+## @brief Clé de la permutation des codes de session (rend la suite des codes imprévisible).
+SESSION_CODE_SECRET = os.environ.get('SESSION_CODE_SECRET', SECRET_KEY or '')
+
+## @brief Taux d'occupation des codes numériques au-delà duquel on passe aux codes alphanumériques.
+SESSION_CODE_WIDEN_AT = float(os.environ.get('SESSION_CODE_WIDEN_AT', 0.9))
+
+
+## @brief Durée (en secondes) sans activité après laquelle une session fermée est purgée (30 jours).
+SESSION_CLOSED_TTL = int(os.environ.get('SESSION_CLOSED_TTL', 30 * 24 * 3600))
+
+## @brief Durée (en secondes) sans activité après laquelle une session non fermée est purgée (7 jours).
+SESSION_IDLE_TTL = int(os.environ.get('SESSION_IDLE_TTL', 7 * 24 * 3600))
+
+## @brief Durée (en secondes) sans action après laquelle un joueur est retiré de sa session (1 jour).
+PARTIE_IDLE_TTL = int(os.environ.get('PARTIE_IDLE_TTL', 24 * 3600))
+
+## @brief Durée (en secondes) de conservation du journal des changements (1 heure) ; un client
+## plus en retard reçoit un instantané complet.
+CHANGELOG_TTL = int(os.environ.get('CHANGELOG_TTL', 3600))
+
+## @brief Nombre de lignes supprimées par transaction lors d'une purge.
+PURGE_BATCH_SIZE = int(os.environ.get('PURGE_BATCH_SIZE', 500))
+
+## @brief Période (en secondes) de la purge automatique dans le serveur ; 0 la désactive
+## (utiliser alors `manage.py purge_sessions`, par exemple en cron).
+PURGE_INTERVAL = float(os.environ.get('PURGE_INTERVAL', 0))
+
+
+## @brief Nombre maximal d'opérations acceptées par un appel à `/api/batch/`.
+BATCH_MAX_OPERATIONS = int(os.environ.get('BATCH_MAX_OPERATIONS', 20))
+
+## @brief Si True, un dépassement de budget de requêtes SQL lève une exception (activé par les tests) ;
+## sinon il est seulement journalisé. Voir `planning_poker/budgets.py`.
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'False') == 'True'
+
 
 # ==============================================================================
 # BASE DE DONNÉES
 # ==============================================================================
 
-## @brief Configuration de la base de données.
-## Par défaut utilise SQLite, configurable via variables d'environnement.
-DATABASES = {
-    'default': {
-        'ENGINE': os.environ.get('DB_ENGINE', 'django.db.backends.sqlite3'),
+## @brief Moteur de base de données (SQLite par défaut, ex: `django.db.backends.postgresql`).
+DB_ENGINE = os.environ.get('DB_ENGINE', 'django.db.backends.sqlite3')
+
+## @brief Configuration de la base principale (écritures, et lectures par défaut).
+## SQLite : `DB_NAME` est un fichier relatif à `BASE_DIR`. Serveur (PostgreSQL...) : nom de la base,
+## avec `DB_HOST`, `DB_PORT`, `DB_USER`, `DB_PASSWORD`.
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    _primary = {
+        'ENGINE': DB_ENGINE,
         'NAME': BASE_DIR / os.environ.get('DB_NAME', 'db.sqlite3'),
     }
-}
+    # Profil haute concurrence (instances mono-serveur), appliqué à chaque nouvelle connexion :
+    # - WAL : les lectures ne bloquent plus l'écriture (et inversement) ;
+    # - busy_timeout : un écrivain attend le verrou (file d'attente) au lieu d'échouer ;
+    # - transactions IMMEDIATE : le verrou d'écriture est pris dès le BEGIN. Une transaction
+    #   qui lit puis écrit ne peut plus être refusée (« database is locked ») sans attente
+    #   quand une autre écrit : les écritures concurrentes passent l'une après l'autre.
+    if os.environ.get('SQLITE_TUNING', 'True') == 'True':
+        _primary['OPTIONS'] = {
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': ';'.join([
+                'PRAGMA journal_mode=WAL',
+                'PRAGMA synchronous=NORMAL',  # sûr en WAL : seul le dernier COMMIT peut être perdu sur coupure
+                f"PRAGMA busy_timeout={int(os.environ.get('SQLITE_BUSY_TIMEOUT', 20000))}",  # millisecondes
+                'PRAGMA cache_size=-20000',  # ~20 Mo de pages en cache par connexion
+                'PRAGMA mmap_size=134217728',  # lectures via mmap (128 Mo)
+                'PRAGMA temp_store=MEMORY',
+            ]),
+        }
+else:
+    _primary = {
+        'ENGINE': DB_ENGINE,
+        'NAME': os.environ.get('DB_NAME', 'planning_poker'),
+        'HOST': os.environ.get('DB_HOST', 'localhost'),
+        'PORT': os.environ.get('DB_PORT', ''),
+        'USER': os.environ.get('DB_USER', ''),
+        'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+        # Connexions persistantes (secondes, 0 = une connexion par requête), vérifiées avant réutilisation
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+        'OPTIONS': {'connect_timeout': int(os.environ.get('DB_CONNECT_TIMEOUT', 5))},
+    }
+    # Pool de connexions (PostgreSQL avec psycopg 3 et psycopg_pool) : remplace les connexions persistantes.
+    # Chaque connexion est vérifiée (`check`) avant d'être prêtée.
+    if int(os.environ.get('DB_POOL_MAX_SIZE', 0)) > 0:
+        try:
+            import psycopg  # noqa: F401
+            from psycopg_pool import ConnectionPool
+        except ImportError:
+            raise ImproperlyConfigured(
+                "DB_POOL_MAX_SIZE demande un pool de connexions : installer psycopg 3 avec "
+                "psycopg_pool (`pip install \"psycopg[binary,pool]\"`, voir requirements.txt)."
+            )
+
+        _primary['CONN_MAX_AGE'] = 0
+        _primary['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ['DB_POOL_MAX_SIZE']),
+            'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'check': ConnectionPool.check_connection,
+        }
+
+## @brief Configuration des bases de données : la principale (`default`) et ses réplicas
+## en lecture seule (`DB_REPLICA_HOSTS="hote1,hote2:5433"`), mêmes identifiants que la principale.
+DATABASES = {'default': _primary}
+for _numero, _hote in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    _hote, _, _port = _hote.strip().partition(':')
+    DATABASES[f'replica_{_numero}'] = {
+        **_primary,
+        'HOST': _hote,
+        'PORT': _port or _primary.get('PORT', ''),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+## @brief Alias des réplicas en lecture (voir `planning_poker/routers.py`).
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+## @brief Routeur : lectures de polling sur les réplicas, écritures et lectures de ses propres écritures sur la principale.
+DATABASE_ROUTERS = ['planning_poker.routers.PrimaryReplicaRouter']
+
+## @brief Durée (en secondes) pendant laquelle les lectures d'une session modifiée restent sur la principale
+## (doit couvrir le retard de réplication). Partagé entre workers seulement avec `CACHE_REDIS_URL`.
+REPLICA_PIN_SECONDS = float(os.environ.get('REPLICA_PIN_SECONDS', 5))
 
 
 # ==============================================================================
@@ -8,7 +8,7 @@ Il utilise un routeur REST Framework pour l'API.
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from planning_poker import views
+from planning_poker import async_views, metrics, views
 
 ## @brief Routeur principal pour l'API REST.
 ## Gère automatiquement les URLs pour les ViewSets enregistrés.
@@ -21,5 +21,14 @@ router.register(r'parties', views.PartieViewSet, basename='partie')
 ## @brief Liste des points d'entrée URL du projet.
 urlpatterns = [
     path("admin/", admin.site.urls), #< Interface d'administration Django
+    path('metrics', metrics.metrics_view, name='metrics'), #< Métriques Prometheus
+    path('api/sessions/<str:pk>/changes/', views.session_changes, name='session-changes'), #< Long-polling (vue asynchrone)
+    # Vues asynchrones des actions de jeu fréquentes (mêmes contrats que les ViewSets, voir async_views.py)
+    path('api/async/parties/vote_card/', async_views.vote_card, name='async-partie-vote-card'),
+    path('api/async/parties/join_partie/', async_views.join_partie, name='async-partie-join-partie'),
+    path('api/async/parties/raz_vote/', async_views.raz_vote, name='async-partie-raz-vote'),
+    path('api/async/sessions/<str:pk>/state/', async_views.state, name='async-session-state'),
+    path('api/async/sessions/<str:pk>/progress/', async_views.progress, name='async-session-progress'),
+    path('api/batch/', views.batch, name='batch'), #< Plusieurs actions de jeu en une requête
     path('api/', include(router.urls)), #< Préfixe '/api/' pour toutes les routes de l'application
 ]
\ No newline at end of file
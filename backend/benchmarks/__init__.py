@@ -0,0 +1,14 @@
+"""!
+@brief Suite de benchmarks des endpoints de l'API Planning Poker.
+
+Mesure, pour chaque endpoint et chaque jeu de données (joueurs par salle × sessions
+en base), la latence (percentiles) et le nombre de requêtes SQL, via `APIClient`
+(sans serveur HTTP) sur une base de test jetable. Le rapport JSON produit peut être
+comparé à un rapport précédent pour détecter les régressions.
+
+Utilisation (depuis `backend/`) :
+@code
+python -m benchmarks --players 10,100,1000 --sessions 1000,100000 --output bench.json
+python -m benchmarks --players 10,100 --sessions 1000 --compare bench.json
+@endcode
+"""
@@ -0,0 +1,69 @@
+"""!
+@brief Point d'entrée `python -m benchmarks` (voir `benchmarks/__init__.py`).
+
+Les mesures tournent sur une base de test créée pour l'occasion puis détruite :
+la base de développement n'est jamais touchée.
+"""
+
+import argparse
+import os
+import sys
+
+
+def _int_list(valeur):
+    return [int(v) for v in valeur.split(',') if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmarks des endpoints de l'API.")
+    parser.add_argument('--players', type=_int_list, default=[10, 100, 1000], help="Tailles de salle (ex: 10,100,1000).")
+    parser.add_argument('--sessions', type=_int_list, default=[1000], help="Sessions en base (ex: 1000,100000).")
+    parser.add_argument('--iterations', type=int, default=50, help="Appels chronométrés par endpoint.")
+    parser.add_argument('--endpoints', type=lambda v: v.split(','), help="Endpoints à mesurer (par défaut tous).")
+    parser.add_argument('--output', default='benchmark.json', help="Fichier du rapport JSON.")
+    parser.add_argument('--compare', help="Rapport de référence : affiche l'écart et sort en erreur si régression.")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Hausse de p50 tolérée avant régression (0.2 = 20 %%).")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    from . import report
+    from .runner import ENDPOINTS, run_suite
+
+    inconnus = set(args.endpoints or []) - set(ENDPOINTS)
+    if inconnus:
+        parser.error(f"endpoints inconnus : {', '.join(sorted(inconnus))}")
+
+    setup_test_environment()
+    nom_base = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        resultats = run_suite(args.players, args.sessions, args.iterations, args.endpoints, log=print)
+        rapport = report.build_report(resultats, {
+            'players': args.players, 'sessions': args.sessions, 'iterations': args.iterations,
+        })
+    finally:
+        connection.creation.destroy_test_db(nom_base, verbosity=0)
+        teardown_test_environment()
+
+    report.write_report(rapport, args.output)
+    print(f"Rapport écrit dans {args.output}")
+
+    if args.compare:
+        lignes = report.compare(rapport, report.load_report(args.compare), args.tolerance)
+        for l in lignes:
+            marque = 'RÉGRESSION' if l['regression'] else 'ok'
+            print(f"{l['endpoint']:<14} joueurs={l['players']:<6} sessions={l['sessions']:<7} "
+                  f"p50 {l['base_p50_ms']:.2f} -> {l['p50_ms']:.2f}ms (x{l['ratio']:.2f}) "
+                  f"requêtes {l['base_queries']} -> {l['queries']}  {marque}")
+        if any(l['regression'] for l in lignes):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
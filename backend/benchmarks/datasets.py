@@ -0,0 +1,59 @@
+"""!
+@brief Construction des jeux de données des benchmarks.
+
+Réutilise les usines de `tests/factories.py` ; les gros volumes sont insérés par
+`bulk_create` (les usines ne servent alors qu'à construire les objets en mémoire).
+"""
+
+from planning_poker.codes import ALNUM, encode
+from planning_poker.models import Partie, Session, Story, Vote
+from tests.factories import SessionFactory, PartieFactory
+
+## @brief Nombre de stories du backlog de la salle mesurée.
+NB_STORIES = 10
+
+## @brief Cartes jouées à tour de rôle par les joueurs simulés.
+CARTES = ['1', '2', '3', '5', '8', '13']
+
+
+def _stories(n):
+    return [{'titre': f'Story {i}', 'contenu': f'Description {i}'} for i in range(n)]
+
+
+def fill_sessions(total, batch_size=2000):
+    """!
+    @brief Complète la base jusqu'à `total` sessions « de fond » (3 stories chacune, sans joueur).
+
+    Les codes sont fixés (préfixe 'Z') pour ne pas solliciter l'allocateur de codes.
+
+    @param total Nombre de sessions visé (celles déjà présentes sont conservées).
+    """
+    existantes = Session.objects.filter(id_session__startswith='Z').count()
+    for debut in range(existantes, total, batch_size):
+        fin = min(debut + batch_size, total)
+        sessions = [
+            SessionFactory.build(id_session='Z' + encode(i, ALNUM)[1:], stories=_stories(3))
+            for i in range(debut, fin)
+        ]
+        Session.objects.bulk_create(sessions)
+        Story.objects.bulk_create(
+            Story.from_json(session, position, item)
+            for session in sessions for position, item in enumerate(session.stories)
+        )
+
+
+def build_room(nb_joueurs, mode_de_jeu='average', nb_stories=NB_STORIES):
+    """!
+    @brief Crée la salle mesurée : une session de `nb_stories` stories et `nb_joueurs` joueurs ayant voté.
+
+    @return La session créée.
+    """
+    session = SessionFactory(stories=_stories(nb_stories), mode_de_jeu=mode_de_jeu, status='in_progress')
+    joueurs = [PartieFactory.build(id_session=session, username=f'joueur{i}') for i in range(nb_joueurs)]
+    Partie.objects.bulk_create(joueurs, batch_size=1000)
+    Vote.objects.bulk_create(
+        (Vote(session=session, round=session.round, username=j.username, carte=CARTES[i % len(CARTES)])
+         for i, j in enumerate(joueurs)),
+        batch_size=1000,
+    )
+    return session
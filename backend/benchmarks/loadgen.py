@@ -0,0 +1,381 @@
+"""!
+@brief Générateur de charge : simule des salles de Planning Poker complètes contre un serveur lancé.
+
+Chaque salle rejoue le cycle de vie de `partie.jsx` : création de la session, puis pour
+chaque joueur `join_partie` et chargement de la session ; pour chaque story, les joueurs
+interrogent l'état (`--poll`) toutes les `--poll-interval` secondes, votent après un temps
+de réflexion, appellent `close_story` dès que tout le monde a voté puis `raz_vote` pour
+passer à la suite ; à la fin, chaque joueur appelle `close_session` puis `fin_partie`.
+
+Toutes les salles démarrent ensemble (ou étalées sur `--ramp` secondes), comme au pic
+du lundi matin. Le client HTTP/1.1 est minimal (asyncio pur, une connexion keep-alive
+par joueur) pour que le générateur ne soit pas lui-même le goulot d'étranglement.
+
+Utilisation (serveur lancé à part, ex: `daphne backend.asgi:application` ou gunicorn) :
+@code
+python -m benchmarks.loadgen --url http://127.0.0.1:8000 --rooms 200 --players 8 --output charge.json
+@endcode
+
+Comparaison des vues asynchrones aux ViewSets synchrones, à charge identique (même graine) :
+@code
+python -m benchmarks.loadgen --api rest --output rest.json
+python -m benchmarks.loadgen --api async --baseline rest.json
+@endcode
+La seconde commande sort en erreur si le débit passe sous celui de la référence (à
+`--tolerance` près) ou si le taux d'erreurs augmente. À lancer sous un serveur ASGI :
+sous WSGI, les vues asynchrones n'apportent rien.
+
+Effet du profil SQLite haute concurrence : lancer le serveur avec `SQLITE_TUNING=False`,
+puis avec le profil (par défaut), sur une base neuve à chaque fois, et comparer les erreurs
+« database is locked » et le nombre de salles terminées.
+
+@note Les erreurs 500 ne sont classées par cause (ex: "database is locked") que si le
+      serveur tourne avec `DEBUG=True` : sinon le corps de la réponse ne la mentionne pas.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlencode, urlsplit
+
+from .report import percentile, throughput_parity
+
+## @brief Messages d'erreur serveur reconnus dans le corps des réponses 500.
+KNOWN_ERRORS = ('database is locked', 'database table is locked', 'deadlock', 'could not serialize', 'too many connections')
+
+## @brief Opérations servies aussi par une vue asynchrone, sous `/api/async/` (option `--api async`).
+ASYNC_OPERATIONS = frozenset({'join_partie', 'vote_card', 'raz_vote', 'poll_state'})
+
+## @brief Cartes jouées par les joueurs simulés.
+CARTES = ['1', '2', '3', '5', '8', '13']
+
+
+class HttpError(Exception):
+    """!
+    @brief Réponse HTTP en erreur (statut >= 400), avec sa cause lisible.
+    """
+
+    def __init__(self, status, kind):
+        super().__init__(f"HTTP {status}: {kind}")
+        self.status = status
+        self.kind = kind
+
+
+class HttpClient:
+    """!
+    @brief Client HTTP/1.1 minimal sur une connexion keep-alive (rouverte au besoin).
+
+    Gère les corps `Content-Length` et `Transfer-Encoding: chunked`, ce qui suffit
+    pour Django derrière daphne, uvicorn ou gunicorn.
+    """
+
+    def __init__(self, base_url, timeout=30):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+            self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, params=None):
+        """!
+        @brief Envoie une requête et renvoie `(statut, corps)`.
+
+        Une connexion fermée par le serveur entre deux requêtes est rouverte une fois.
+
+        @param method Méthode HTTP.
+        @param path Chemin (sans le préfixe de l'URL de base).
+        @param body Objet JSON-sérialisable optionnel.
+        @param params Paramètres de query string optionnels.
+        """
+        if params:
+            path = f"{path}?{urlencode(params)}"
+        donnees = b'' if body is None else json.dumps(body).encode()
+        entetes = [
+            f"{method} {self.prefix}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            "Accept: application/json",
+            f"Content-Length: {len(donnees)}",
+        ]
+        if body is not None:
+            entetes.append("Content-Type: application/json")
+        requete = ('\r\n'.join(entetes) + '\r\n\r\n').encode() + donnees
+
+        for tentative in range(2):
+            if self.writer is None:
+                await self._connect()
+            try:
+                self.writer.write(requete)
+                await self.writer.drain()
+                return await asyncio.wait_for(self._read_response(), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                if tentative:
+                    raise
+
+    async def _read_response(self):
+        ligne = await self.reader.readuntil(b'\r\n')
+        statut = int(ligne.split()[1])
+        entetes = {}
+        while True:
+            ligne = await self.reader.readuntil(b'\r\n')
+            if ligne == b'\r\n':
+                break
+            nom, _, valeur = ligne.decode('latin-1').partition(':')
+            entetes[nom.strip().lower()] = valeur.strip()
+
+        if entetes.get('transfer-encoding', '').lower() == 'chunked':
+            corps = bytearray()
+            while True:
+                taille = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if taille == 0:
+                    await self.reader.readuntil(b'\r\n')
+                    break
+                corps += await self.reader.readexactly(taille)
+                await self.reader.readexactly(2)
+            corps = bytes(corps)
+        elif 'content-length' in entetes:
+            corps = await self.reader.readexactly(int(entetes['content-length']))
+        elif statut in (204, 304):
+            corps = b''
+        else:
+            corps = await self.reader.read()
+            entetes['connection'] = 'close'
+
+        if entetes.get('connection', '').lower() == 'close':
+            await self.close()
+        return statut, corps
+
+
+class Stats:
+    """!
+    @brief Latences et erreurs collectées, par opération.
+    """
+
+    def __init__(self):
+        self.latences = defaultdict(list)
+        self.erreurs = defaultdict(Counter)
+
+    async def call(self, client, operation, method, path, body=None, params=None):
+        """!
+        @brief Exécute une requête en la chronométrant ; lève `HttpError` si elle échoue.
+
+        @return Le corps JSON décodé (ou None si vide).
+        """
+        debut = time.perf_counter()
+        try:
+            statut, corps = await client.request(method, path, body, params)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as exc:
+            self.latences[operation].append((time.perf_counter() - debut) * 1000)
+            self.erreurs[operation][type(exc).__name__] += 1
+            raise HttpError(0, type(exc).__name__) from exc
+        self.latences[operation].append((time.perf_counter() - debut) * 1000)
+
+        if statut >= 400:
+            texte = corps.decode('utf-8', 'replace').lower()
+            kind = next((e for e in KNOWN_ERRORS if e in texte), f"HTTP {statut}")
+            self.erreurs[operation][kind] += 1
+            raise HttpError(statut, kind)
+        return json.loads(corps) if corps else None
+
+    def summary(self, duree):
+        """!
+        @brief Résumé global et par opération : débit, taux d'erreur, latences extrêmes.
+        """
+        operations = {}
+        for operation, latences in sorted(self.latences.items()):
+            erreurs = sum(self.erreurs[operation].values())
+            operations[operation] = {
+                'requests': len(latences),
+                'errors': erreurs,
+                'error_rate': erreurs / len(latences),
+                'error_kinds': dict(self.erreurs[operation]),
+                'p50_ms': percentile(latences, 50),
+                'p95_ms': percentile(latences, 95),
+                'p99_ms': percentile(latences, 99),
+                'max_ms': max(latences),
+            }
+        total = sum(o['requests'] for o in operations.values())
+        erreurs = sum(o['errors'] for o in operations.values())
+        toutes = [l for latences in self.latences.values() for l in latences]
+        return {
+            'duration_s': duree,
+            'requests': total,
+            'throughput_rps': total / duree if duree else 0.0,
+            'errors': erreurs,
+            'error_rate': erreurs / total if total else 0.0,
+            'p50_ms': percentile(toutes, 50),
+            'p99_ms': percentile(toutes, 99),
+            'max_ms': max(toutes, default=0.0),
+            'operations': operations,
+        }
+
+
+def _api(args, operation):
+    """!
+    @brief Préfixe d'URL d'une opération selon l'implémentation visée (`--api`).
+    """
+    return '/api/async' if args.api == 'async' and operation in ASYNC_OPERATIONS else '/api'
+
+
+async def _player(args, stats, id_session, username, barriere, rng):
+    """!
+    @brief Rejoue le parcours d'un joueur dans sa salle.
+
+    @param barriere `asyncio.Barrier` de la salle : les joueurs passent ensemble à la story suivante.
+    """
+    client = HttpClient(args.url)
+    api = '/api'
+    try:
+        await stats.call(client, 'join_partie', 'POST', f'{_api(args, "join_partie")}/parties/join_partie/', {'id_session': id_session, 'username': username})
+        session = await stats.call(client, 'session_detail', 'GET', f'{api}/sessions/{id_session}/')
+
+        for story_index in range(len(session['stories'])):
+            await asyncio.sleep(rng.uniform(0, args.think))
+            await stats.call(client, 'vote_card', 'POST', f'{_api(args, "vote_card")}/parties/vote_card/',
+                             {'id_session': id_session, 'username': username, 'carte_choisie': rng.choice(CARTES)})
+
+            # Polling jusqu'à ce que toute la salle ait voté (comme l'interface avant la clôture)
+            while True:
+                if args.poll == 'parties':
+                    joueurs = await stats.call(client, 'poll_parties', 'GET', f'{api}/parties/', params={'id_session': id_session})
+                else:
+                    joueurs = (await stats.call(client, 'poll_state', 'GET', f'{_api(args, "poll_state")}/sessions/{id_session}/state/'))['joueurs']
+                if len(joueurs) >= args.players and all(j['a_vote'] for j in joueurs):
+                    break
+                await asyncio.sleep(args.poll_interval)
+
+            await stats.call(client, 'close_story', 'POST', f'{api}/sessions/{id_session}/close_story/', {'story_index': story_index})
+            await barriere.wait()
+            await stats.call(client, 'raz_vote', 'POST', f'{_api(args, "raz_vote")}/parties/raz_vote/', {'id_session': id_session, 'username': username})
+            await barriere.wait()
+
+        await stats.call(client, 'close_session', 'POST', f'{api}/sessions/{id_session}/close_session/', {'status': 'closed'})
+        await stats.call(client, 'fin_partie', 'POST', f'{api}/parties/fin_partie/', {'id_session': id_session, 'username': username})
+    finally:
+        await client.close()
+
+
+async def _room(args, stats, numero, rng):
+    """!
+    @brief Crée une salle puis lance ses joueurs en parallèle.
+
+    @return True si la salle est allée au bout sans erreur.
+    """
+    await asyncio.sleep(rng.uniform(0, args.ramp))
+    client = HttpClient(args.url)
+    try:
+        session = await stats.call(client, 'create_session', 'POST', '/api/sessions/', {
+            'titre': f'Salle {numero}',
+            'mode_de_jeu': args.mode,
+            'stories': [{'titre': f'Story {i}', 'contenu': ''} for i in range(args.stories)],
+        })
+    except HttpError:
+        return False
+    finally:
+        await client.close()
+
+    barriere = asyncio.Barrier(args.players)
+
+    async def joueur(i):
+        try:
+            await _player(args, stats, session['id_session'], f'joueur{i}', barriere, random.Random(rng.random()))
+        except BaseException:
+            # Un joueur en échec bloquerait les autres à la barrière : on arrête la salle
+            await barriere.abort()
+            raise
+
+    resultats = await asyncio.gather(*(joueur(i) for i in range(args.players)), return_exceptions=True)
+    return not any(isinstance(r, BaseException) for r in resultats)
+
+
+async def run_load(args):
+    """!
+    @brief Lance toutes les salles et renvoie le résumé (voir `Stats.summary`).
+    """
+    stats = Stats()
+    rng = random.Random(args.seed)
+    debut = time.perf_counter()
+
+    async def salle(numero):
+        try:
+            return await asyncio.wait_for(_room(args, stats, numero, random.Random(rng.random())), args.room_timeout)
+        except asyncio.TimeoutError:
+            return False
+
+    salles = await asyncio.gather(*(salle(n) for n in range(args.rooms)))
+    resume = stats.summary(time.perf_counter() - debut)
+    resume['rooms'] = args.rooms
+    resume['rooms_completed'] = sum(salles)
+    resume['params'] = {k: v for k, v in vars(args).items() if k != 'output'}
+    return resume
+
+
+def _print_summary(resume):
+    print(f"{resume['rooms_completed']}/{resume['rooms']} salles terminées en {resume['duration_s']:.1f}s : "
+          f"{resume['requests']} requêtes, {resume['throughput_rps']:.1f} req/s, "
+          f"{resume['error_rate']:.2%} d'erreurs, p50={resume['p50_ms']:.1f}ms p99={resume['p99_ms']:.1f}ms")
+    for nom, o in resume['operations'].items():
+        erreurs = ', '.join(f"{k}: {v}" for k, v in o['error_kinds'].items())
+        print(f"  {nom:<15} {o['requests']:>7} req  p50={o['p50_ms']:8.1f}ms  p95={o['p95_ms']:8.1f}ms  "
+              f"p99={o['p99_ms']:8.1f}ms  max={o['max_ms']:8.1f}ms  erreurs={o['errors']}" + (f" ({erreurs})" if erreurs else ''))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loadgen', description="Simule des salles de Planning Poker complètes.")
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help="URL de base du serveur.")
+    parser.add_argument('--rooms', type=int, default=50, help="Nombre de salles simultanées.")
+    parser.add_argument('--players', type=int, default=8, help="Joueurs par salle.")
+    parser.add_argument('--stories', type=int, default=3, help="Stories par salle.")
+    parser.add_argument('--mode', default='average', help="Mode de jeu des salles.")
+    parser.add_argument('--poll', choices=['state', 'parties'], default='state',
+                        help="Endpoint interrogé : état de jeu (interface actuelle) ou liste des joueurs (ancienne interface).")
+    parser.add_argument('--poll-interval', type=float, default=1.0, help="Secondes entre deux interrogations.")
+    parser.add_argument('--think', type=float, default=2.0, help="Temps de réflexion maximal avant un vote (secondes).")
+    parser.add_argument('--ramp', type=float, default=0.0, help="Étalement du démarrage des salles (secondes).")
+    parser.add_argument('--room-timeout', type=float, default=300.0, help="Durée maximale d'une salle (secondes).")
+    parser.add_argument('--seed', type=int, default=0, help="Graine aléatoire (runs reproductibles).")
+    parser.add_argument('--api', choices=['rest', 'async'], default='rest',
+                        help="Implémentation visée : ViewSets REST ou vues asynchrones (/api/async/) quand elles existent.")
+    parser.add_argument('--output', help="Fichier JSON où écrire le résumé.")
+    parser.add_argument('--baseline', help="Résumé de référence : sort en erreur si le débit est inférieur.")
+    parser.add_argument('--tolerance', type=float, default=0.05, help="Baisse de débit tolérée face à la référence (0.05 = 5 %%).")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    resume = asyncio.run(run_load(args))
+    _print_summary(resume)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(resume, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            parite = throughput_parity(resume, json.load(f), args.tolerance)
+        print(f"Débit {parite['base_throughput_rps']:.1f} -> {parite['throughput_rps']:.1f} req/s "
+              f"(x{parite['ratio']:.2f}), erreurs {parite['base_error_rate']:.2%} -> {parite['error_rate']:.2%}  "
+              + ('ok' if parite['ok'] else 'RÉGRESSION'))
+        if not parite['ok']:
+            return 1
+    return 0 if resume['errors'] == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""!
+@brief Statistiques, rapport JSON et comparaison de deux rapports.
+"""
+
+import datetime
+import json
+import platform
+import subprocess
+
+import django
+from django.db import connection
+
+## @brief Percentiles publiés pour chaque endpoint.
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(valeurs, p):
+    """!
+    @brief Percentile `p` (0-100) par interpolation linéaire entre les rangs.
+    """
+    if not valeurs:
+        return 0.0
+    triees = sorted(valeurs)
+    rang = (len(triees) - 1) * p / 100
+    bas = int(rang)
+    haut = min(bas + 1, len(triees) - 1)
+    return triees[bas] + (triees[haut] - triees[bas]) * (rang - bas)
+
+
+def summarize(latences, requetes, erreurs=0):
+    """!
+    @brief Résume une série de mesures.
+
+    @param latences Durées des appels, en millisecondes.
+    @param requetes Nombre de requêtes SQL de chaque appel.
+    @param erreurs Nombre de réponses en erreur (statut >= 400).
+    @return Dictionnaire `{n, errors, mean_ms, p50_ms, ..., max_ms, queries, queries_max}`.
+    """
+    stats = {
+        'n': len(latences),
+        'errors': erreurs,
+        'mean_ms': sum(latences) / len(latences) if latences else 0.0,
+    }
+    for p in PERCENTILES:
+        stats[f'p{p}_ms'] = percentile(latences, p)
+    stats['max_ms'] = max(latences, default=0.0)
+    # Le nombre de requêtes est déterministe : la médiane écarte un éventuel appel atypique
+    stats['queries'] = int(percentile(requetes, 50))
+    stats['queries_max'] = max(requetes, default=0)
+    return stats
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(resultats, params):
+    """!
+    @brief Assemble le rapport : contexte d'exécution (pour juger de la comparabilité) et résultats.
+    """
+    return {
+        'meta': {
+            'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'machine': platform.machine(),
+            'params': params,
+        },
+        'results': resultats,
+    }
+
+
+def write_report(report, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(report, baseline, tolerance=0.2):
+    """!
+    @brief Compare un rapport à un rapport de référence, endpoint par endpoint.
+
+    Une régression est signalée si la médiane de latence dépasse celle de la référence
+    de plus de `tolerance` (20 % par défaut), ou si le nombre de requêtes SQL augmente.
+    Seuls les couples (endpoint, joueurs, sessions) présents dans les deux rapports sont comparés.
+
+    @return Liste de `{endpoint, players, sessions, p50_ms, base_p50_ms, ratio, queries, base_queries, regression}`.
+    """
+    reference = {(r['endpoint'], r['players'], r['sessions']): r for r in baseline['results']}
+    lignes = []
+    for r in report['results']:
+        base = reference.get((r['endpoint'], r['players'], r['sessions']))
+        if base is None:
+            continue
+        ratio = r['p50_ms'] / base['p50_ms'] if base['p50_ms'] else 1.0
+        lignes.append({
+            'endpoint': r['endpoint'],
+            'players': r['players'],
+            'sessions': r['sessions'],
+            'p50_ms': r['p50_ms'],
+            'base_p50_ms': base['p50_ms'],
+            'ratio': ratio,
+            'queries': r['queries'],
+            'base_queries': base['queries'],
+            'regression': ratio > 1 + tolerance or r['queries'] > base['queries'],
+        })
+    return lignes
+
+
+def throughput_parity(resume, reference, tolerance=0.05):
+    """!
+    @brief Compare deux résumés du générateur de charge (`loadgen`) joués à charge identique.
+
+    Sert à vérifier qu'une implémentation (ex: vues asynchrones) tient au moins le débit
+    de la référence (ex: ViewSets synchrones), à `tolerance` près, sans plus d'erreurs.
+
+    @return `{throughput_rps, base_throughput_rps, ratio, error_rate, base_error_rate, ok}`.
+    """
+    base = reference['throughput_rps']
+    ratio = resume['throughput_rps'] / base if base else 1.0
+    return {
+        'throughput_rps': resume['throughput_rps'],
+        'base_throughput_rps': base,
+        'ratio': ratio,
+        'error_rate': resume['error_rate'],
+        'base_error_rate': reference['error_rate'],
+        'ok': ratio >= 1 - tolerance and resume['error_rate'] <= reference['error_rate'],
+    }
@@ -0,0 +1,163 @@
+"""!
+@brief Exécution des mesures : un registre d'endpoints et une boucle de mesure par endpoint.
+
+Chaque endpoint est décrit par une fonction `(client, session, i) -> response` enregistrée
+avec `@endpoint(nom)`, éventuellement précédée d'une préparation non chronométrée
+(ex: rouvrir la story avant de la reclôturer).
+"""
+
+import time
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from planning_poker.events import publish
+from planning_poker.models import Story, Vote
+
+from . import datasets
+from .report import summarize
+
+## @brief Registre des endpoints mesurés : nom -> (appel, préparation ou None).
+ENDPOINTS = {}
+
+
+def endpoint(name, prepare=None):
+    """!
+    @brief Décorateur enregistrant un endpoint dans `ENDPOINTS`.
+
+    @param name Nom de l'endpoint dans le rapport.
+    @param prepare Fonction optionnelle `(session, i)` exécutée hors chronométrage avant chaque appel.
+    """
+    def decorator(func):
+        ENDPOINTS[name] = (func, prepare)
+        return func
+    return decorator
+
+
+def _joueur(session, i):
+    return f'joueur{i % session.nb_joueurs}'
+
+
+@endpoint('join_partie')
+def _join_partie(client, session, i):
+    # Retour d'un joueur déjà inscrit : la taille de la salle reste celle du jeu de données
+    return client.post(reverse('partie-join-partie'), {'username': _joueur(session, i), 'id_session': session.pk}, format='json')
+
+
+@endpoint('vote_card')
+def _vote_card(client, session, i):
+    carte = datasets.CARTES[i % len(datasets.CARTES)]
+    return client.post(reverse('partie-vote-card'), {'username': _joueur(session, i), 'id_session': session.pk, 'carte_choisie': carte}, format='json')
+
+
+def _reopen_story(session, i):
+    Story.objects.filter(session=session, position=0).update(valeur_finale=None)
+
+
+@endpoint('close_story', prepare=_reopen_story)
+def _close_story(client, session, i):
+    return client.post(reverse('session-close-story', args=[session.pk]), {'story_index': 0}, format='json')
+
+
+@endpoint('raz_vote')
+def _raz_vote(client, session, i):
+    return client.post(reverse('partie-raz-vote'), {'id_session': session.pk}, format='json')
+
+
+@endpoint('parties_list')
+def _parties_list(client, session, i):
+    return client.get(reverse('partie-list'), {'id_session': session.pk})
+
+
+@endpoint('state')
+def _state(client, session, i):
+    return client.get(reverse('session-state', args=[session.pk]))
+
+
+def _one_vote(session, i):
+    username = _joueur(session, i)
+    Vote.cast(session.pk, username, '5')
+    publish(session.pk, 'vote_card', {'username': username, 'carte_choisie': '5'})
+    session.refresh_from_db(fields=['version'])
+
+
+@endpoint('delta', prepare=_one_vote)
+def _delta(client, session, i):
+    # Client à jour à un vote près : la réponse ne contient qu'un joueur, quelle que soit la salle
+    return client.get(reverse('session-delta', args=[session.pk]), {'since': session.version - 1})
+
+
+@endpoint('progress')
+def _progress(client, session, i):
+    return client.get(reverse('session-progress', args=[session.pk]))
+
+
+@endpoint('session_list')
+def _session_list(client, session, i):
+    return client.get(reverse('session-list'))
+
+
+@endpoint('lobby')
+def _lobby(client, session, i):
+    return client.get(reverse('session-lobby'))
+
+
+def measure(name, client, session, iterations, warmup=2):
+    """!
+    @brief Mesure un endpoint : latences (ms) et requêtes SQL de chaque appel.
+
+    @param name Nom de l'endpoint (clé de `ENDPOINTS`).
+    @param client Client API.
+    @param session Salle mesurée (avec l'attribut `nb_joueurs`).
+    @param iterations Nombre d'appels chronométrés.
+    @param warmup Nombre d'appels préalables non comptés (caches, connexions...).
+    @return Dictionnaire des statistiques (voir `report.summarize`).
+    """
+    func, prepare = ENDPOINTS[name]
+    latences, requetes, erreurs = [], [], 0
+    for i in range(warmup + iterations):
+        if prepare is not None:
+            prepare(session, i)
+        with CaptureQueriesContext(connection) as ctx:
+            debut = time.perf_counter()
+            response = func(client, session, i)
+            duree = (time.perf_counter() - debut) * 1000
+        if i < warmup:
+            continue
+        latences.append(duree)
+        requetes.append(len(ctx.captured_queries))
+        erreurs += response.status_code >= 400
+    return summarize(latences, requetes, erreurs)
+
+
+def run_suite(players, sessions, iterations, endpoints=None, log=None):
+    """!
+    @brief Lance toutes les mesures sur chaque jeu de données (joueurs × sessions).
+
+    Les sessions de fond sont ajoutées par paliers croissants ; une nouvelle salle est
+    créée pour chaque taille de salle. À appeler sur une base de test (voir `__main__`).
+
+    @param players Tailles de salle (ex: [10, 100, 1000]).
+    @param sessions Nombres de sessions en base (ex: [1000, 100000]).
+    @param iterations Appels chronométrés par endpoint.
+    @param endpoints Noms des endpoints à mesurer (par défaut tous).
+    @param log Fonction optionnelle d'affichage de la progression.
+    @return Liste des résultats `{endpoint, players, sessions, ...statistiques}`.
+    """
+    client = APIClient()
+    resultats = []
+    for nb_sessions in sorted(sessions):
+        datasets.fill_sessions(nb_sessions)
+        for nb_joueurs in players:
+            session = datasets.build_room(nb_joueurs)
+            session.nb_joueurs = nb_joueurs
+            for name in endpoints or ENDPOINTS:
+                stats = measure(name, client, session, iterations)
+                resultats.append({'endpoint': name, 'players': nb_joueurs, 'sessions': nb_sessions, **stats})
+                if log:
+                    log(f"{name:<14} joueurs={nb_joueurs:<6} sessions={nb_sessions:<7} "
+                        f"p50={stats['p50_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms requêtes={stats['queries']}")
+            session.delete()
+    return resultats
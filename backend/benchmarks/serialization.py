@@ -0,0 +1,119 @@
+"""!
+@brief Benchmark des renderers de l'API : taille et temps CPU de rendu par réponse.
+
+Compare le `JSONRenderer` de DRF aux renderers de `planning_poker/renderers.py` (orjson,
+MessagePack) sur les deux réponses les plus lourdes du polling : le détail d'une session
+(backlog complet) et la liste des joueurs d'une salle. Les données sont produites par les
+serializers de l'API sur une base de test jetable ; seul le rendu est chronométré.
+
+Utilisation (depuis `backend/`) :
+@code
+python -m benchmarks.serialization --players 10,100,1000 --stories 10,500 --output rendu.json
+@endcode
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+## @brief Renderers comparés, par nom ; le premier sert de référence aux ratios.
+RENDERERS = {
+    'drf-json': 'rest_framework.renderers.JSONRenderer',
+    'orjson': 'planning_poker.renderers.ORJSONRenderer',
+    'msgpack': 'planning_poker.renderers.MessagePackRenderer',
+}
+
+
+def _int_list(valeur):
+    return [int(v) for v in valeur.split(',') if v]
+
+
+def build_payloads(nb_joueurs, nb_stories):
+    """!
+    @brief Crée une salle et renvoie les données sérialisées de ses réponses de polling.
+
+    @return `{'session-detail': ..., 'partie-list': ...}`, tels que transmis aux renderers.
+    """
+    from planning_poker.models import Partie
+    from planning_poker.serializers import PartieSerializer, SessionSerializer
+
+    from . import datasets
+
+    session = datasets.build_room(nb_joueurs, nb_stories=nb_stories)
+    return {
+        'session-detail': SessionSerializer(session).data,
+        'partie-list': PartieSerializer(Partie.objects.filter(id_session=session), many=True).data,
+    }
+
+
+def compare_renderers(payloads, iterations=200):
+    """!
+    @brief Rend chaque charge utile avec chaque renderer et mesure taille et CPU.
+
+    @param payloads `{nom: données}` (voir `build_payloads`).
+    @return Une ligne par (charge utile, renderer) : `{payload, renderer, bytes, cpu_us,
+            bytes_ratio, cpu_ratio}` ; les ratios sont relatifs au premier renderer de `RENDERERS`.
+    """
+    from django.utils.module_loading import import_string
+
+    lignes = []
+    for nom, data in payloads.items():
+        reference = None
+        for renderer_nom, chemin in RENDERERS.items():
+            renderer = import_string(chemin)()
+            contenu = renderer.render(data, renderer.media_type)
+            debut = time.process_time()
+            for _ in range(iterations):
+                renderer.render(data, renderer.media_type)
+            cpu_us = (time.process_time() - debut) / iterations * 1e6
+            reference = reference or (len(contenu), cpu_us)
+            lignes.append({
+                'payload': nom, 'renderer': renderer_nom, 'bytes': len(contenu), 'cpu_us': cpu_us,
+                'bytes_ratio': len(contenu) / reference[0],
+                'cpu_ratio': cpu_us / reference[1] if reference[1] else 0.0,
+            })
+    return lignes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.serialization',
+                                     description="Compare la taille et le coût CPU des renderers de l'API.")
+    parser.add_argument('--players', type=_int_list, default=[10, 100, 1000], help="Tailles de salle (ex: 10,100,1000).")
+    parser.add_argument('--stories', type=_int_list, default=[10, 500], help="Tailles de backlog (ex: 10,500).")
+    parser.add_argument('--iterations', type=int, default=200, help="Rendus chronométrés par mesure.")
+    parser.add_argument('--output', help="Fichier JSON où écrire les mesures.")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    nom_base = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    resultats = []
+    try:
+        for nb_joueurs in args.players:
+            for nb_stories in args.stories:
+                for ligne in compare_renderers(build_payloads(nb_joueurs, nb_stories), args.iterations):
+                    ligne.update(players=nb_joueurs, stories=nb_stories)
+                    resultats.append(ligne)
+                    print(f"{ligne['payload']:<15} joueurs={nb_joueurs:<6} stories={nb_stories:<5} "
+                          f"{ligne['renderer']:<9} {ligne['bytes']:>9} octets (x{ligne['bytes_ratio']:.2f})  "
+                          f"{ligne['cpu_us']:>9.1f} µs CPU (x{ligne['cpu_ratio']:.2f})")
+    finally:
+        connection.creation.destroy_test_db(nom_base, verbosity=0)
+        teardown_test_environment()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
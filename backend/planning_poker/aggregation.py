@@ -0,0 +1,161 @@
+"""!
+@brief Moteur de calcul du résultat d'une story (modes de jeu).
+
+Chaque mode de jeu est une stratégie enregistrée dans `STRATEGIES` via le
+décorateur `register()`. Une stratégie reçoit l'histogramme des cartes votées
+(`{carte: nombre de votes}`) de la manche en cours, lu dans le décompte
+tenu à jour par `tally`, et renvoie la valeur finale (int).
+Ajouter un mode ne demande donc aucune modification de la vue.
+
+Conventions communes à toutes les stratégies :
+- Les cartes non numériques ('?', 'cafe'...) ne comptent pas dans les calculs arithmétiques.
+- -1 signifie un désaccord (pas de résultat possible).
+- 0 signifie qu'aucun vote exploitable n'a été trouvé.
+"""
+
+## @brief Registre des stratégies de calcul, indexé par nom de mode de jeu.
+STRATEGIES = {}
+
+## @brief Mode utilisé quand `mode_de_jeu` ne correspond à aucune stratégie.
+DEFAULT_MODE = 'average'
+
+
+def register(name):
+    """!
+    @brief Décorateur enregistrant une stratégie de calcul sous le nom de mode donné.
+
+    @param name Nom du mode de jeu (valeur de `Session.mode_de_jeu`).
+    """
+    def decorator(func):
+        STRATEGIES[name] = func
+        return func
+    return decorator
+
+
+def get_strategy(mode_de_jeu):
+    """!
+    @brief Renvoie la stratégie d'un mode de jeu (celle de `DEFAULT_MODE` si inconnu).
+    """
+    return STRATEGIES.get(mode_de_jeu, STRATEGIES[DEFAULT_MODE])
+
+
+def compute(mode_de_jeu, histogram):
+    """!
+    @brief Applique la stratégie du mode de jeu à un histogramme de votes.
+
+    @return La valeur finale (int).
+    """
+    return get_strategy(mode_de_jeu)(histogram)
+
+
+def _numeric(histogram):
+    """!
+    @brief Extrait les votes numériques d'un histogramme, triés par valeur croissante.
+
+    Une carte est numérique si `str.isdecimal()` : `isdigit()` accepte aussi '²' ou '①',
+    que `int()` refuse.
+
+    @return Liste de couples (valeur, nombre de votes).
+    """
+    return sorted((int(carte), n) for carte, n in histogram.items() if carte.isdecimal())
+
+
+def _as_result(carte):
+    """!
+    @brief Convertit la carte gagnante en résultat (-1 si elle n'est pas numérique).
+    """
+    return int(carte) if carte.isdecimal() else -1
+
+
+def _most_common(histogram):
+    """!
+    @brief Renvoie la carte la plus votée et son nombre de votes.
+
+    En cas d'égalité, la plus petite valeur numérique l'emporte (les cartes
+    non numériques passent après), pour un résultat déterministe.
+    """
+    return min(
+        histogram.items(),
+        key=lambda item: (-item[1], not item[0].isdecimal(), int(item[0]) if item[0].isdecimal() else 0, item[0]),
+    )
+
+
+@register('strict')
+def strict(histogram):
+    """!
+    @brief Unanimité : la valeur commune si tous les votes sont identiques, sinon -1.
+    """
+    if len(histogram) != 1:
+        return -1
+    return _as_result(next(iter(histogram)))
+
+
+@register('median')
+def median(histogram):
+    """!
+    @brief Médiane des votes numériques (moyenne arrondie des deux valeurs centrales si pair).
+    """
+    valeurs = _numeric(histogram)
+    total = sum(n for _, n in valeurs)
+    if not total:
+        return 0
+
+    def rang(k):
+        # Valeur de rang k (0-indexé) dans la liste triée, sans la développer
+        for valeur, n in valeurs:
+            if k < n:
+                return valeur
+            k -= n
+
+    if total % 2 == 1:
+        return rang(total // 2)
+    return round((rang(total // 2 - 1) + rang(total // 2)) / 2)
+
+
+@register('average')
+def average(histogram):
+    """!
+    @brief Moyenne arithmétique arrondie des votes numériques.
+    """
+    valeurs = _numeric(histogram)
+    total = sum(n for _, n in valeurs)
+    return round(sum(v * n for v, n in valeurs) / total) if total else 0
+
+
+@register('majority_abs')
+def majority_abs(histogram):
+    """!
+    @brief Majorité absolue : la carte votée par plus de la moitié des votants, sinon -1.
+    """
+    if not histogram:
+        return 0
+    carte, n = _most_common(histogram)
+    return _as_result(carte) if n > sum(histogram.values()) / 2 else -1
+
+
+@register('majority_rel')
+def majority_rel(histogram):
+    """!
+    @brief Majorité relative : la carte la plus votée.
+    """
+    if not histogram:
+        return 0
+    return _as_result(_most_common(histogram)[0])
+
+
+@register('min')
+def minimum(histogram):
+    """!
+    @brief Estimation optimiste : le plus petit vote numérique.
+    """
+    valeurs = _numeric(histogram)
+    return valeurs[0][0] if valeurs else 0
+
+
+@register('max')
+def maximum(histogram):
+    """!
+    @brief Estimation pessimiste : le plus grand vote numérique.
+    """
+    valeurs = _numeric(histogram)
+    return valeurs[-1][0] if valeurs else 0
@@ -1,4 +1,8 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class PlanningPokerConfig(AppConfig):
@@ -14,4 +18,36 @@ class PlanningPokerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
 
     ## @brief Nom technique de l'application (utilisé dans INSTALLED_APPS).
-    name = 'planning_poker'
\ No newline at end of file
+    name = 'planning_poker'
+
+    def ready(self):
+        """!
+        @brief Connecte les récepteurs de signaux (recyclage des codes, comptage SQL) et,
+        si `PURGE_INTERVAL` est non nul, lance la purge périodique dans le processus serveur.
+        """
+        from . import signals  # noqa: F401
+
+        if settings.PURGE_INTERVAL > 0 and _is_server_process():
+            from .purge import start_periodic_purge
+            start_periodic_purge(settings.PURGE_INTERVAL)
+
+
+## @brief Programmes qui servent l'application (nom de l'exécutable, ou du paquet lancé par `python -m`).
+SERVER_PROGRAMS = frozenset({'daphne', 'gunicorn', 'uvicorn'})
+
+
+def _is_server_process(argv=None):
+    """!
+    @brief Indique si le processus courant sert l'application : `manage.py runserver`, ou un
+    serveur de `SERVER_PROGRAMS`. Tout le reste (commandes `manage.py`, pytest, benchmarks,
+    scripts) n'est pas un serveur.
+    """
+    argv = sys.argv if argv is None else argv
+    if not argv:
+        return False
+    programme = os.path.basename(argv[0])
+    if programme == '__main__.py':  # python -m daphne
+        programme = os.path.basename(os.path.dirname(argv[0]))
+    if programme in ('manage.py', 'django-admin'):
+        return len(argv) > 1 and argv[1] == 'runserver'
+    return programme in SERVER_PROGRAMS
@@ -0,0 +1,169 @@
+"""!
+@brief Vues asynchrones des actions de jeu les plus fréquentes (servies sous ASGI).
+
+Mêmes contrats (paramètres, réponses, codes d'erreur, événements) que les actions
+correspondantes des ViewSets REST, mais écrites avec l'ORM asynchrone (`aupdate`,
+`afirst`, `acreate`...) : sous un serveur ASGI (daphne), une requête en attente de
+la base ou d'un client lent n'occupe aucun thread, et un même processus sert de
+nombreuses connexions simultanées.
+
+Routes : `/api/async/parties/{vote_card,join_partie,raz_vote}/` et
+`/api/async/sessions/<pk>/{state,progress}/`. Seul le JSON est accepté en entrée.
+Sous WSGI, ces vues fonctionnent aussi, mais via `async_to_sync` (sans bénéfice).
+Chaque vue a le même budget de requêtes SQL que l'action synchrone correspondante.
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError
+from django.db.models import F
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.utils.http import parse_etags
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import status
+
+from . import tally
+from .budgets import query_budget
+from .codes import normalize_code
+from .events import apublish
+from .models import Partie, Session, Vote
+from .views import _cast_vote, _session_snapshot, session_etag
+
+
+def _payload(request):
+    """!
+    @brief Corps JSON de la requête (dictionnaire vide s'il est absent ou invalide).
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _missing():
+    return JsonResponse({'error': 'Paramètres manquants'}, status=status.HTTP_400_BAD_REQUEST)
+
+
+@csrf_exempt
+@require_POST
+@query_budget(5)
+async def vote_card(request):
+    """!
+    @brief Enregistre le vote d'un joueur (voir `PartieViewSet.vote_card`).
+    """
+    data = _payload(request)
+    username, id_session, carte_choisie = data.get('username'), data.get('id_session'), data.get('carte_choisie')
+    if not username or not id_session or carte_choisie is None:
+        return _missing()
+
+    # L'ORM asynchrone n'a pas de transactions : les trois écritures passent ensemble par un thread
+    if not await sync_to_async(_cast_vote)(id_session, username, carte_choisie):
+        return JsonResponse({'error': 'Partie introuvable'}, status=status.HTTP_404_NOT_FOUND)
+    return JsonResponse({'status': 'Vote enregistré'})
+
+
+@csrf_exempt
+@require_POST
+@query_budget(7)
+async def join_partie(request):
+    """!
+    @brief Inscrit un joueur dans une session (voir `PartieViewSet.join_partie`).
+
+    L'inscription d'un nouveau joueur est un INSERT, suivi du retrait de son éventuel
+    vote de la manche en cours (joueur de retour). Si une requête concurrente l'a inscrit
+    entre-temps, l'INSERT échoue sur la contrainte d'unicité et le vote est conservé : la
+    vue tourne en autocommit, l'échec n'invalide aucune transaction.
+    """
+    data = _payload(request)
+    username, id_session = data.get('username'), normalize_code(data.get('id_session'))
+    if not username or not id_session:
+        return _missing()
+
+    session = await Session.objects.filter(pk=id_session).values_list('status', 'mode_de_jeu').afirst()
+    if session is None:
+        return JsonResponse({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+    statut, mode_de_jeu = session
+
+    joined = statut != 'closed'
+    if joined:
+        if not await Partie.objects.filter(username=username, id_session=id_session).aupdate(updated_at=timezone.now()):
+            try:
+                await Partie.objects.acreate(username=username, id_session_id=id_session)
+            except IntegrityError:
+                pass  # Inscrit entre-temps par une requête concurrente
+            else:
+                await Vote.awithdraw(id_session, username)
+        changes = {} if statut == 'in_progress' else {'status': 'in_progress'}
+        await apublish(id_session, 'join_partie', {'username': username, 'status': 'in_progress'}, **changes)
+
+    return JsonResponse({'mode_de_jeu': mode_de_jeu, 'status': statut},
+                        status=status.HTTP_201_CREATED if joined else status.HTTP_200_OK)
+
+
+@csrf_exempt
+@require_POST
+@query_budget(3)
+async def raz_vote(request):
+    """!
+    @brief Réinitialise les votes d'une session (voir `PartieViewSet.raz_vote`).
+
+    Le passage à la manche suivante est écrit dans le même UPDATE que la version.
+    """
+    id_session = _payload(request).get('id_session')
+    if not id_session:
+        return _missing()
+
+    if not await apublish(id_session, 'raz_vote', round=F('round') + 1):
+        return JsonResponse({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+    return JsonResponse({'status': 'Vote réinitialisé'})
+
+
+@require_GET
+@query_budget(5)
+async def state(request, pk):
+    """!
+    @brief État de jeu complet d'une session, avec ETag (voir `SessionViewSet.state`).
+
+    Le 304 ne coûte qu'une lecture asynchrone de la version ; la sérialisation complète
+    (plusieurs requêtes) passe par un thread.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        version = await Session.objects.filter(pk=pk).values_list('version', flat=True).afirst()
+        if version is not None:
+            etag = session_etag(pk, version)
+            etags = [e.removeprefix('W/') for e in parse_etags(if_none_match)]
+            if '*' in etags or etag in etags:
+                response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+                response['ETag'], response['Cache-Control'] = etag, 'no-cache'
+                return response
+
+    data = await sync_to_async(_session_snapshot)(pk)
+    if data is None:
+        return JsonResponse({'detail': 'No Session matches the given query.'}, status=status.HTTP_404_NOT_FOUND)
+    response = JsonResponse(data)
+    response['ETag'], response['Cache-Control'] = session_etag(pk, data['version']), 'no-cache'
+    return response
+
+
+@require_GET
+@query_budget(2)
+async def progress(request, pk):
+    """!
+    @brief Avancement du vote en cours, lu dans le décompte en cache (voir `SessionViewSet.progress`).
+    """
+    decompte = await tally.aget_tally(pk)
+    if decompte is None:
+        return JsonResponse({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+
+    nb_joueurs = len(decompte['joueurs'])
+    return JsonResponse({
+        'version': decompte['version'],
+        'nb_joueurs': nb_joueurs,
+        'nb_votes': decompte['nb_votes'],
+        'tous_ont_vote': nb_joueurs > 0 and decompte['nb_votes'] == nb_joueurs,
+    })
@@ -0,0 +1,161 @@
+"""!
+@brief Budgets de requêtes SQL par action de ViewSet, vérifiés à l'exécution.
+
+Chaque action déclare le nombre maximal de requêtes SQL qu'elle peut exécuter, soit
+avec le décorateur `@query_budget(n)`, soit dans l'attribut `query_budgets` du ViewSet
+(pratique pour les actions standard `list`, `retrieve`...). Le même décorateur s'applique
+aux vues asynchrones (`async_views.py`) : leurs requêtes s'exécutent dans les threads de
+`sync_to_async`, où les suit une ContextVar lue par `record_queries`, installé sur chaque
+connexion comme le compteur des métriques. Un dépassement (N+1, requête redondante) :
+- est journalisé en avertissement structuré (logger `planning_poker.budgets`), avec le
+  SQL exécuté, en production ;
+- lève `QueryBudgetExceeded` si `QUERY_BUDGET_STRICT` est vrai (activé dans les tests),
+  ce qui fait échouer le test concerné.
+
+Les instructions de contrôle de transaction (SAVEPOINT...) ne sont pas comptées :
+elles dépendent de l'imbrication des transactions (différente en test), pas de l'action.
+"""
+
+import functools
+import logging
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+## @brief Préfixes SQL ignorés par le décompte (contrôle de transaction).
+IGNORED_PREFIXES = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT', 'BEGIN', 'COMMIT', 'ROLLBACK')
+
+## @brief Enregistreur de la vue asynchrone en cours (None hors vue asynchrone budgétée).
+_current_recorder = ContextVar('planning_poker_query_recorder', default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """!
+    @brief Une action a exécuté plus de requêtes SQL que son budget (mode strict).
+    """
+
+
+def query_budget(n):
+    """!
+    @brief Décorateur déclarant le budget de requêtes SQL d'une action.
+
+    À placer sous `@action(...)` ; le budget est alors appliqué par `QueryBudgetMixin`.
+    Sur une vue asynchrone, à placer au plus près de la fonction : il l'enveloppe et
+    applique lui-même le budget.
+
+    @param n Nombre maximal de requêtes SQL.
+    """
+    def decorator(func):
+        if iscoroutinefunction(func):
+            func = _async_budget(func, n)
+        func.query_budget = n
+        return func
+    return decorator
+
+
+def _async_budget(view, budget):
+    """!
+    @brief Enveloppe une vue asynchrone pour enregistrer ses requêtes et vérifier son budget.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        recorder = QueryRecorder()
+        jeton = _current_recorder.set(recorder)
+        try:
+            response = await view(request, *args, **kwargs)
+        finally:
+            _current_recorder.reset(jeton)
+        if len(recorder.queries) > budget:
+            report_exceeded(view.__name__, budget, recorder.queries)
+        return response
+    return wrapper
+
+
+def record_queries(execute, sql, params, many, context):
+    """!
+    @brief Wrapper d'exécution SQL : enregistre la requête pour la vue asynchrone budgétée en cours.
+
+    Installé une fois pour toutes sur chaque connexion (voir `install_query_recorder`).
+    """
+    recorder = _current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_query_recorder(connection):
+    """!
+    @brief Ajoute `record_queries` aux wrappers d'exécution d'une connexion (une seule fois).
+    """
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+def report_exceeded(vue, budget, queries):
+    """!
+    @brief Signale un dépassement : avertissement structuré, ou exception en mode strict.
+
+    @param vue Nom de la vue (ex: `PartieViewSet.vote_card`, `join_partie`).
+    """
+    details = {'view': vue, 'budget': budget, 'count': len(queries), 'queries': queries}
+    message = f"Budget de requêtes dépassé : {vue} a exécuté {len(queries)} requêtes (budget {budget}) :\n" + '\n'.join(queries)
+    if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+        raise QueryBudgetExceeded(message)
+    logger.warning(message, extra={'query_budget': details})
+
+
+class QueryRecorder:
+    """!
+    @brief Wrapper d'exécution SQL qui conserve le texte des requêtes exécutées.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(IGNORED_PREFIXES):
+            self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMixin:
+    """!
+    @brief Mixin de ViewSet appliquant les budgets de requêtes de ses actions.
+    """
+
+    ## @brief Budgets des actions sans décorateur (ex: `{'list': 1, 'retrieve': 2}`).
+    query_budgets = {}
+
+    def get_query_budget(self):
+        """!
+        @brief Budget de l'action courante, ou None si elle n'en déclare pas.
+        """
+        action = getattr(self, 'action', None)
+        if action is None:
+            return None
+        handler = getattr(self, action, None)
+        return getattr(handler, 'query_budget', self.query_budgets.get(action))
+
+    def dispatch(self, request, *args, **kwargs):
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = super().dispatch(request, *args, **kwargs)
+
+        budget = self.get_query_budget()
+        if budget is not None and len(recorder.queries) > budget:
+            self.query_budget_exceeded(budget, recorder.queries)
+        return response
+
+    def query_budget_exceeded(self, budget, queries):
+        """!
+        @brief Signale un dépassement de l'action courante (voir `report_exceeded`).
+        """
+        report_exceeded(f"{type(self).__name__}.{self.action}", budget, queries)
@@ -0,0 +1,116 @@
+"""!
+@brief Journal des changements et synchronisation différentielle (« delta ») de l'état de jeu.
+
+Chaque événement publié (`events.publish`) ajoute une ligne `SessionChange` portant la
+version qu'il a produite. Un client qui connaît l'état à la version N demande ensuite
+`GET /sessions/{id}/delta/?since=N` et ne reçoit que ce qui a changé depuis :
+- les joueurs arrivés ou dont le vote a changé (`joueurs`), et ceux partis (`partis`) ;
+- les stories clôturées (`stories`) ;
+- `raz` si les votes ont été remis à zéro (à appliquer avant `joueurs`).
+
+Le journal ne sert qu'à savoir *quoi* relire : joueurs et stories sont relus dans leur
+état courant, une réponse n'est donc jamais plus ancienne que la version annoncée.
+La taille d'une réponse suit l'activité, pas la taille de la salle ou du backlog.
+
+Le client reçoit un instantané complet (`full: True`, mêmes clés) quand le journal ne
+couvre pas toutes les versions depuis N : N trop ancien (lignes purgées, ou plus de
+`CHANGELOG_MAX_DELTA` versions d'écart), N inconnu (postérieur à la version courante),
+ou événement non exprimable en delta (ex: import de stories, écritures CRUD directes
+`PATCH /sessions/{id}/`, `POST /parties/`...).
+"""
+
+from django.conf import settings
+
+from .models import Partie, Session, SessionChange, Story
+from .serializers import JoueurEtatSerializer
+
+## @brief Événements qui désignent un joueur (`username`) dont l'état a changé.
+PLAYER_EVENTS = frozenset({'vote_card', 'join_partie', 'fin_partie'})
+
+## @brief Événements qui n'affectent que des colonnes de la session, toujours renvoyées.
+SESSION_EVENTS = frozenset({'close_session'})
+
+
+def record(id_session, version, event, data=None):
+    """!
+    @brief Ajoute au journal le changement qui a porté la session à la version `version`.
+
+    Appeler dans la même transaction que l'incrément de version (voir `events.publish`).
+    """
+    SessionChange.objects.create(
+        session_id=id_session,
+        version=version,
+        event=event,
+        data=data or {},
+    )
+
+
+def _story(story):
+    return {'position': story.position, **story.as_json()}
+
+
+def snapshot(session):
+    """!
+    @brief État complet d'une session, au format d'un delta (`full: True`).
+
+    @param session Session chargée (la version renvoyée est la sienne).
+    """
+    return {
+        'version': session.version,
+        'full': True,
+        'status': session.status,
+        'raz': False,
+        'joueurs': JoueurEtatSerializer(Partie.objects.filter(id_session=session).with_vote().order_by('pk'), many=True).data,
+        'partis': [],
+        'stories': [_story(s) for s in Story.objects.filter(session=session).order_by('position')],
+    }
+
+
+def delta(id_session, since):
+    """!
+    @brief Changements d'une session depuis la version `since` (ou instantané complet).
+
+    @param id_session Code de la session.
+    @param since Dernière version connue du client.
+    @return `{'version', 'full', 'status', 'raz', 'joueurs', 'partis', 'stories'}`, ou None
+            si la session n'existe pas.
+    """
+    session = Session.objects.filter(pk=id_session).defer('stories').first()
+    if session is None:
+        return None
+    version = session.version
+    if since < 0 or since > version or version - since > getattr(settings, 'CHANGELOG_MAX_DELTA', 500):
+        return snapshot(session)
+
+    changes = list(
+        SessionChange.objects.filter(session=session, version__gt=since, version__lte=version)
+        .values_list('event', 'data')
+    ) if version > since else []
+    if len(changes) != version - since:
+        return snapshot(session)  # journal incomplet (purgé) : N trop ancien
+
+    raz = False
+    usernames, positions = set(), set()
+    for event, data in changes:
+        if event in PLAYER_EVENTS:
+            usernames.add(data['username'])
+        elif event == 'purge_joueurs':
+            usernames.update(data['usernames'])
+        elif event == 'raz_vote':
+            raz = True
+        elif event == 'close_story':
+            positions.add(data['story_index'])
+        elif event not in SESSION_EVENTS:
+            return snapshot(session)
+
+    joueurs = list(Partie.objects.filter(id_session=session, username__in=usernames).with_vote().order_by('pk')) if usernames else []
+    stories = list(Story.objects.filter(session=session, position__in=positions).order_by('position')) if positions else []
+    return {
+        'version': version,
+        'full': False,
+        'status': session.status,
+        'raz': raz,
+        'joueurs': JoueurEtatSerializer(joueurs, many=True).data,
+        'partis': sorted(usernames - {j.username for j in joueurs}),
+        'stories': [_story(s) for s in stories],
+    }
@@ -0,0 +1,139 @@
+"""!
+@brief Allocation des codes de session (identifiant à 6 caractères).
+
+Un tirage aléatoire simple collisionne vite (paradoxe des anniversaires : ~50 % de
+risque dès ~1 200 sessions sur 10^6 codes) et chaque collision coûte un INSERT rejeté.
+Ici, chaque code est obtenu en temps borné et sans collision :
+
+1. on réutilise d'abord un code libéré par une session supprimée (table `RecycledCode`) ;
+2. sinon on prend l'entrée suivante d'un compteur (`CodeCounter`) et on la passe dans
+   une permutation de Feistel de l'espace des codes : deux indices distincts donnent
+   toujours deux codes distincts, mais la suite des codes reste imprévisible ;
+3. quand l'espace numérique (000000-999999) est occupé au-delà de `SESSION_CODE_WIDEN_AT`,
+   on bascule sur l'espace alphanumérique (0-9A-Z, 36^6 codes), en sautant les codes
+   purement numériques qui appartiennent déjà au premier espace.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import CodeCounter, RecycledCode, Session
+
+## @brief Alphabets successifs des codes (du plus court à saisir au plus large).
+DIGITS = '0123456789'
+ALNUM = DIGITS + 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+## @brief Longueur des codes (= `Session.id_session.max_length`).
+CODE_LENGTH = 6
+
+## @brief Nombre de tours du réseau de Feistel.
+ROUNDS = 4
+
+
+def _round(key, tour, valeur, modulo):
+    """!
+    @brief Fonction de tour du réseau de Feistel (hachage à clé, réduit modulo la demi-taille).
+    """
+    digest = hashlib.blake2b(f'{tour}:{valeur}'.encode(), key=key, digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % modulo
+
+
+def permute(index, base, key=None):
+    """!
+    @brief Bijection de [0, base^6) dans lui-même.
+
+    L'indice est découpé en deux moitiés de `base^3` valeurs, mélangées par un réseau
+    de Feistel équilibré en addition modulaire : chaque tour est inversible, donc la
+    permutation aussi.
+
+    @param index Entier dans [0, base^6).
+    @param base Taille de l'alphabet.
+    @param key Clé de la permutation (octets, 64 max) ; par défaut dérivée de `SESSION_CODE_SECRET`.
+    @return Entier dans [0, base^6), distinct pour chaque `index`.
+    """
+    if key is None:
+        key = hashlib.blake2b(settings.SESSION_CODE_SECRET.encode(), digest_size=32).digest()
+    moitie = base ** (CODE_LENGTH // 2)
+    gauche, droite = divmod(index, moitie)
+    for tour in range(ROUNDS):
+        gauche, droite = droite, (gauche + _round(key, tour, droite, moitie)) % moitie
+    return gauche * moitie + droite
+
+
+def encode(nombre, alphabet):
+    """!
+    @brief Écrit `nombre` en base `len(alphabet)` sur `CODE_LENGTH` caractères (zéros à gauche).
+    """
+    base = len(alphabet)
+    chiffres = []
+    for _ in range(CODE_LENGTH):
+        nombre, reste = divmod(nombre, base)
+        chiffres.append(alphabet[reste])
+    return ''.join(reversed(chiffres))
+
+
+def _next_fresh_code():
+    """!
+    @brief Tire le prochain code neuf depuis le compteur (à appeler dans une transaction).
+
+    @return Le code, ou None si la valeur tirée est à sauter (code purement numérique
+            dans l'espace alphanumérique) : l'appelant recommence.
+    """
+    seuil = int(settings.SESSION_CODE_WIDEN_AT * len(DIGITS) ** CODE_LENGTH)
+    compteur, _ = CodeCounter.objects.select_for_update().get_or_create(alphabet=DIGITS)
+    if compteur.next_index >= seuil:
+        compteur, _ = CodeCounter.objects.select_for_update().get_or_create(alphabet=ALNUM)
+
+    index = compteur.next_index
+    taille = len(compteur.alphabet) ** CODE_LENGTH
+    if index >= taille:
+        raise RuntimeError("Plus aucun code de session disponible")
+    compteur.next_index = index + 1
+    compteur.save(update_fields=['next_index'])
+
+    code = encode(permute(index, len(compteur.alphabet)), compteur.alphabet)
+    if compteur.alphabet != DIGITS and code.isdigit():
+        return None
+    return code
+
+
+def allocate_code():
+    """!
+    @brief Renvoie un code de session libre.
+
+    Priorité aux codes recyclés, puis aux codes neufs du compteur. Un code neuf déjà pris
+    (session créée avant cet allocateur, ou code imposé à la main) est sauté : chaque code
+    existant ne peut être sauté qu'une fois, la boucle est donc bornée.
+
+    @return Chaîne de 6 caractères (chiffres, puis chiffres et majuscules).
+    """
+    with transaction.atomic():
+        recycle = RecycledCode.objects.select_for_update(skip_locked=True).order_by('code').first()
+        if recycle is not None and RecycledCode.objects.filter(pk=recycle.pk).delete()[0]:
+            if not Session.objects.filter(pk=recycle.code).exists():
+                return recycle.code
+
+        while True:
+            code = _next_fresh_code()
+            if code is not None and not Session.objects.filter(pk=code).exists():
+                return code
+
+
+def normalize_code(code):
+    """!
+    @brief Forme canonique d'un code saisi par un joueur (espaces retirés, majuscules).
+
+    Les codes alphanumériques sont en majuscules : « ab12cd » désigne la session « AB12CD ».
+
+    @return Le code normalisé (une valeur qui n'est pas une chaîne est renvoyée telle quelle).
+    """
+    return code.strip().upper() if isinstance(code, str) else code
+
+
+def recycle_code(code):
+    """!
+    @brief Remet dans le pool le code d'une session supprimée.
+    """
+    RecycledCode.objects.get_or_create(code=code)
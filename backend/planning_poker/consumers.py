@@ -0,0 +1,63 @@
+"""!
+@brief Consumers WebSocket (Django Channels) de l'application.
+
+Chaque joueur ouvre une seule socket sur `ws/sessions/<id_session>/` et reçoit
+les événements de sa session au moment où ils sont validés côté serveur.
+La socket est en lecture seule : toutes les écritures passent par l'API REST.
+"""
+
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .events import group_name
+from .models import Session
+
+
+class SessionConsumer(AsyncJsonWebsocketConsumer):
+    """!
+    @brief Canal de diffusion temps réel d'une session de Planning Poker.
+
+    À la connexion, le client est ajouté au groupe de la session (s'il existe).
+    Il reçoit ensuite des messages de la forme :
+    @code
+    {"type": "vote_card", "data": {"username": "alice", "carte_choisie": "5"}}
+    @endcode
+    """
+
+    async def connect(self):
+        """!
+        @brief Accepte la connexion si la session demandée existe.
+
+        Ferme la socket avec le code 4004 si la session est introuvable.
+        """
+        self.id_session = self.scope['url_route']['kwargs']['id_session']
+        self.group = None
+
+        if not await Session.objects.filter(pk=self.id_session).aexists():
+            await self.close(code=4004)
+            return
+
+        self.group = group_name(self.id_session)
+        await self.channel_layer.group_add(self.group, self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        """!
+        @brief Retire le client du groupe de la session.
+        """
+        if self.group:
+            await self.channel_layer.group_discard(self.group, self.channel_name)
+
+    async def receive_json(self, content, **kwargs):
+        """!
+        @brief Répond aux messages de maintien de connexion.
+
+        Seul `{"type": "ping"}` est accepté ; les écritures doivent passer par l'API REST.
+        """
+        if isinstance(content, dict) and content.get('type') == 'ping':
+            await self.send_json({'type': 'pong'})
+
+    async def session_event(self, message):
+        """!
+        @brief Relaye au client un événement publié par `events.publish()`.
+        """
+        await self.send_json({'type': message['event'], 'data': message['data'], 'version': message['version']})
@@ -0,0 +1,176 @@
+"""!
+@brief Enregistrement et diffusion des changements de l'état de jeu.
+
+Les ViewSets REST restent le seul chemin d'écriture : après chaque modification
+(vote, arrivée d'un joueur, remise à zéro...), ils appellent `publish()` qui
+incrémente la version de la session, journalise le changement (`changelog.py`)
+puis pousse un message au groupe Channels de la session concernée.
+Le message n'est envoyé qu'après le COMMIT de la transaction, pour que les
+clients ne reçoivent jamais un état qui pourrait encore être annulé.
+
+Les vues asynchrones (`async_views.py`) utilisent la variante `apublish`, dont seule
+l'écriture de la version et du journal passe par un thread.
+"""
+
+import logging
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import changelog, routers, tally
+from .models import Session
+
+logger = logging.getLogger(__name__)
+
+
+def group_name(id_session):
+    """!
+    @brief Nom du groupe Channels associé à une session.
+
+    @param id_session Code de la session.
+    @return Une chaîne de la forme "session_<id_session>".
+    """
+    return f"session_{id_session}"
+
+
+def bump_version(id_session, **fields):
+    """!
+    @brief Incrémente atomiquement la version d'une session.
+
+    Exécuté en une seule requête `UPDATE ... SET version = version + 1`,
+    sans charger la session. Met aussi à jour `updated_at` (un `update()` ne
+    déclenche pas `auto_now`) : c'est la date d'activité utilisée par la purge.
+    Un changement qui n'est pas une activité (ex: purge des joueurs inactifs) passe
+    `updated_at=F('updated_at')` pour la laisser inchangée.
+    Épingle enfin les lectures de la session sur la base principale (voir `routers.py`).
+
+    @param id_session Code de la session concernée.
+    @param fields Autres colonnes de la session à écrire dans le même UPDATE (ex: `status='closed'`).
+    @return Le nombre de lignes mises à jour (0 si la session n'existe pas).
+    """
+    fields = {'updated_at': timezone.now(), **fields}
+    updated = Session.objects.filter(pk=id_session).update(version=F('version') + 1, **fields)
+    if updated:
+        routers.pin_session(id_session)
+    return updated
+
+
+def _record(id_session, event, data, fields):
+    """!
+    @brief Incrémente la version et journalise le changement, atomiquement.
+
+    Sans transaction, une écriture concurrente pourrait s'intercaler entre l'UPDATE et
+    la relecture de la version, et le changement serait journalisé sous la version de l'autre.
+
+    @return La version produite par le changement (0 si la session n'existe pas, rien n'est journalisé).
+    """
+    with transaction.atomic(savepoint=False):
+        if not bump_version(id_session, **fields):
+            return 0
+        # Relue dans la transaction qui vient de l'écrire : c'est celle de ce changement
+        version = Session.objects.filter(pk=id_session).values_list('version', flat=True).get()
+        changelog.record(id_session, version, event, data)
+    return version
+
+
+def publish(id_session, event, data=None, **fields):
+    """!
+    @brief Enregistre un changement de l'état de jeu d'une session.
+
+    Incrémente la version de la session (ce qui invalide son ETag) et ajoute le changement
+    au journal (`changelog.py`) dans la même transaction, puis programme la mise à jour
+    du décompte des votes (`tally`) et la diffusion de l'événement aux joueurs.
+    Les deux sont différés via `transaction.on_commit` : si la requête
+    est annulée, aucun événement n'est émis. Le message diffusé porte la version
+    produite par le changement (`version`).
+
+    @param id_session Code de la session concernée.
+    @param event Type d'événement (ex: 'vote_card', 'close_story').
+    @param data Dictionnaire JSON-sérialisable décrivant le changement.
+    @param fields Colonnes de la session modifiées par l'événement, écrites dans le même UPDATE
+                  que la version (ex: `status='closed'`).
+    @return Le nombre de sessions mises à jour : 0 si la session n'existe pas
+            (aucun événement n'est alors émis).
+    """
+    version = _record(id_session, event, data, fields)
+    if not version:
+        return 0
+    message = {
+        'type': 'session.event',
+        'event': event,
+        'data': data or {},
+        'version': version,
+    }
+    transaction.on_commit(lambda: _dispatch(str(id_session), message))
+    return 1
+
+
+async def apublish(id_session, event, data=None, **fields):
+    """!
+    @brief Variante asynchrone de `publish`, pour les vues asynchrones.
+
+    L'ORM asynchrone n'a pas de transactions : la version et le journal sont écrits dans
+    un thread (`sync_to_async`), en une transaction déjà validée à son retour ; l'événement
+    est donc traité et diffusé immédiatement (sans `on_commit`).
+    Ne pas appeler depuis une transaction ouverte.
+
+    @return Le nombre de sessions mises à jour : 0 si la session n'existe pas.
+    """
+    version = await sync_to_async(_record)(id_session, event, data, fields)
+    if not version:
+        return 0
+    message = {
+        'type': 'session.event',
+        'event': event,
+        'data': data or {},
+        'version': version,
+    }
+    await _adispatch(str(id_session), message)
+    return 1
+
+
+def _dispatch(id_session, message):
+    """!
+    @brief Traite un événement validé : mise à jour du décompte puis diffusion.
+    """
+    try:
+        tally.apply_event(id_session, message['event'], message['data'])
+    except Exception:
+        logger.exception("Mise à jour du décompte impossible pour la session %s", id_session)
+    _send(id_session, message)
+
+
+def _send(id_session, message):
+    """!
+    @brief Envoie effectivement le message au groupe de la session.
+
+    Une erreur de la couche de messages ne doit jamais faire échouer
+    la requête HTTP qui a déjà été validée : elle est seulement journalisée.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        async_to_sync(channel_layer.group_send)(group_name(id_session), message)
+    except Exception:
+        logger.exception("Diffusion impossible pour la session %s", id_session)
+
+
+async def _adispatch(id_session, message):
+    """!
+    @brief Variante asynchrone de `_dispatch` : même traitement, mêmes garanties.
+    """
+    try:
+        await sync_to_async(tally.apply_event)(id_session, message['event'], message['data'])
+    except Exception:
+        logger.exception("Mise à jour du décompte impossible pour la session %s", id_session)
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    try:
+        await channel_layer.group_send(group_name(id_session), message)
+    except Exception:
+        logger.exception("Diffusion impossible pour la session %s", id_session)
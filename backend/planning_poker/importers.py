@@ -0,0 +1,182 @@
+"""!
+@brief Import en flux (streaming) d'un backlog de user stories.
+
+Le corps de la requête est lu par morceaux et analysé au fil de l'eau :
+- JSON Lines (`application/x-ndjson`, `application/jsonl`) : une story par ligne ;
+- tableau JSON (`application/json`) : même format que `patternJSONBackLog.json`.
+
+Chaque story est validée par un validateur `jsonschema` compilé une seule fois,
+puis écrite par lots (`bulk_create`). La mémoire utilisée reste donc constante,
+quelle que soit la taille du backlog.
+"""
+
+import codecs
+import json
+
+from jsonschema import Draft202012Validator
+
+from .models import Session, Story
+
+## @brief Schéma JSON d'une story importée.
+## `valeur_finale` est stockée en texte sur 10 caractères : les entiers sont bornés en conséquence
+## (`maxLength` ne s'applique qu'aux chaînes).
+STORY_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'titre': {'type': 'string', 'maxLength': 255},
+        'contenu': {'type': 'string'},
+        'valeur_finale': {
+            'type': ['string', 'integer', 'null'], 'maxLength': 10,
+            'minimum': -999_999_999, 'maximum': 9_999_999_999,
+        },
+    },
+    'required': ['titre'],
+}
+
+## @brief Validateur précompilé (construit une seule fois au chargement du module).
+STORY_VALIDATOR = Draft202012Validator(STORY_SCHEMA)
+
+## @brief Types de contenu acceptés pour le format JSON Lines.
+JSONL_CONTENT_TYPES = ('application/x-ndjson', 'application/jsonl', 'application/x-jsonlines')
+
+## @brief Taille des morceaux lus dans le corps de la requête (octets).
+CHUNK_SIZE = 64 * 1024
+
+
+class ImportSyntaxError(ValueError):
+    """!
+    @brief Erreur de syntaxe empêchant de poursuivre la lecture d'un tableau JSON.
+    """
+
+    def __init__(self, ligne, message):
+        super().__init__(message)
+        ## @brief Rang (1-indexé) de l'élément fautif.
+        self.ligne = ligne
+
+
+def iter_jsonl(stream):
+    """!
+    @brief Parcourt un flux JSON Lines.
+
+    Les lignes vides sont ignorées ; une ligne mal formée n'arrête pas la lecture.
+
+    @param stream Objet fichier binaire (ex: la requête Django).
+    @return Générateur de couples (numéro de ligne, objet décodé ou exception `ValueError`).
+    """
+    for numero, raw in enumerate(stream, start=1):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            yield numero, json.loads(line)
+        except ValueError as exc:
+            yield numero, exc
+
+
+def iter_json_array(stream, chunk_size=CHUNK_SIZE):
+    """!
+    @brief Parcourt un tableau JSON élément par élément, sans le charger entièrement.
+
+    @param stream Objet fichier binaire.
+    @param chunk_size Taille des lectures successives.
+    @return Générateur de couples (rang 1-indexé, objet décodé).
+    @exception ImportSyntaxError Si le flux n'est pas un tableau JSON valide.
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder('utf-8')()
+    buffer, index, eof = '', 0, False
+
+    def read_more():
+        nonlocal buffer, index, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            buffer = buffer[index:] + utf8.decode(b'', final=True)
+        else:
+            buffer = buffer[index:] + utf8.decode(chunk)
+        index = 0
+
+    def next_char():
+        # Premier caractère significatif, en lisant la suite du flux si nécessaire
+        nonlocal index
+        while True:
+            while index < len(buffer) and buffer[index].isspace():
+                index += 1
+            if index < len(buffer):
+                return buffer[index]
+            if eof:
+                return None
+            read_more()
+
+    rang = 0
+    if next_char() != '[':
+        raise ImportSyntaxError(0, "Le corps doit être un tableau JSON")
+    index += 1
+    if next_char() == ']':
+        return
+
+    while True:
+        rang += 1
+        if next_char() is None:
+            raise ImportSyntaxError(rang, "Tableau JSON incomplet")
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, index)
+                if end < len(buffer) or eof:
+                    break
+            except ValueError as exc:
+                if eof:
+                    raise ImportSyntaxError(rang, f"JSON invalide : {exc}") from exc
+            read_more()
+        index = end
+        yield rang, item
+
+        separateur = next_char()
+        index += 1
+        if separateur == ']':
+            return
+        if separateur != ',':
+            raise ImportSyntaxError(rang, "Virgule ou fin de tableau attendue")
+
+
+def import_stories(session, items, batch_size=500, max_errors=100):
+    """!
+    @brief Valide et enregistre par lots les stories d'un flux, à la suite du backlog existant.
+
+    Les stories invalides sont ignorées et signalées ; les autres sont ajoutées.
+    À appeler dans une transaction : la session est verrouillée (`select_for_update`) avant
+    de lire la dernière position, deux imports simultanés s'ajoutent donc l'un après l'autre.
+
+    @param session Session destinataire.
+    @param items Itérable de couples (ligne, objet décodé ou exception), cf. `iter_jsonl`.
+    @param batch_size Nombre de stories par `bulk_create`.
+    @param max_errors Nombre maximal d'erreurs détaillées dans le rapport.
+    @return Dictionnaire `{'importees', 'nb_erreurs', 'erreurs': [{'ligne', 'erreurs'}]}`.
+    """
+    Session.objects.select_for_update().filter(pk=session.pk).values_list('pk').first()
+    derniere = Story.objects.filter(session=session).order_by('-position').values_list('position', flat=True).first()
+    position = 0 if derniere is None else derniere + 1
+    importees, nb_erreurs, erreurs, lot = 0, 0, [], []
+
+    for ligne, item in items:
+        if isinstance(item, Exception):
+            messages = [f"JSON invalide : {item}"]
+        else:
+            messages = [error.message for error in STORY_VALIDATOR.iter_errors(item)]
+        if messages:
+            nb_erreurs += 1
+            if len(erreurs) < max_errors:
+                erreurs.append({'ligne': ligne, 'erreurs': messages})
+            continue
+
+        lot.append(Story.from_json(session, position, item))
+        position += 1
+        if len(lot) >= batch_size:
+            Story.objects.bulk_create(lot)
+            importees += len(lot)
+            lot = []
+
+    if lot:
+        Story.objects.bulk_create(lot)
+        importees += len(lot)
+    return {'importees': importees, 'nb_erreurs': nb_erreurs, 'erreurs': erreurs}
@@ -0,0 +1,41 @@
+"""!
+@brief Commande `manage.py purge_sessions` : purge des sessions et joueurs expirés.
+
+Exemple (tâche cron quotidienne) :
+@code
+python manage.py purge_sessions --archive /var/backups/sessions.jsonl
+@endcode
+"""
+
+from django.core.management.base import BaseCommand
+
+from planning_poker.purge import purge_expired
+
+
+class Command(BaseCommand):
+    """!
+    @brief Supprime par lots les sessions expirées et les joueurs inactifs (voir `purge.py`).
+    """
+
+    help = "Supprime par lots les sessions expirées, les joueurs inactifs et le journal ancien."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Compte sans rien supprimer.")
+        parser.add_argument('--batch-size', type=int, help="Lignes supprimées par transaction (défaut : PURGE_BATCH_SIZE).")
+        parser.add_argument('--archive', help="Fichier JSON Lines où ajouter les sessions avant suppression.")
+
+    def handle(self, *args, **options):
+        archive = open(options['archive'], 'a', encoding='utf-8') if options['archive'] else None
+        try:
+            resultat = purge_expired(
+                batch_size=options['batch_size'],
+                archive=archive,
+                dry_run=options['dry_run'],
+            )
+        finally:
+            if archive is not None:
+                archive.close()
+
+        mode = " (simulation)" if options['dry_run'] else ""
+        self.stdout.write(f"Purge{mode} : {resultat['sessions']} session(s), {resultat['joueurs']} joueur(s), "
+                          f"{resultat['changements']} changement(s) du journal")
@@ -0,0 +1,210 @@
+"""!
+@brief Métriques Prometheus : latence par route, codes de réponse, requêtes SQL, sessions actives.
+
+- `MetricsMiddleware` chronomètre chaque requête et compte ses requêtes SQL (nombre et
+  durée) grâce à un wrapper d'exécution installé sur chaque connexion : un appel de
+  fonction et une lecture de ContextVar par requête SQL, négligeable même sur `vote_card`.
+- `RESPONSE_CACHE` compte les succès et échecs du cache de réponses (`response_cache.py`) :
+  taux de succès = `(hit + coalesced) / total`.
+- `metrics_view` sert `/metrics` au format texte Prometheus. Le nombre de sessions et de
+  joueurs actifs y est calculé au moment de la collecte (deux COUNT indexés).
+
+Plusieurs processus (workers gunicorn/daphne) : définir la variable d'environnement
+`PROMETHEUS_MULTIPROC_DIR` (répertoire vide, avant le démarrage des workers). Chaque
+processus y écrit ses compteurs et `/metrics` agrège ceux de tous les processus.
+
+La route est le nom de la vue résolue (ex: `partie-vote-card`), pas l'URL : le nombre
+de séries reste borné quels que soient les codes de session.
+"""
+
+import os
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+from .models import Partie, Session
+
+## @brief Route des requêtes qui ne correspondent à aucune URL.
+UNMATCHED = '<unmatched>'
+
+REQUEST_LATENCY = Histogram(
+    'planning_poker_http_request_duration_seconds',
+    "Durée de traitement des requêtes HTTP, par route et méthode.",
+    ['route', 'method'],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+RESPONSES = Counter(
+    'planning_poker_http_responses',
+    "Réponses HTTP, par route, méthode et code de statut.",
+    ['route', 'method', 'status'],
+)
+
+DB_QUERIES = Histogram(
+    'planning_poker_db_queries_per_request',
+    "Nombre de requêtes SQL par requête HTTP, par route.",
+    ['route'],
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 50, 100),
+)
+
+DB_TIME = Histogram(
+    'planning_poker_db_query_seconds_per_request',
+    "Temps cumulé passé en base par requête HTTP, par route.",
+    ['route'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+
+RESPONSE_CACHE = Counter(
+    'planning_poker_response_cache',
+    "Lectures servies par le cache de réponses (result=hit), calculées (result=miss) ou partagées "
+    "avec un calcul simultané identique (result=coalesced), par route.",
+    ['route', 'result'],
+)
+
+
+## @brief Compteur SQL de la requête HTTP en cours (None hors requête).
+## Une ContextVar suit la requête jusque dans les threads de `sync_to_async`.
+_current_counter = ContextVar('planning_poker_query_counter', default=None)
+
+
+class QueryCounter:
+    """!
+    @brief Nombre et durée cumulée des requêtes SQL d'une requête HTTP.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+def count_queries(execute, sql, params, many, context):
+    """!
+    @brief Wrapper d'exécution SQL : compte et chronomètre la requête pour la requête HTTP en cours.
+
+    Installé une fois pour toutes sur chaque connexion (voir `install_query_counter`).
+    """
+    compteur = _current_counter.get()
+    if compteur is None:
+        return execute(sql, params, many, context)
+    debut = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        compteur.duration += time.perf_counter() - debut
+        compteur.count += 1
+
+
+def install_query_counter(connection):
+    """!
+    @brief Ajoute `count_queries` aux wrappers d'exécution d'une connexion (une seule fois).
+    """
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+def _route(request):
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match is not None and match.view_name else UNMATCHED
+
+
+def _observe(request, response, debut, compteur):
+    route = _route(request)
+    REQUEST_LATENCY.labels(route, request.method).observe(time.perf_counter() - debut)
+    RESPONSES.labels(route, request.method, str(response.status_code)).inc()
+    DB_QUERIES.labels(route).observe(compteur.count)
+    DB_TIME.labels(route).observe(compteur.duration)
+
+
+class MetricsMiddleware:
+    """!
+    @brief Middleware de mesure des requêtes (synchrone et asynchrone).
+
+    À placer en tête de `MIDDLEWARE` pour mesurer aussi le temps des autres middlewares.
+    Les requêtes SQL sont comptées dans le thread de la vue, y compris sous ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        debut = time.perf_counter()
+        compteur = QueryCounter()
+        jeton = _current_counter.set(compteur)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_counter.reset(jeton)
+        _observe(request, response, debut, compteur)
+        return response
+
+    async def __acall__(self, request):
+        debut = time.perf_counter()
+        compteur = QueryCounter()
+        jeton = _current_counter.set(compteur)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_counter.reset(jeton)
+        _observe(request, response, debut, compteur)
+        return response
+
+
+class LiveCollector:
+    """!
+    @brief Collecteur des jauges calculées à la demande : sessions et joueurs actifs.
+
+    Une session est active tant qu'elle n'est pas fermée ; un joueur, tant que sa session l'est.
+    """
+
+    def collect(self):
+        sessions = GaugeMetricFamily('planning_poker_live_sessions', "Sessions non fermées.")
+        sessions.add_metric([], Session.objects.exclude(status='closed').count())
+        yield sessions
+        joueurs = GaugeMetricFamily('planning_poker_live_players', "Joueurs inscrits dans une session non fermée.")
+        joueurs.add_metric([], Partie.objects.exclude(id_session__status='closed').count())
+        yield joueurs
+
+
+class _ProcessCollector:
+    """!
+    @brief Relaie les métriques du registre global du processus (mode mono-processus).
+    """
+
+    def collect(self):
+        return REGISTRY.collect()
+
+
+def _registry():
+    """!
+    @brief Registre à exposer : les métriques de tous les processus en mode multiprocessus
+    (sinon celles du processus courant), plus les jauges d'activité.
+    """
+    registry = CollectorRegistry()
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(_ProcessCollector())
+    registry.register(LiveCollector())
+    return registry
+
+
+@require_GET
+def metrics_view(request):
+    """!
+    @brief Point d'entrée `/metrics` (format texte Prometheus).
+    """
+    return HttpResponse(generate_latest(_registry()), content_type=CONTENT_TYPE_LATEST)
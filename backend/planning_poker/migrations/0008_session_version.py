@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning_poker', '0007_partie_a_vote'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
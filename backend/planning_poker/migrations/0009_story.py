@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning_poker', '0008_session_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Story',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveIntegerField()),
+                ('titre', models.CharField(blank=True, default='', max_length=255)),
+                ('contenu', models.TextField(blank=True, default='')),
+                ('valeur_finale', models.CharField(blank=True, max_length=10, null=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='planning_poker.session')),
+            ],
+            options={
+                'ordering': ['position'],
+                'unique_together': {('session', 'position')},
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Migration de données : recopie du JSON Session.stories dans la table Story
+
+from django.db import migrations
+
+
+def stories_to_rows(apps, schema_editor):
+    """!
+    @brief Crée une ligne Story pour chaque élément des backlogs JSON existants.
+    """
+    Session = apps.get_model('planning_poker', 'Session')
+    Story = apps.get_model('planning_poker', 'Story')
+    for session in Session.objects.only('pk', 'stories').iterator(chunk_size=200):
+        if not isinstance(session.stories, list):
+            continue
+        rows = []
+        for position, item in enumerate(session.stories):
+            if not isinstance(item, dict):
+                rows.append(Story(session_id=session.pk, position=position, titre=str(item)[:255]))
+                continue
+            valeur_finale = item.get('valeur_finale')
+            rows.append(Story(
+                session_id=session.pk,
+                position=position,
+                titre=str(item.get('titre') or '')[:255],
+                contenu=str(item.get('contenu') or ''),
+                valeur_finale=None if valeur_finale is None else str(valeur_finale),
+            ))
+        Story.objects.bulk_create(rows, batch_size=500)
+
+
+def rows_to_stories(apps, schema_editor):
+    """!
+    @brief Retour arrière : reporte les valeurs finales des lignes Story dans le JSON.
+    """
+    Session = apps.get_model('planning_poker', 'Session')
+    Story = apps.get_model('planning_poker', 'Story')
+    for session in Session.objects.only('pk', 'stories').iterator(chunk_size=200):
+        if not isinstance(session.stories, list):
+            continue
+        stories = list(session.stories)
+        resultats = Story.objects.filter(session_id=session.pk, valeur_finale__isnull=False)
+        for position, valeur_finale in resultats.values_list('position', 'valeur_finale'):
+            if position < len(stories) and isinstance(stories[position], dict):
+                stories[position]['valeur_finale'] = valeur_finale
+        session.stories = stories
+        session.save(update_fields=['stories'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning_poker', '0009_story'),
+    ]
+
+    operations = [
+        migrations.RunPython(stories_to_rows, rows_to_stories),
+    ]
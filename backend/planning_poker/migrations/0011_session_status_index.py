@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning_poker', '0010_story_data'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='session',
+            name='status',
+            field=models.CharField(db_index=True, default='open', max_length=50),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 02:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning_poker', '0011_session_status_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CodeCounter',
+            fields=[
+                ('alphabet', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('next_index', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RecycledCode',
+            fields=[
+                ('code', models.CharField(max_length=6, primary_key=True, serialize=False)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning_poker', '0013_timestamps'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('event', models.CharField(max_length=50)),
+                ('data', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='planning_poker.session')),
+            ],
+            options={
+                'ordering': ['version'],
+                'unique_together': {('session', 'version')},
+            },
+        ),
+    ]
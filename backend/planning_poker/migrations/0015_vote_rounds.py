@@ -0,0 +1,73 @@
+# Manches de vote : les votes quittent Partie pour la table Vote, repérée par (session, manche, joueur)
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def votes_to_rows(apps, schema_editor):
+    """!
+    @brief Recopie les votes en cours (`Partie.carte_choisie`) en lignes Vote de la manche 0.
+    """
+    Partie = apps.get_model('planning_poker', 'Partie')
+    Vote = apps.get_model('planning_poker', 'Vote')
+    parties = Partie.objects.filter(carte_choisie__isnull=False).values_list('id_session_id', 'username', 'carte_choisie')
+    Vote.objects.bulk_create(
+        (Vote(session_id=id_session, round=0, username=username, carte=carte)
+         for id_session, username, carte in parties.iterator(chunk_size=500)),
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+
+
+def rows_to_votes(apps, schema_editor):
+    """!
+    @brief Retour arrière : reporte les votes de la manche en cours dans `Partie.carte_choisie`.
+    """
+    Partie = apps.get_model('planning_poker', 'Partie')
+    Session = apps.get_model('planning_poker', 'Session')
+    Vote = apps.get_model('planning_poker', 'Vote')
+    manche = Session.objects.filter(pk=models.OuterRef(models.OuterRef('id_session'))).values('round')
+    votes = Vote.objects.filter(
+        session=models.OuterRef('id_session'), round=models.Subquery(manche), username=models.OuterRef('username'),
+    ).values('carte')[:1]
+    Partie.objects.update(carte_choisie=models.Subquery(votes))
+    Partie.objects.filter(carte_choisie__isnull=False).update(a_vote=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning_poker', '0014_sessionchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='round',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='Vote',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('round', models.PositiveIntegerField()),
+                ('username', models.CharField(max_length=100)),
+                ('carte', models.CharField(max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='planning_poker.session')),
+            ],
+            options={
+                'unique_together': {('session', 'round', 'username')},
+            },
+        ),
+        migrations.RunPython(votes_to_rows, rows_to_votes),
+        migrations.RemoveField(
+            model_name='partie',
+            name='a_vote',
+        ),
+        migrations.RemoveField(
+            model_name='partie',
+            name='carte_choisie',
+        ),
+    ]
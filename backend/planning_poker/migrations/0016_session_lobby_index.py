@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('planning_poker', '0015_vote_rounds'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['-created_at', 'id_session'], name='session_lobby_idx'),
+        ),
+    ]
@@ -1,7 +1,66 @@
 from django.db import models
-from random import randint
+from django.db.models import BooleanField, ExpressionWrapper, OuterRef, Q, Subquery
 
-class Session(models.Model):
+class DirtyFieldsMixin:
+    """!
+    @brief Limite les `save()` d'un objet chargé depuis la base aux champs modifiés.
+
+    Les valeurs lues en base sont mémorisées au chargement (`from_db`). Un `save()` sans
+    `update_fields` n'écrit alors que les champs qui ont changé (plus les champs `auto_now`),
+    et aucune requête n'est faite (ni signal `post_save` envoyé) si rien n'a changé.
+
+    @note Les champs JSON sont comparés par identité : une modification en place
+          (`session.stories[0]['titre'] = ...`) n'est pas détectée. Réaffecter le champ
+          ou passer `update_fields` explicitement.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def get_dirty_fields(self):
+        """!
+        @brief Noms des champs chargés dont la valeur a changé depuis la lecture en base.
+        """
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None:
+            return None
+        dirty = []
+        for field in self._meta.concrete_fields:
+            if field.attname not in loaded:
+                continue  # champ différé : jamais lu, donc jamais modifié
+            avant, apres = loaded[field.attname], getattr(self, field.attname)
+            if isinstance(field, models.JSONField) and isinstance(apres, (dict, list)):
+                changed = apres is not avant
+            else:
+                changed = apres != avant
+            if changed:
+                dirty.append(field.name)
+        return dirty
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            dirty = self.get_dirty_fields()
+            if dirty is not None:
+                if not dirty:
+                    return
+                auto_now = [f.name for f in self._meta.concrete_fields if getattr(f, 'auto_now', False)]
+                kwargs['update_fields'] = set(dirty) | set(auto_now)
+        super().save(*args, **kwargs)
+
+        # Les valeurs écrites deviennent la nouvelle référence
+        ecrits = kwargs.get('update_fields')
+        deferred = self.get_deferred_fields()
+        if not hasattr(self, '_loaded_values') or ecrits is None:
+            self._loaded_values = {}
+        for field in self._meta.concrete_fields:
+            if field.attname not in deferred and (ecrits is None or field.name in ecrits):
+                self._loaded_values[field.attname] = getattr(self, field.attname)
+
+
+class Session(DirtyFieldsMixin, models.Model):
     """!
     @brief Représente une session de jeu de Planning Poker.
     
@@ -11,13 +70,16 @@ class Session(models.Model):
 
     def generate_six_digit_code():
         """!
-        @brief Génère un code aléatoire unique à 6 chiffres.
+        @brief Génère un code unique à 6 caractères.
         
-        Utilisé comme valeur par défaut pour l'identifiant de session.
+        Utilisé comme valeur par défaut pour l'identifiant de session. Délègue à
+        `codes.allocate_code` (sans collision, voir ce module).
         
-        @return Une chaîne de caractères de 6 chiffres (ex: "048239").
+        @return Une chaîne de 6 chiffres (ex: "048239"), puis de 6 chiffres ou majuscules
+                une fois l'espace numérique presque plein.
         """
-        return f"{randint(0, 999999):06d}"
+        from .codes import allocate_code
+        return allocate_code()
 
     ## @brief Identifiant unique (Code pin) pour rejoindre la session.
     id_session = models.CharField(
@@ -32,9 +94,11 @@ class Session(models.Model):
     titre = models.CharField(max_length=255)
 
     """!
-    @brief Liste des user stories à voter.
+    @brief Backlog des user stories tel que soumis à la création de la session.
     
-    Stocké au format JSON. Structure attendue :
+    Stocké au format JSON, puis recopié ligne à ligne dans la table `Story`
+    à la création (si c'est une liste). Les résultats (`valeur_finale`) sont ensuite
+    écrits uniquement dans `Story` : ce JSON n'est plus réécrit. Structure attendue :
     @code
     [
       {
@@ -48,25 +112,85 @@ class Session(models.Model):
     """
     stories = models.JSONField()
 
-    ## @brief Mode de calcul des résultats (ex: 'strict', 'average', 'median', 'majority_abs', 'majority_rel').
+    ## @brief Mode de calcul des résultats (ex: 'strict', 'average', 'median', 'majority_abs', 'majority_rel', 'min', 'max').
+    ## Voir `aggregation.STRATEGIES` pour la liste complète.
     mode_de_jeu = models.CharField(max_length=50)
 
     ## @brief État de la session ('open', 'in_progress', 'closed').
-    status = models.CharField(max_length=50, default='open') 
+    ## Indexé pour le filtrage du lobby (`/sessions/lobby/?status=...`).
+    status = models.CharField(max_length=50, default='open', db_index=True)
+
+    ## @brief Numéro de la manche de vote en cours : seuls les `Vote` de cette manche comptent.
+    ## Une remise à zéro des votes (`raz_vote`) se contente de l'incrémenter.
+    round = models.PositiveIntegerField(default=0)
+
+    ## @brief Compteur de version, incrémenté à chaque écriture sur la session ou ses joueurs.
+    ## Sert à construire l'ETag de l'état de jeu (`GET /sessions/{id}/state/`).
+    version = models.PositiveIntegerField(default=0)
+
+    ## @brief Date de création de la session.
+    ## Ordre du lobby, les plus récentes d'abord (voir `LobbyPagination` et l'index `session_lobby_idx`).
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    ## @brief Date de la dernière activité (toute écriture passe par `events.bump_version`).
+    ## Indexée pour la purge des sessions expirées (voir `purge.py`).
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def save(self, *args, **kwargs):
+        """!
+        @brief Enregistre la session et, à sa création, matérialise ses stories.
+
+        Si `stories` est une liste, une ligne `Story` est créée par élément
+        (en un seul `bulk_create`), à la position correspondante.
+        """
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if adding and isinstance(self.stories, list):
+            Story.objects.bulk_create(
+                Story.from_json(self, position, item) for position, item in enumerate(self.stories)
+            )
 
     def __str__(self):
         """!
         @brief Représentation textuelle de la session.
         """
         return f"{self.titre} ({self.id_session} - {self.mode_de_jeu})"
+
+    class Meta:
+        """!
+        @brief Métadonnées du modèle Session.
+        """
+        indexes = [
+            # Pagination du lobby par curseur (`LobbyPagination.ordering`)
+            models.Index(fields=['-created_at', 'id_session'], name='session_lobby_idx'),
+        ]
     
 
-class Partie(models.Model):
+class PartieQuerySet(models.QuerySet):
+    """!
+    @brief Requêtes sur les joueurs.
+    """
+
+    def with_vote(self):
+        """!
+        @brief Annote chaque joueur de son vote de la manche en cours : `carte_choisie` (ou None) et `a_vote`.
+
+        Une sous-requête par joueur, servie par l'index unique (session, manche, joueur) de `Vote`.
+        """
+        vote = Vote.objects.filter(
+            session=OuterRef('id_session'), round=OuterRef('id_session__round'), username=OuterRef('username'),
+        ).values('carte')[:1]
+        return self.annotate(carte_choisie=Subquery(vote)).annotate(
+            a_vote=ExpressionWrapper(Q(carte_choisie__isnull=False), output_field=BooleanField()),
+        )
+
+
+class Partie(DirtyFieldsMixin, models.Model):
     """!
     @brief Représente la participation d'un joueur à une session.
     
-    Cette table de liaison stocke l'état individuel de chaque joueur 
-    (son vote actuel, s'il a voté, etc.) pour une session donnée.
+    Cette table de liaison stocke la présence de chaque joueur dans une session.
+    Ses votes sont dans `Vote` : `Partie.objects.with_vote()` ajoute celui de la manche en cours.
     """
 
     # Note: user_id pourrait être ajouté ici plus tard via cookie/uuid.
@@ -74,16 +198,18 @@ class Partie(models.Model):
     ## @brief Nom d'affichage du joueur.
     username = models.CharField(max_length=100)
 
-    ## @brief Valeur de la carte sélectionnée (ex: "5", "8", "cafe", "?").
-    ## Null si le joueur n'a pas encore choisi de carte.
-    carte_choisie = models.CharField(max_length=10, blank=True, null=True)
-
-    ## @brief Indique si le joueur a validé son vote pour le tour actuel.
-    a_vote = models.BooleanField(default=False)
-
     ## @brief Lien vers la Session active (Clé étrangère).
     id_session = models.ForeignKey(Session, on_delete=models.CASCADE) 
 
+    ## @brief Date d'arrivée du joueur dans la session.
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    ## @brief Date de la dernière action du joueur (arrivée, vote).
+    ## Indexée pour la purge des joueurs inactifs (voir `purge.py`).
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = PartieQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.username} in session {self.id_session.id_session}"
     
@@ -92,4 +218,208 @@ class Partie(models.Model):
         @brief Métadonnées du modèle Partie.
         """
         # Empêche d'avoir deux fois le même username dans la même session
-        unique_together = ('username', 'id_session')
\ No newline at end of file
+        unique_together = ('username', 'id_session')
+
+
+class Vote(models.Model):
+    """!
+    @brief Vote d'un joueur pour une manche d'une session.
+
+    Repéré par (session, manche, joueur) : un nouveau vote dans la même manche remplace
+    le précédent, une nouvelle manche (`Session.round`) repart sans aucun vote sans rien
+    effacer. Les manches passées restent consultables, y compris pour les joueurs partis.
+    """
+
+    ## @brief Session du vote (Clé étrangère).
+    session = models.ForeignKey(Session, on_delete=models.CASCADE)
+
+    ## @brief Manche du vote (valeur de `Session.round` au moment du vote).
+    round = models.PositiveIntegerField()
+
+    ## @brief Nom du joueur (identifie le joueur dans la session, comme `Partie.username`).
+    username = models.CharField(max_length=100)
+
+    ## @brief Valeur de la carte votée (ex: "5", "8", "cafe", "?").
+    carte = models.CharField(max_length=10)
+
+    ## @brief Date du premier vote du joueur dans la manche.
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    ## @brief Date du dernier changement de vote dans la manche.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.username}: {self.carte} (manche {self.round} in session {self.session_id})"
+
+    @classmethod
+    def cast(cls, id_session, username, carte):
+        """!
+        @brief Enregistre (ou remplace) le vote d'un joueur pour la manche en cours, en une seule requête.
+
+        La manche est lue par une sous-requête dans l'INSERT (`... ON CONFLICT DO UPDATE`).
+        """
+        vote = cls(session_id=id_session, round=Subquery(Session.objects.filter(pk=id_session).values('round')),
+                   username=username, carte=carte)
+        cls.objects.bulk_create([vote], update_conflicts=True, unique_fields=['session', 'round', 'username'],
+                                update_fields=['carte', 'updated_at'])
+
+    @classmethod
+    def _current(cls, id_session, username):
+        return cls.objects.filter(
+            session_id=id_session, username=username,
+            round=Subquery(Session.objects.filter(pk=id_session).values('round')),
+        )
+
+    @classmethod
+    def withdraw(cls, id_session, username):
+        """!
+        @brief Retire le vote d'un joueur pour la manche en cours.
+        """
+        cls._current(id_session, username).delete()
+
+    @classmethod
+    async def awithdraw(cls, id_session, username):
+        """!
+        @brief Variante asynchrone de `withdraw`.
+        """
+        await cls._current(id_session, username).adelete()
+
+    class Meta:
+        """!
+        @brief Métadonnées du modèle Vote.
+        """
+        # Un vote par joueur et par manche (crée aussi l'index des lectures par (session, manche))
+        unique_together = ('session', 'round', 'username')
+
+
+class Story(models.Model):
+    """!
+    @brief Représente une user story du backlog d'une session.
+
+    Une ligne par story, repérée par sa position dans le backlog. Clôturer une story
+    ne modifie que sa ligne (au lieu de réécrire tout le JSON `Session.stories`).
+    """
+
+    ## @brief Session à laquelle appartient la story (Clé étrangère).
+    session = models.ForeignKey(Session, on_delete=models.CASCADE)
+
+    ## @brief Position de la story dans le backlog (0 pour la première, = `story_index`).
+    position = models.PositiveIntegerField()
+
+    ## @brief Titre de la story.
+    titre = models.CharField(max_length=255, blank=True, default='')
+
+    ## @brief Description détaillée de la story.
+    contenu = models.TextField(blank=True, default='')
+
+    ## @brief Résultat du vote (ex: "5", "-1" en cas de désaccord). Null tant que la story n'est pas clôturée.
+    valeur_finale = models.CharField(max_length=10, blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.titre} (#{self.position} in session {self.session_id})"
+
+    @classmethod
+    def from_json(cls, session, position, item):
+        """!
+        @brief Construit (sans l'enregistrer) une Story à partir d'un élément du JSON `stories`.
+
+        @param session Session propriétaire.
+        @param position Index de l'élément dans le backlog.
+        @param item Dictionnaire `{"titre", "contenu", "valeur_finale"}` (ou valeur simple, prise comme titre).
+        """
+        if not isinstance(item, dict):
+            return cls(session=session, position=position, titre=str(item)[:255])
+        valeur_finale = item.get('valeur_finale')
+        return cls(
+            session=session,
+            position=position,
+            titre=str(item.get('titre') or '')[:255],
+            contenu=str(item.get('contenu') or ''),
+            valeur_finale=None if valeur_finale is None else str(valeur_finale),
+        )
+
+    def as_json(self):
+        """!
+        @brief Représentation au format historique du JSON `stories`.
+
+        `valeur_finale` n'est présente qu'une fois la story clôturée, comme auparavant.
+        """
+        data = {'titre': self.titre, 'contenu': self.contenu}
+        if self.valeur_finale is not None:
+            data['valeur_finale'] = self.valeur_finale
+        return data
+
+    class Meta:
+        """!
+        @brief Métadonnées du modèle Story.
+        """
+        ordering = ['position']
+        # Une seule story par position dans une session (crée aussi l'index (session, position))
+        unique_together = ('session', 'position')
+
+
+class SessionChange(models.Model):
+    """!
+    @brief Journal des changements de l'état de jeu d'une session, une ligne par version.
+
+    Écrit par `events.publish` dans la même transaction que l'incrément de `Session.version` :
+    la ligne de version N décrit l'événement qui a fait passer la session à N. Sert à
+    `GET /sessions/{id}/delta/?since=N` (voir `changelog.py`). Les lignes anciennes sont
+    purgées après `CHANGELOG_TTL` secondes.
+    """
+
+    ## @brief Session concernée (Clé étrangère).
+    session = models.ForeignKey(Session, on_delete=models.CASCADE)
+
+    ## @brief Version de la session produite par ce changement.
+    version = models.PositiveIntegerField()
+
+    ## @brief Type d'événement (ex: 'vote_card', 'close_story'), comme diffusé aux clients.
+    event = models.CharField(max_length=50)
+
+    ## @brief Données de l'événement (ex: `{"username": "Alice"}`).
+    data = models.JSONField(default=dict)
+
+    ## @brief Date du changement. Indexée pour la purge du journal (voir `purge.py`).
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.event} (v{self.version} in session {self.session_id})"
+
+    class Meta:
+        """!
+        @brief Métadonnées du modèle SessionChange.
+        """
+        ordering = ['version']
+        # Une ligne par version (crée aussi l'index (session, version) des lectures `since`)
+        unique_together = ('session', 'version')
+
+
+class CodeCounter(models.Model):
+    """!
+    @brief Compteur d'allocation des codes de session neufs, un par alphabet.
+
+    `next_index` est l'indice du prochain code à tirer ; il passe dans la permutation
+    de `codes.permute` avant d'être écrit dans l'alphabet. Voir `codes.allocate_code`.
+    """
+
+    ## @brief Alphabet des codes tirés par ce compteur (ex: "0123456789").
+    alphabet = models.CharField(max_length=64, primary_key=True)
+
+    ## @brief Nombre de codes déjà tirés dans cet alphabet.
+    next_index = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.alphabet}: {self.next_index}"
+
+
+class RecycledCode(models.Model):
+    """!
+    @brief Code de session libéré par la suppression de sa session, à réattribuer en priorité.
+    """
+
+    ## @brief Le code libéré.
+    code = models.CharField(max_length=6, primary_key=True)
+
+    def __str__(self):
+        return self.code
@@ -0,0 +1,32 @@
+"""!
+@brief Classes de pagination de l'API Planning Poker.
+"""
+
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class StoryPagination(PageNumberPagination):
+    """!
+    @brief Pagination par numéro de page des stories d'une session.
+
+    Paramètres GET : `page` (défaut 1) et `page_size` (défaut 50, max 500).
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+
+class LobbyPagination(CursorPagination):
+    """!
+    @brief Pagination par curseur (keyset) du lobby des sessions.
+
+    Les sessions les plus récentes d'abord (les codes, pseudo-aléatoires, ne donnent aucun
+    ordre utile), départagées par leur code. Chaque page est obtenue par un
+    `WHERE created_at < <curseur>` servi par l'index `session_lobby_idx` : le coût ne
+    dépend pas du numéro de page, contrairement à un OFFSET.
+    Paramètres GET : `cursor` (opaque, fourni dans `next`/`previous`) et `page_size` (max 100).
+    """
+    ordering = ('-created_at', 'id_session')
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
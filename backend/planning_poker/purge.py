@@ -0,0 +1,213 @@
+"""!
+@brief Expiration et purge par lots des sessions et joueurs abandonnés.
+
+Une session expire quand elle n'a plus d'activité (`updated_at`) depuis :
+- `SESSION_CLOSED_TTL` secondes si elle est fermée ;
+- `SESSION_IDLE_TTL` secondes sinon (session abandonnée en cours de partie).
+
+Un joueur expire quand il n'a plus agi depuis `PARTIE_IDLE_TTL` secondes (navigateur
+fermé sans appeler `fin_partie`).
+
+Les lignes du journal des changements (`SessionChange`) expirent après `CHANGELOG_TTL`
+secondes : un client plus en retard reçoit un instantané complet (voir `changelog.py`).
+
+Les suppressions se font par lots de `PURGE_BATCH_SIZE` lignes, chacun dans sa propre
+transaction courte, pour ne jamais verrouiller les tables longtemps. La purge est lancée
+par la commande `manage.py purge_sessions`, ou périodiquement dans le serveur si
+`PURGE_INTERVAL` est non nul (voir `start_periodic_purge`).
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .events import publish
+from .models import Partie, Session, SessionChange, Story
+
+logger = logging.getLogger(__name__)
+
+## @brief Thread de purge périodique du processus (un seul par processus).
+_thread = None
+
+
+def expired_sessions(now=None):
+    """!
+    @brief Sessions expirées à la date `now` (par défaut maintenant).
+    """
+    now = now or timezone.now()
+    fermees = Q(status='closed', updated_at__lt=now - timedelta(seconds=settings.SESSION_CLOSED_TTL))
+    abandonnees = ~Q(status='closed') & Q(updated_at__lt=now - timedelta(seconds=settings.SESSION_IDLE_TTL))
+    return Session.objects.filter(fermees | abandonnees)
+
+
+def expired_parties(now=None):
+    """!
+    @brief Joueurs inactifs à la date `now` (par défaut maintenant).
+    """
+    now = now or timezone.now()
+    return Partie.objects.filter(updated_at__lt=now - timedelta(seconds=settings.PARTIE_IDLE_TTL))
+
+
+def _archive(pks, archive):
+    """!
+    @brief Écrit une ligne JSON par session (avec les résultats de ses stories) avant suppression.
+
+    @param pks Codes des sessions archivées.
+    @param archive Fichier texte ouvert en écriture.
+    """
+    stories = defaultdict(list)
+    for story in Story.objects.filter(session__in=pks).order_by('session', 'position'):
+        stories[story.session_id].append(story.as_json())
+    for session in Session.objects.filter(pk__in=pks).defer('stories').order_by('updated_at'):
+        archive.write(json.dumps({
+            'id_session': session.id_session,
+            'titre': session.titre,
+            'mode_de_jeu': session.mode_de_jeu,
+            'status': session.status,
+            'created_at': session.created_at.isoformat(),
+            'updated_at': session.updated_at.isoformat(),
+            'stories': stories[session.id_session],
+        }, ensure_ascii=False) + '\n')
+
+
+def purge_sessions(now=None, batch_size=None, archive=None, dry_run=False):
+    """!
+    @brief Supprime les sessions expirées (et, en cascade, leurs stories et joueurs).
+
+    @param now Date de référence (par défaut maintenant).
+    @param batch_size Nombre de sessions par lot (par défaut `PURGE_BATCH_SIZE`).
+    @param archive Fichier optionnel où archiver les sessions avant suppression (JSON Lines).
+    @param dry_run Si True, compte les sessions expirées sans rien supprimer.
+    @return Le nombre de sessions supprimées (ou à supprimer en `dry_run`).
+    """
+    qs = expired_sessions(now)
+    if dry_run:
+        return qs.count()
+
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    total = 0
+    while True:
+        with transaction.atomic():
+            pks = list(
+                qs.select_for_update(skip_locked=True).order_by('updated_at')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                return total
+            if archive is not None:
+                _archive(pks, archive)
+            Session.objects.filter(pk__in=pks).delete()
+        total += len(pks)
+
+
+def purge_parties(now=None, batch_size=None, dry_run=False):
+    """!
+    @brief Supprime les joueurs inactifs et prévient les sessions concernées.
+
+    Un événement `purge_joueurs` est publié par session touchée, pour mettre à jour
+    le décompte des votes et rafraîchir les clients connectés. Il ne compte pas comme
+    une activité de la session (`updated_at` inchangé) : une session dont les joueurs
+    expirent reste elle-même expirable.
+
+    @param now Date de référence (par défaut maintenant).
+    @param batch_size Nombre de joueurs par lot (par défaut `PURGE_BATCH_SIZE`).
+    @param dry_run Si True, compte les joueurs inactifs sans rien supprimer.
+    @return Le nombre de joueurs supprimés (ou à supprimer en `dry_run`).
+    """
+    qs = expired_parties(now)
+    if dry_run:
+        return qs.count()
+
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    total = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                qs.select_for_update(skip_locked=True).order_by('updated_at')
+                .values_list('pk', 'id_session', 'username')[:batch_size]
+            )
+            if not rows:
+                return total
+            Partie.objects.filter(pk__in=[pk for pk, _, _ in rows]).delete()
+
+            par_session = defaultdict(list)
+            for _, id_session, username in rows:
+                par_session[id_session].append(username)
+            for id_session, usernames in par_session.items():
+                publish(id_session, 'purge_joueurs', {'usernames': usernames}, updated_at=F('updated_at'))
+        total += len(rows)
+
+
+def purge_changes(now=None, batch_size=None, dry_run=False):
+    """!
+    @brief Supprime les lignes expirées du journal des changements.
+
+    @param now Date de référence (par défaut maintenant).
+    @param batch_size Nombre de lignes par lot (par défaut `PURGE_BATCH_SIZE`).
+    @param dry_run Si True, compte les lignes expirées sans rien supprimer.
+    @return Le nombre de lignes supprimées (ou à supprimer en `dry_run`).
+    """
+    now = now or timezone.now()
+    qs = SessionChange.objects.filter(created_at__lt=now - timedelta(seconds=settings.CHANGELOG_TTL))
+    if dry_run:
+        return qs.count()
+
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    total = 0
+    while True:
+        with transaction.atomic():
+            pks = list(qs.order_by('created_at').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                return total
+            SessionChange.objects.filter(pk__in=pks).delete()
+        total += len(pks)
+
+
+def purge_expired(now=None, batch_size=None, archive=None, dry_run=False):
+    """!
+    @brief Purge complète : sessions expirées, joueurs inactifs des sessions restantes, puis journal.
+
+    @return Dictionnaire `{'sessions': n, 'joueurs': m, 'changements': k}`.
+    """
+    return {
+        'sessions': purge_sessions(now, batch_size, archive, dry_run),
+        'joueurs': purge_parties(now, batch_size, dry_run),
+        'changements': purge_changes(now, batch_size, dry_run),
+    }
+
+
+def start_periodic_purge(interval):
+    """!
+    @brief Lance (une seule fois par processus) un thread qui purge toutes les `interval` secondes.
+
+    Le thread est en mode démon : il s'arrête avec le serveur. Une erreur de purge est
+    journalisée sans arrêter le thread.
+
+    @param interval Période en secondes.
+    @return Le thread de purge.
+    """
+    global _thread
+    if _thread is not None:
+        return _thread
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                logger.info("Purge des sessions expirées : %s", purge_expired())
+            except Exception:
+                logger.exception("Échec de la purge périodique")
+            finally:
+                close_old_connections()
+
+    _thread = threading.Thread(target=run, name='planning-poker-purge', daemon=True)
+    _thread.start()
+    return _thread
@@ -0,0 +1,94 @@
+"""!
+@brief Renderers et parsers rapides de l'API : JSON via orjson, MessagePack sur demande.
+
+- `ORJSONRenderer` / `ORJSONParser` remplacent le JSON de DRF (même type `application/json`,
+  même sortie compacte) : la sérialisation des gros backlogs et des listes de joueurs
+  est faite en C au lieu du module `json` ;
+- `MessagePackRenderer` / `MessagePackParser` (`application/msgpack`) ne sont utilisés que
+  si le client les demande (`Accept` ou `Content-Type`) : JSON reste le format par défaut.
+
+Les types que orjson et msgpack ne savent pas encoder (Decimal, chaînes traduisibles,
+QuerySet...) passent par l'encodeur JSON de DRF : le contenu est le même qu'avec
+`JSONRenderer`. Comme lui, les séparateurs U+2028 et U+2029 sont échappés (ils ne
+sont pas valides dans une chaîne JavaScript avant ES2019).
+"""
+
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+## @brief Conversion des types non natifs, partagée par les deux formats.
+_default = JSONEncoder().default
+
+## @brief Séparateurs de ligne et de paragraphe Unicode (UTF-8), échappés comme le fait `JSONRenderer`.
+_LINE_SEPARATOR = '\u2028'.encode()
+_PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class ORJSONRenderer(BaseRenderer):
+    """!
+    @brief Rend les réponses en JSON compact avec orjson.
+
+    Un paramètre `indent` dans `Accept` (ex: `application/json; indent=4`) indente la sortie
+    (orjson n'indente que sur 2 espaces).
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        option = orjson.OPT_NON_STR_KEYS
+        if accepted_media_type and 'indent=' in accepted_media_type:
+            option |= orjson.OPT_INDENT_2
+        rendu = orjson.dumps(data, default=_default, option=option)
+        if _LINE_SEPARATOR in rendu:
+            rendu = rendu.replace(_LINE_SEPARATOR, b'\\u2028')
+        if _PARAGRAPH_SEPARATOR in rendu:
+            rendu = rendu.replace(_PARAGRAPH_SEPARATOR, b'\\u2029')
+        return rendu
+
+
+class MessagePackRenderer(BaseRenderer):
+    """!
+    @brief Rend les réponses en MessagePack (`application/msgpack`), sur demande du client.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+class ORJSONParser(BaseParser):
+    """!
+    @brief Lit les corps `application/json` avec orjson.
+    """
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON invalide : {exc}")
+
+
+class MessagePackParser(BaseParser):
+    """!
+    @brief Lit les corps `application/msgpack`.
+    """
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as exc:
+            raise ParseError(f"MessagePack invalide : {exc}")
@@ -0,0 +1,168 @@
+"""!
+@brief Cache des réponses de polling (détail de session, liste des joueurs), invalidé par version.
+
+Une réponse est mise en cache déjà rendue (octets + en-têtes utiles), sous une clé
+`(route, id_session, version, génération, format)` :
+- `version` est la colonne `Session.version`, relue à chaque requête (une lecture indexée) :
+  toute action de jeu et toute écriture CRUD de l'API passent par `events.bump_version`,
+  y compris les `update()` en masse (`raz_vote`, `vote_card`) qui n'envoient aucun signal ;
+- `génération` est un compteur du cache, incrémenté après COMMIT par les signaux `post_save`
+  (Session, Partie) et `post_delete` (Session) : il couvre les écritures faites hors de
+  l'API (administration, scripts), qui ne changent pas la version.
+
+Une écriture change donc la clé : les anciennes entrées ne sont plus jamais lues et
+expirent d'elles-mêmes (`RESPONSE_CACHE_TIMEOUT`). Les succès et échecs sont comptés
+par route (métrique Prometheus `planning_poker_response_cache_total`, et `stats()`), ainsi
+que les lectures coalescées : calculées une seule fois pour plusieurs requêtes simultanées.
+
+La coalescence se fait dans `cached_response`, entre les threads du processus (voir
+`singleflight.py`), sous une clé qui contient la version relue : une requête arrivée après
+une écriture validée ne rejoint jamais un calcul commencé avant elle. Sous ASGI (daphne),
+chaque requête a son propre contexte `ThreadSensitiveContext`, donc son propre thread pour
+les vues synchrones : les polls simultanés y sont coalescés de la même façon.
+
+@note Avec plusieurs workers, partager le cache (`CACHE_REDIS_URL`) : sinon une écriture
+      hors API n'invalide que le cache du worker qui l'a traitée (celles de l'API, elles,
+      changent la version en base et restent exactes).
+"""
+
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework import status
+
+from .metrics import RESPONSE_CACHE
+from .models import Session
+from .singleflight import SingleFlight
+
+## @brief En-têtes de la réponse conservés avec son contenu.
+CACHED_HEADERS = ('Content-Type', 'Vary', 'Allow')
+
+## @brief Succès / échecs / lectures coalescées dans ce processus, par route (voir `stats()`).
+_compteurs = Counter()
+
+## @brief Calculs de réponse en cours dans ce processus, partagés par les requêtes identiques simultanées.
+_en_vol = SingleFlight(timeout=getattr(settings, 'SINGLE_FLIGHT_TIMEOUT', 10))
+
+
+def _timeout():
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def _generation_key(id_session):
+    return f"planning_poker:response_gen:{id_session}"
+
+
+def generation(id_session):
+    """!
+    @brief Génération courante des réponses d'une session.
+
+    Initialisée à l'horloge (en ns) si elle est absente du cache (jamais écrite, ou évincée) :
+    une génération recréée est toujours plus grande que les précédentes, une ancienne
+    réponse ne peut donc pas être relue par erreur.
+    """
+    cle = _generation_key(id_session)
+    valeur = cache.get(cle)
+    if valeur is None:
+        cache.add(cle, time.time_ns(), None)
+        valeur = cache.get(cle, 0)
+    return valeur
+
+
+def invalidate(id_session):
+    """!
+    @brief Invalide les réponses en cache d'une session, après le COMMIT de la transaction en cours.
+    """
+    def incr():
+        try:
+            cache.incr(_generation_key(id_session))
+        except ValueError:
+            cache.add(_generation_key(id_session), time.time_ns(), None)
+
+    if id_session:
+        transaction.on_commit(incr)
+
+
+def stats():
+    """!
+    @brief Statistiques du processus : `{route: {'hits', 'misses', 'coalesced', 'hit_ratio'}}`.
+
+    `hit_ratio` compte comme évitées les lectures servies par le cache ou par un calcul simultané.
+    """
+    routes = {route for route, _ in _compteurs}
+    resultat = {}
+    for route in sorted(routes):
+        hits, misses, coalesced = (_compteurs[route, r] for r in ('hit', 'miss', 'coalesced'))
+        total = hits + misses + coalesced
+        resultat[route] = {'hits': hits, 'misses': misses, 'coalesced': coalesced,
+                           'hit_ratio': (hits + coalesced) / total if total else 0.0}
+    return resultat
+
+
+def _entetes(response):
+    return {nom: response[nom] for nom in CACHED_HEADERS if response.has_header(nom)}
+
+
+def _compter(route, resultat):
+    _compteurs[route, resultat] += 1
+    RESPONSE_CACHE.labels(route, resultat).inc()
+
+
+class ResponseCacheMixin:
+    """!
+    @brief Mixin de ViewSet : sert les actions de lecture enveloppées par `cached_response` depuis le cache.
+    """
+
+    def cached_session_id(self):
+        """!
+        @brief Session concernée : `pk` de l'URL, sinon paramètre `id_session`.
+        """
+        return self.kwargs.get('pk') or self.request.query_params.get('id_session')
+
+    def cached_response(self, compute, request, *args, **kwargs):
+        """!
+        @brief Renvoie la réponse en cache de l'action, ou la calcule, la rend et la met en cache.
+
+        Les requêtes identiques simultanées (même clé, donc même version) d'un processus ne
+        calculent la réponse qu'une fois : les suivantes attendent ce calcul et en reçoivent
+        les octets (voir `singleflight.py`), même si le cache est désactivé.
+        Seules les réponses 200 d'une session existante sont mises en cache ; sans
+        `id_session`, l'action est simplement exécutée.
+
+        @param compute Méthode de l'action à mettre en cache (ex: `super().retrieve`).
+        """
+        id_session = self.cached_session_id()
+        if not id_session:
+            return compute(request, *args, **kwargs)
+        version = Session.objects.filter(pk=id_session).values_list('version', flat=True).first()
+        if version is None:
+            return compute(request, *args, **kwargs)
+
+        route = f"{self.basename}-{self.action}"
+        cle = (f"planning_poker:response:{route}:{id_session}:{version}:{generation(id_session)}:"
+               f"{request.accepted_renderer.format}:{request.META.get('QUERY_STRING', '')}")
+        timeout = _timeout()
+        if timeout:
+            en_cache = cache.get(cle)
+            if en_cache is not None:
+                _compter(route, 'hit')
+                contenu, entetes = en_cache
+                return HttpResponse(contenu, headers=entetes)
+
+        def calcul():
+            response = self.finalize_response(request, compute(request, *args, **kwargs), *args, **kwargs)
+            response.render()
+            if timeout and response.status_code == status.HTTP_200_OK:
+                cache.set(cle, (response.content, _entetes(response)), timeout)
+            return response
+
+        response, partage = _en_vol.do(cle, calcul)
+        if partage:
+            _compter(route, 'coalesced')
+            return HttpResponse(response.content, status=response.status_code, headers=_entetes(response))
+        _compter(route, 'miss')
+        return response
@@ -0,0 +1,109 @@
+"""!
+@brief Routage des requêtes SQL entre la base principale et ses réplicas en lecture.
+
+Par défaut, tout va sur la principale (`default`). Seules les actions déclarées dans
+`replica_read_actions` d'un ViewSet (`ReplicaReadMixin`) lisent sur un réplica : les
+GET de polling, de loin les plus nombreux (`PartieViewSet.list`, `SessionViewSet.retrieve`).
+
+Lecture de ses propres écritures :
+- dans une requête, dès qu'une écriture a lieu, les lectures suivantes repassent sur la principale ;
+- entre requêtes, une session modifiée est « épinglée » sur la principale pendant
+  `REPLICA_PIN_SECONDS` (le temps que le réplica rattrape son retard) : un joueur qui vient
+  de voter relit donc son vote, pas l'état d'avant. L'épingle est posée dans le cache Django
+  (à partager entre workers avec `CACHE_REDIS_URL`) par `events.bump_version` et par les
+  signaux `post_save` (voir `signals.py`).
+
+Sans réplica configuré (`DB_REPLICA_HOSTS`), le routeur ne fait rien.
+"""
+
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+## @brief Vrai pendant une action autorisée à lire sur un réplica (et tant qu'elle n'a rien écrit).
+_replica_reads = ContextVar('planning_poker_replica_reads', default=False)
+
+
+def replicas():
+    """!
+    @brief Alias des réplicas configurés (liste vide : pas de réplica).
+    """
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def _pin_key(id_session):
+    return f"planning_poker:pin:{id_session}"
+
+
+def pin_session(id_session):
+    """!
+    @brief Épingle les lectures d'une session sur la principale après une écriture.
+    """
+    if replicas() and id_session:
+        cache.set(_pin_key(id_session), True, getattr(settings, 'REPLICA_PIN_SECONDS', 5))
+
+
+def is_pinned(id_session):
+    """!
+    @brief Indique si les lectures d'une session doivent rester sur la principale.
+    """
+    return bool(id_session) and cache.get(_pin_key(id_session), False)
+
+
+class PrimaryReplicaRouter:
+    """!
+    @brief Routeur Django (`DATABASE_ROUTERS`) : réplicas pour les lectures autorisées, principale sinon.
+    """
+
+    def db_for_read(self, model, **hints):
+        aliases = replicas()
+        if aliases and _replica_reads.get():
+            return random.choice(aliases)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        # Lire ses propres écritures : la suite de la requête lit sur la principale
+        _replica_reads.set(False)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Principale et réplicas contiennent les mêmes données
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Les réplicas reçoivent le schéma par réplication
+        return db not in replicas()
+
+
+class ReplicaReadMixin:
+    """!
+    @brief Mixin de ViewSet : autorise les actions de `replica_read_actions` à lire sur un réplica.
+
+    Seulement pour les méthodes sûres (GET...) et si la session concernée n'est pas épinglée
+    (voir `replica_session_id`).
+    """
+
+    ## @brief Actions dont les lectures peuvent aller sur un réplica (ex: `{'list'}`).
+    replica_read_actions = frozenset()
+
+    def replica_session_id(self):
+        """!
+        @brief Session lue par l'action : `pk` de l'URL, sinon paramètre `id_session`.
+        """
+        return self.kwargs.get('pk') or self.request.query_params.get('id_session')
+
+    def dispatch(self, request, *args, **kwargs):
+        jeton = _replica_reads.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(jeton)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (replicas() and self.action in self.replica_read_actions and request.method in SAFE_METHODS
+                and not is_pinned(self.replica_session_id())):
+            _replica_reads.set(True)
@@ -0,0 +1,14 @@
+"""!
+@brief Routes WebSocket de l'application Planning Poker.
+
+Équivalent de `urls.py` pour le protocole WebSocket, branché dans `backend/asgi.py`.
+"""
+
+from django.urls import path
+
+from . import consumers
+
+## @brief Liste des routes WebSocket (une socket par joueur et par session).
+websocket_urlpatterns = [
+    path('ws/sessions/<str:id_session>/', consumers.SessionConsumer.as_asgi()),
+]
@@ -1,5 +1,23 @@
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
-from .models import Session, Partie
+from rest_framework.fields import empty
+from .models import Session, Partie, Story, Vote
+
+
+class StorySerializer(serializers.ModelSerializer):
+    """!
+    @brief Sérialiseur pour le modèle Story.
+
+    Utilisé par l'accès paginé aux stories d'une session (`/sessions/{id}/stories/`).
+    """
+    class Meta:
+        """!
+        @brief Métadonnées du sérialiseur Story.
+        """
+        model = Story
+        fields = ['position', 'titre', 'contenu', 'valeur_finale']
+
 
 class SessionSerializer(serializers.ModelSerializer):
     """!
@@ -8,6 +26,10 @@ class SessionSerializer(serializers.ModelSerializer):
     Transforme les objets Session en format JSON et valide les données 
     entrantes pour la création ou la modification de sessions.
     Utilisé par SessionViewSet.
+
+    Le champ `stories` garde sa forme JSON historique (liste de
+    `{"titre", "contenu", "valeur_finale"}`), mais il est construit à partir
+    des lignes `Story` dès que la session en possède.
     """
     class Meta:
         """!
@@ -17,6 +39,49 @@ class SessionSerializer(serializers.ModelSerializer):
         ## @brief Champs exposés dans l'API.
         fields = ['id_session', 'titre', 'stories', 'mode_de_jeu', 'status']
 
+    def to_representation(self, instance):
+        """!
+        @brief Remplace le JSON d'origine par les stories normalisées (avec leurs résultats).
+        """
+        data = super().to_representation(instance)
+        stories = instance.story_set.all()
+        if stories:
+            data['stories'] = [story.as_json() for story in stories]
+        return data
+
+    def update(self, instance, validated_data):
+        """!
+        @brief Met à jour la session ; un nouveau backlog remplace toutes ses stories.
+        """
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            if 'stories' in validated_data:
+                instance.story_set.all().delete()
+                if isinstance(instance.stories, list):
+                    Story.objects.bulk_create(
+                        Story.from_json(instance, position, item)
+                        for position, item in enumerate(instance.stories)
+                    )
+        return instance
+
+
+class SessionLobbySerializer(serializers.ModelSerializer):
+    """!
+    @brief Résumé d'une session pour le lobby (sans le contenu des stories).
+
+    `nb_stories` et `nb_joueurs` sont des annotations calculées par la même
+    requête SQL que la liste (voir `SessionViewSet.get_queryset`).
+    """
+    nb_stories = serializers.IntegerField(read_only=True)
+    nb_joueurs = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        """!
+        @brief Métadonnées du sérialiseur SessionLobby.
+        """
+        model = Session
+        fields = ['id_session', 'titre', 'mode_de_jeu', 'status', 'nb_stories', 'nb_joueurs']
+
 
 class PartieSerializer(serializers.ModelSerializer):
     """!
@@ -24,11 +89,106 @@ class PartieSerializer(serializers.ModelSerializer):
     
     Gère la représentation JSON des joueurs (participants) d'une session.
     Permet notamment de valider les votes et les inscriptions.
+    Le vote (`carte_choisie`, `a_vote`) est celui de la manche en cours, stocké dans `Vote` :
+    lu sur les joueurs annotés par `Partie.objects.with_vote()`, écrit par `Vote.cast`.
     """
+    ## @brief Carte votée dans la manche en cours (null : pas de vote, ou vote retiré).
+    carte_choisie = serializers.CharField(max_length=10, allow_null=True, required=False)
+
+    ## @brief Le joueur a voté dans la manche en cours (déduit de `carte_choisie`).
+    a_vote = serializers.BooleanField(read_only=True, default=False)
+
     class Meta:
         """!
         @brief Métadonnées du sérialiseur Partie.
         """
         model = Partie
-        ## @brief Tous les champs du modèle sont inclus ('username', 'carte_choisie', etc.).
-        fields = '__all__'
\ No newline at end of file
+        ## @brief Tous les champs du modèle sont inclus ('username', 'id_session', etc.), plus le vote.
+        fields = '__all__'
+
+    def _save_vote(self, id_session, username, carte):
+        """!
+        @brief Enregistre (ou retire, si `carte` est None) le vote de la manche en cours.
+
+        Appelé avant l'enregistrement du joueur, dont le `post_save` invalide ensuite les
+        réponses en cache de la session.
+        """
+        if carte is None:
+            Vote.withdraw(id_session, username)
+        else:
+            Vote.cast(id_session, username, carte)
+
+    def create(self, validated_data):
+        carte = validated_data.pop('carte_choisie', None)
+        if carte is not None:
+            self._save_vote(validated_data['id_session'].pk, validated_data['username'], carte)
+        partie = super().create(validated_data)
+        partie.carte_choisie, partie.a_vote = carte, carte is not None
+        return partie
+
+    def update(self, instance, validated_data):
+        carte = validated_data.pop('carte_choisie', empty)
+        if carte is not empty:
+            id_session = validated_data['id_session'].pk if 'id_session' in validated_data else instance.id_session_id
+            self._save_vote(id_session, validated_data.get('username', instance.username), carte)
+            # Un vote est une action du joueur : la ligne est réécrite même sans autre changement
+            instance.updated_at = timezone.now()
+        partie = super().update(instance, validated_data)
+        if carte is not empty:
+            partie.carte_choisie, partie.a_vote = carte, carte is not None
+        return partie
+
+
+class JoueurEtatSerializer(serializers.ModelSerializer):
+    """!
+    @brief Représentation allégée d'un joueur dans l'état de jeu.
+
+    Ne contient que ce dont l'écran de partie a besoin (nom et vote).
+    Les joueurs doivent être annotés par `Partie.objects.with_vote()`.
+    """
+    carte_choisie = serializers.CharField(read_only=True, allow_null=True)
+    a_vote = serializers.BooleanField(read_only=True)
+
+    class Meta:
+        """!
+        @brief Métadonnées du sérialiseur JoueurEtat.
+        """
+        model = Partie
+        fields = ['username', 'carte_choisie', 'a_vote']
+
+
+class SessionStateSerializer(serializers.ModelSerializer):
+    """!
+    @brief Instantané complet de l'état de jeu d'une session.
+
+    Regroupe en une seule réponse le statut de la session, la story en cours
+    (la première sans `valeur_finale`) et la liste des joueurs avec leurs votes.
+    Utilisé par l'action `SessionViewSet.state`.
+    """
+    joueurs = serializers.SerializerMethodField()
+
+    class Meta:
+        """!
+        @brief Métadonnées du sérialiseur SessionState.
+        """
+        model = Session
+        fields = ['id_session', 'titre', 'mode_de_jeu', 'status', 'version', 'joueurs']
+
+    def get_joueurs(self, instance):
+        """!
+        @brief Joueurs de la session avec leur vote de la manche en cours.
+        """
+        return JoueurEtatSerializer(Partie.objects.filter(id_session=instance).with_vote(), many=True).data
+
+    def to_representation(self, instance):
+        """!
+        @brief Ajoute la story en cours (`story_index`, `story`) et le nombre de stories.
+
+        La story en cours est lue par une requête indexée sur (session, position).
+        """
+        data = super().to_representation(instance)
+        story = instance.story_set.filter(valeur_finale__isnull=True).order_by('position').first()
+        data['story_index'] = None if story is None else story.position
+        data['story'] = None if story is None else story.as_json()
+        data['nb_stories'] = instance.story_set.count()
+        return data
@@ -0,0 +1,67 @@
+"""!
+@brief Récepteurs de signaux de l'application 'planning_poker'.
+
+Connectés dans `PlanningPokerConfig.ready()`.
+"""
+
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .budgets import install_query_recorder
+from .codes import recycle_code
+from .metrics import install_query_counter
+from .response_cache import invalidate
+from .models import Partie, Session
+from .routers import pin_session
+
+
+@receiver(post_delete, sender=Session)
+def recycle_session_code(sender, instance, **kwargs):
+    """!
+    @brief Remet le code d'une session supprimée dans le pool des codes réutilisables.
+    """
+    recycle_code(instance.id_session)
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_save, sender=Partie)
+def pin_written_session(sender, instance, **kwargs):
+    """!
+    @brief Épingle sur la base principale les lectures de la session qui vient d'être enregistrée.
+
+    Les écritures par `update()`/`delete()` des actions de jeu sont couvertes par
+    `events.bump_version`. Pas de récepteur `post_delete` sur Partie : il forcerait Django
+    à relire les lignes avant chaque suppression.
+    """
+    pin_session(instance.pk if sender is Session else instance.id_session_id)
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def invalidate_session_responses(sender, instance, **kwargs):
+    """!
+    @brief Invalide les réponses en cache d'une session enregistrée ou supprimée.
+    """
+    invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Partie)
+def invalidate_partie_responses(sender, instance, **kwargs):
+    """!
+    @brief Invalide les réponses en cache de la session d'un joueur enregistré.
+
+    Pas de `post_delete` (voir `pin_written_session`) : les suppressions de joueurs passent
+    par `events.publish` (nouvelle version), y compris `PartieViewSet.perform_destroy`.
+    """
+    invalidate(instance.id_session_id)
+
+
+@receiver(connection_created)
+def count_connection_queries(sender, connection, **kwargs):
+    """!
+    @brief Branche le comptage des requêtes SQL (métriques, budgets des vues asynchrones)
+    sur chaque nouvelle connexion.
+    """
+    install_query_counter(connection)
+    install_query_recorder(connection)
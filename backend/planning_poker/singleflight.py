@@ -0,0 +1,84 @@
+"""!
+@brief Coalescence des calculs identiques simultanés (« single flight ») dans un processus.
+
+À la clôture d'une story, tous les clients d'une salle interrogent le serveur au même
+instant : sans coalescence, chaque worker exécute la même requête SQL et la même
+sérialisation. Avec `SingleFlight.do(cle, calcul)`, le premier appel pour une clé
+exécute le calcul ; les appels simultanés avec la même clé attendent son résultat et le
+partagent. Un appel arrivé après la fin du calcul en relance un nouveau : rien n'est
+conservé, la coalescence ne rend donc jamais une donnée plus ancienne que la requête.
+
+La coalescence se fait entre threads d'un processus : serveur WSGI à threads
+(`gunicorn --threads`), ou ASGI (daphne), où chaque requête exécute ses vues synchrones
+dans son propre thread (un `ThreadSensitiveContext` par requête).
+
+@note Avec des workers synchrones à un seul thread (`gunicorn` par défaut), un processus ne
+      traite qu'une requête à la fois : il n'y a rien à coalescer.
+"""
+
+import threading
+
+
+class _Call:
+    """!
+    @brief Calcul en cours pour une clé : résultat (ou exception) et signal de fin.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """!
+    @brief Registre des calculs en cours, par clé (sûr entre threads).
+    """
+
+    def __init__(self, timeout=None):
+        """!
+        @param timeout Attente maximale (secondes) d'un calcul en cours ; au-delà, l'appelant
+                       calcule lui-même (None : attente illimitée).
+        """
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """!
+        @brief Exécute `fn()`, ou attend le résultat du même calcul déjà en cours pour `key`.
+
+        L'exception levée par le calcul est relancée chez tous les appelants qui l'attendaient.
+
+        @return `(résultat, partagé)` : `partagé` vaut True si le résultat vient du calcul d'un autre appel.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(self.timeout):
+                return fn(), False
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        """!
+        @brief Nombre de calculs en cours.
+        """
+        with self._lock:
+            return len(self._calls)
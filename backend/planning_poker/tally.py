@@ -0,0 +1,167 @@
+"""!
+@brief Décompte incrémental des votes d'une session (cache Django).
+
+Pour chaque session, le cache conserve :
+- `joueurs` : `{username: [carte_choisie, a_vote]}` (votes de la manche en cours) ;
+- `histogram` : `{carte: nombre de votes}` ;
+- `nb_votes` : nombre de joueurs ayant voté ;
+- `version` : la version de la session à laquelle ce décompte correspond.
+
+Le décompte est mis à jour à partir des événements publiés par `events.publish()`
+(après COMMIT), sans relire les tables `Partie` et `Vote`. Une lecture n'est servie
+depuis le cache que si sa version est égale à celle de la session en base : chaque écriture
+incrémente les deux, donc une écriture faite par un autre processus (ou une mise
+à jour perdue) crée un écart et provoque une reconstruction depuis la base.
+Les mises à jour sont idempotentes, ce qui rend sans danger un événement
+appliqué sur un décompte qui le contenait déjà.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Session, Partie
+
+
+## @brief Écritures CRUD d'un joueur (`PartieViewSet`) : leur effet sur les votes n'est pas détaillé,
+## le décompte est abandonné et reconstruit à la prochaine lecture.
+REBUILD_EVENTS = frozenset({'create_partie', 'update_partie', 'destroy_partie'})
+
+
+def _key(id_session):
+    """!
+    @brief Clé de cache du décompte d'une session.
+    """
+    return f"planning_poker:tally:{id_session}"
+
+
+def _timeout():
+    """!
+    @brief Durée de vie (secondes) d'un décompte dans le cache.
+    """
+    return getattr(settings, 'TALLY_TIMEOUT', 3600)
+
+
+def _set_vote(tally, username, carte, a_vote):
+    """!
+    @brief Remplace le vote d'un joueur et ajuste l'histogramme et le compteur de votes.
+    """
+    ancienne, avait_vote = tally['joueurs'].get(username, [None, False])
+    if ancienne:
+        tally['histogram'][ancienne] -= 1
+        if not tally['histogram'][ancienne]:
+            del tally['histogram'][ancienne]
+    if carte:
+        tally['histogram'][carte] = tally['histogram'].get(carte, 0) + 1
+    tally['nb_votes'] += int(a_vote) - int(avait_vote)
+    tally['joueurs'][username] = [carte, a_vote]
+
+
+def rebuild(id_session, version=None):
+    """!
+    @brief Reconstruit le décompte d'une session depuis la base et le met en cache
+    après le COMMIT de la transaction en cours (immédiatement hors transaction).
+
+    La version est lue AVANT les joueurs : si une écriture survient entre les deux,
+    le décompte est étiqueté avec une version plus ancienne que son contenu, ce que
+    les mises à jour idempotentes tolèrent (l'inverse masquerait une écriture).
+
+    @param id_session Code de la session.
+    @param version Version de la session si elle est déjà connue.
+    @return Le décompte, ou None si la session n'existe pas.
+    """
+    if version is None:
+        version = Session.objects.filter(pk=id_session).values_list('version', flat=True).first()
+        if version is None:
+            return None
+
+    tally = {'version': version, 'joueurs': {}, 'histogram': {}, 'nb_votes': 0}
+    rows = (
+        Partie.objects.filter(id_session=id_session).with_vote()
+        .values_list('username', 'carte_choisie', 'a_vote')
+    )
+    for username, carte, a_vote in rows:
+        _set_vote(tally, username, carte, a_vote)
+    # Lu dans la transaction en cours (ex: lot `/api/batch/`) : jamais en cache si elle est annulée
+    transaction.on_commit(lambda: cache.set(_key(id_session), tally, _timeout()))
+    return tally
+
+
+def get_tally(id_session, version=None):
+    """!
+    @brief Renvoie le décompte à jour d'une session, en O(1) si le cache est valide.
+
+    @param id_session Code de la session.
+    @param version Version de la session si elle est déjà connue (évite une requête).
+    @return Le décompte, ou None si la session n'existe pas.
+    """
+    if version is None:
+        version = Session.objects.filter(pk=id_session).values_list('version', flat=True).first()
+        if version is None:
+            return None
+
+    tally = cache.get(_key(id_session))
+    if tally is None or tally['version'] != version:
+        tally = rebuild(id_session, version)
+    return tally
+
+
+async def aget_tally(id_session, version=None):
+    """!
+    @brief Variante asynchrone de `get_tally` (la reconstruction éventuelle passe par un thread).
+    """
+    if version is None:
+        version = await Session.objects.filter(pk=id_session).values_list('version', flat=True).afirst()
+        if version is None:
+            return None
+
+    tally = await cache.aget(_key(id_session))
+    if tally is None or tally['version'] != version:
+        tally = await sync_to_async(rebuild)(id_session, version)
+    return tally
+
+
+def apply_event(id_session, event, data):
+    """!
+    @brief Applique au décompte en cache l'événement publié pour une session.
+
+    Appelé après le COMMIT de l'écriture correspondante. Sans décompte en cache,
+    rien n'est fait : il sera reconstruit à la prochaine lecture.
+    Tout événement, même sans effet sur les votes ('close_story'...), avance la
+    version du décompte comme il a avancé celle de la session.
+
+    @param id_session Code de la session.
+    @param event Type d'événement (nom de l'action).
+    @param data Données de l'événement.
+    """
+    key = _key(id_session)
+    if event in REBUILD_EVENTS:
+        cache.delete(key)
+        return
+    tally = cache.get(key)
+    if tally is None:
+        return
+
+    username = data.get('username')
+    if event == 'vote_card':
+        carte = data['carte_choisie']
+        _set_vote(tally, username, None if carte is None else str(carte), True)
+    elif event == 'join_partie':
+        tally['joueurs'].setdefault(username, [None, False])
+    elif event == 'fin_partie':
+        if username in tally['joueurs']:
+            _set_vote(tally, username, None, False)
+            del tally['joueurs'][username]
+    elif event == 'purge_joueurs':
+        for nom in data.get('usernames', []):
+            if nom in tally['joueurs']:
+                _set_vote(tally, nom, None, False)
+                del tally['joueurs'][nom]
+    elif event == 'raz_vote':
+        tally['joueurs'] = {nom: [None, False] for nom in tally['joueurs']}
+        tally['histogram'] = {}
+        tally['nb_votes'] = 0
+
+    tally['version'] += 1
+    cache.set(key, tally, _timeout())
@@ -1,10 +1,69 @@
+import asyncio
+import copy
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from channels.layers import InMemoryChannelLayer, get_channel_layer
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.http import require_GET
 from rest_framework import viewsets, status
 from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
-from .models import Session, Partie
-from .serializers import SessionSerializer, PartieSerializer
+from . import aggregation, changelog, importers, tally
+from .budgets import QueryBudgetMixin, query_budget
+from .codes import normalize_code
+from .events import group_name, publish
+from .models import Session, Partie, Story, Vote
+from .pagination import LobbyPagination, StoryPagination
+from .response_cache import ResponseCacheMixin
+from .routers import ReplicaReadMixin
+from .serializers import (
+    SessionSerializer, SessionLobbySerializer, PartieSerializer, SessionStateSerializer, StorySerializer,
+)
+
+
+def _valeur(valeur_finale):
+    """!
+    @brief Convertit une valeur finale stockée (texte) en entier pour la réponse, si possible.
+    """
+    try:
+        return int(valeur_finale)
+    except ValueError:
+        return valeur_finale
+
+
+def _count_subquery(model, fk):
+    """!
+    @brief Sous-requête SQL comptant les lignes de `model` rattachées à la session courante.
+
+    @param model Modèle enfant (ex: Story, Partie).
+    @param fk Nom de sa clé étrangère vers Session.
+    """
+    counts = (
+        model.objects.filter(**{fk: OuterRef('pk')})
+        .order_by().values(fk).annotate(n=Count('pk')).values('n')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def session_etag(id_session, version):
+    """!
+    @brief Construit l'ETag fort de l'état d'une session pour une version donnée.
+
+    @return Une chaîne entre guillemets, ex: `"048239-12"`.
+    """
+    return quote_etag(f"{id_session}-{version}")
 
-class SessionViewSet(viewsets.ModelViewSet):
+
+class SessionViewSet(ResponseCacheMixin, ReplicaReadMixin, QueryBudgetMixin, viewsets.ModelViewSet):
     """!
     @brief VueSet pour la gestion des Sessions de Planning Poker.
     
@@ -14,90 +73,306 @@ class SessionViewSet(viewsets.ModelViewSet):
     queryset = Session.objects.all()
     serializer_class = SessionSerializer
 
+    ## @brief Budgets de requêtes SQL des actions standard (voir `budgets.py`).
+    ## La création compte l'allocation du code de session et l'insertion des stories, la
+    ## suppression celle des lignes liées (stories, joueurs, votes, journal des changements),
+    ## la modification la publication de la nouvelle version (version, relecture et journal) ;
+    ## le détail, la lecture de version du cache de réponses (seule requête s'il est à jour).
+    query_budgets = {
+        'list': 1, 'retrieve': 3, 'create': 8,
+        'update': 9, 'partial_update': 9, 'destroy': 8,
+    }
+
+    ## @brief Lectures de polling servies par un réplica s'il y en a (voir `routers.py`).
+    replica_read_actions = frozenset({'retrieve', 'state', 'delta'})
+
+    def get_queryset(self):
+        """!
+        @brief Adapte la requête à la route.
+
+        - Liste et lobby : résumé sans le JSON `stories`, avec le nombre de stories et de
+          joueurs annotés par sous-requêtes (une seule requête SQL au total).
+        - Détail, création, modification : préchargement des stories (pas de N+1).
+        - Actions métier : la session sans le JSON `stories` (les stories sont lues dans `Story`).
+        """
+        qs = super().get_queryset()
+        if self.action in ('list', 'lobby'):
+            qs = qs.defer('stories').annotate(
+                nb_stories=_count_subquery(Story, 'session'),
+                nb_joueurs=_count_subquery(Partie, 'id_session'),
+            )
+        elif self.action in ('retrieve', 'create', 'update', 'partial_update'):
+            qs = qs.prefetch_related(Prefetch('story_set', queryset=Story.objects.order_by('position')))
+        else:
+            qs = qs.defer('stories')
+        return qs
+
+    def get_serializer_class(self):
+        """!
+        @brief Sérialiseur résumé pour la liste : le contenu des stories n'est servi que par le détail.
+        """
+        if self.action == 'list':
+            return SessionLobbySerializer
+        return super().get_serializer_class()
+
+    def retrieve(self, request, *args, **kwargs):
+        """!
+        @brief Détail d'une session (polling), servi depuis le cache de réponses tant que la session n'a pas changé.
+        """
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def perform_update(self, serializer):
+        # Modification CRUD publiée comme une action : nouvelle version (ETag, cache de réponses) et événement
+        with transaction.atomic():
+            super().perform_update(serializer)
+            publish(serializer.instance.pk, 'update_session')
+
+    @action(detail=False, methods=['get'])
+    @query_budget(1)
+    def lobby(self, request):
+        """!
+        @brief Liste paginée (par curseur) des sessions, pour la page d'accueil.
+
+        @param request Objet HttpRequest avec les paramètres GET optionnels :
+            - `status` : un ou plusieurs statuts séparés par des virgules (ex: `open,in_progress`) ;
+            - `cursor` et `page_size` : voir `LobbyPagination`.
+
+        @return Response paginée `{'next', 'previous', 'results': [...]}` (voir `SessionLobbySerializer`),
+                ou 400 si un statut est inconnu.
+        """
+        qs = self.get_queryset()
+        statuts = request.query_params.get('status')
+        if statuts:
+            statuts = statuts.split(',')
+            if not set(statuts) <= {'open', 'in_progress', 'closed'}:
+                return Response({'error': 'Statut invalide'}, status=status.HTTP_400_BAD_REQUEST)
+            qs = qs.filter(status__in=statuts)
+
+        paginator = LobbyPagination()
+        page = paginator.paginate_queryset(qs, request, view=self)
+        return paginator.get_paginated_response(SessionLobbySerializer(page, many=True).data)
+
     @action(detail=True, methods=['post'])
+    @query_budget(8)
     def close_story(self, request, pk=None):
         """!
         @brief Clôture le vote pour une user story spécifique et calcule le résultat.
         
         Cette méthode récupère tous les votes des participants pour la session en cours,
-        applique l'algorithme de calcul défini par `mode_de_jeu` (strict, median, average, etc.),
-        et met à jour le JSON de la session avec la valeur finale.
+        applique la stratégie de calcul définie par `mode_de_jeu` (voir `aggregation.STRATEGIES` :
+        strict, median, average, majority_abs, majority_rel, min, max),
+        et enregistre la valeur finale sur la ligne `Story` correspondante.
 
         @param request Objet HttpRequest contenant les données POST :
-            - `story_index` (int): L'index de la story dans le tableau JSON 'stories' de la session.
+            - `story_index` (int): La position de la story dans le backlog de la session.
         @param pk Clé primaire de la session (id_session).
 
         @return Response :
-            - 200 OK : Contient `{'status': 'Validé', 'valeur_finale': <valeur>}`.
+            - 200 OK : Contient `{'status': 'Validé', 'valeur_finale': <valeur>}`, ou
+              `{'status': 'Déjà validé', ...}` si la story était déjà clôturée.
             - 400 Bad Request : Si l'index est invalide, manquant ou si aucun vote n'est trouvé.
         
         @note En mode 'strict', si les votes ne sont pas unanimes, `valeur_finale` sera -1.
+        @note Idempotent par story : tous les clients qui voient "tout le monde a voté" appellent
+              cette action ; seule la première clôture calcule et écrit le résultat.
         """
-        # Modes de calcul supportés
-        modes_de_calcul = ['strict', 'median', 'average', 'majority_abs', 'majority_rel']
         session = self.get_object()
         story_index = request.data.get('story_index')
 
         if story_index is None or not isinstance(story_index, int):
             return Response({'error': 'Index manquant'}, status=status.HTTP_400_BAD_REQUEST)
 
-        else:
-            # Détermination du mode de calcul (défaut: average)
-            mode_de_calcul = session.mode_de_jeu if session.mode_de_jeu in modes_de_calcul else 'average'
-            resultat_final = 0
-            votes = Partie.objects.filter(id_session=session)
-            
-            if votes.count() == 0:
-                return Response({'error': 'Aucun vote trouvé'}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Mise à jour du JSON
-            stories = list(session.stories)
-            if 0 <= story_index < len(stories):
-                
-                # --- Logique des modes de jeu ---
-                if mode_de_calcul == 'strict':
-                    cartes_choisies = [v.carte_choisie for v in votes if v.carte_choisie]
-                    if len(set(cartes_choisies)) == 1 and cartes_choisies:
-                        resultat_final = int(cartes_choisies[0])
-                    else:
-                        resultat_final = -1  # Désaccord
+        with transaction.atomic():
+            # Verrou sur la seule ligne de la story (PostgreSQL) : les clôtures concurrentes s'attendent
+            story = Story.objects.select_for_update().filter(session=session, position=story_index).first()
 
-                elif mode_de_calcul == 'median':
-                    valeurs = sorted([int(v.carte_choisie) for v in votes if v.carte_choisie and v.carte_choisie.isdigit()])
-                    n = len(valeurs)
-                    if n % 2 == 1:
-                        resultat_final = valeurs[n // 2]
-                    else:
-                        resultat_final = round((valeurs[n // 2 - 1] + valeurs[n // 2]) / 2)
-                
-                elif mode_de_calcul == 'average':
-                    valeurs = [int(v.carte_choisie) for v in votes if v.carte_choisie and v.carte_choisie.isdigit()]
-                    resultat_final = round(sum(valeurs) / len(valeurs)) if valeurs else 0
-                
-                elif mode_de_calcul == 'majority_abs':
-                    from collections import Counter
-                    cartes = [v.carte_choisie for v in votes if v.carte_choisie]
-                    if cartes:
-                        most_common = Counter(cartes).most_common(1)[0]
-                        resultat_final = int(most_common[0]) if most_common[1] > len(cartes) / 2 else -1
-
-                elif mode_de_calcul == 'majority_rel':
-                    from collections import Counter
-                    cartes = [v.carte_choisie for v in votes if v.carte_choisie]
-                    if cartes:
-                        most_common = Counter(cartes).most_common(1)[0]
-                        resultat_final = int(most_common[0])
-
-                # Sauvegarde du résultat dans le JSON stories
-                stories[story_index]['valeur_finale'] = str(resultat_final) 
-                session.stories = stories
-                session.save()
-                
-                return Response({'status': 'Validé', 'valeur_finale': resultat_final})
-            else:
+            # Story déjà clôturée (requête en double) : on renvoie le résultat existant, sans calcul ni écriture
+            if story is not None and story.valeur_finale is not None:
+                return Response({'status': 'Déjà validé', 'valeur_finale': _valeur(story.valeur_finale)})
+
+            # Décompte des votes tenu à jour à chaque écriture (reconstruit depuis la base si absent)
+            decompte = tally.get_tally(session.pk, session.version)
+            nb_joueurs, histogram = len(decompte['joueurs']), decompte['histogram']
+            if nb_joueurs == 0:
+                return Response({'error': 'Aucun vote trouvé'}, status=status.HTTP_400_BAD_REQUEST)
+            if story is None:
                 return Response({'error': 'Index invalide'}, status=status.HTTP_400_BAD_REQUEST)
 
+            # Calcul selon le mode de jeu (défaut: average)
+            resultat_final = aggregation.compute(session.mode_de_jeu, histogram)
+
+            # Écriture conditionnelle : sans verrou de ligne (SQLite), seule la première clôture l'emporte
+            updated = Story.objects.filter(pk=story.pk, valeur_finale__isnull=True).update(valeur_finale=str(resultat_final))
+            if not updated:
+                story.refresh_from_db(fields=['valeur_finale'])
+                return Response({'status': 'Déjà validé', 'valeur_finale': _valeur(story.valeur_finale)})
+            publish(session.pk, 'close_story', {'story_index': story_index, 'valeur_finale': resultat_final})
+
+        return Response({'status': 'Validé', 'valeur_finale': resultat_final})
+
+    @action(detail=True, methods=['post'])
+    def import_stories(self, request, pk=None):
+        """!
+        @brief Importe en flux un backlog de stories à la suite de celles de la session.
+
+        Le corps est lu et analysé au fil de l'eau (voir `importers`), jamais chargé
+        entièrement en mémoire : il n'est donc pas soumis à `DATA_UPLOAD_MAX_MEMORY_SIZE`.
+
+        @param request Objet HttpRequest dont le corps est :
+            - du JSON Lines (`Content-Type: application/x-ndjson` ou `application/jsonl`), une story par ligne ;
+            - ou un tableau JSON (`Content-Type: application/json`).
+            Chaque story est un objet `{"titre", "contenu", "valeur_finale"}` ("titre" obligatoire).
+        @param pk Clé primaire de la session.
+
+        @return Response :
+            - 201 Created : `{'importees': n, 'nb_erreurs': k, 'erreurs': [{'ligne', 'erreurs'}]}`,
+              les stories invalides étant ignorées.
+            - 400 Bad Request : Si le tableau JSON est mal formé (rien n'est importé).
+            - 404 Not Found : Si la session n'existe pas.
+            - 409 Conflict : Si un import concurrent a pris les mêmes positions (rien n'est importé).
+            - 411 Length Required : Corps envoyé par morceaux, sans Content-Length, sur un serveur WSGI
+              qui ne le termine pas (voir `_upload_stream`).
+            - 415 Unsupported Media Type : Pour tout autre type de contenu.
+        """
+        session = self.get_object()
+        content_type = request.content_type.split(';')[0].strip().lower()
+        stream = _upload_stream(request)
+        if stream is None:
+            return Response({'error': 'En-tête Content-Length requis'}, status=status.HTTP_411_LENGTH_REQUIRED)
+        batch_size = getattr(settings, 'IMPORT_BATCH_SIZE', 500)
+
+        if content_type in importers.JSONL_CONTENT_TYPES:
+            items = importers.iter_jsonl(stream)
+        elif content_type == 'application/json':
+            items = importers.iter_json_array(stream)
+        else:
+            return Response({'error': 'Type de contenu non supporté'}, status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+        try:
+            with transaction.atomic():
+                rapport = importers.import_stories(session, items, batch_size=batch_size)
+                if rapport['importees']:
+                    publish(session.pk, 'import_stories', {'importees': rapport['importees']})
+        except importers.ImportSyntaxError as exc:
+            return Response({'error': str(exc), 'ligne': exc.ligne}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            return Response({'error': 'Import concurrent en cours, réessayer'}, status=status.HTTP_409_CONFLICT)
+
+        return Response(rapport, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    @query_budget(3)
+    def stories(self, request, pk=None):
+        """!
+        @brief Renvoie les stories d'une session, page par page.
+
+        Alternative légère au champ `stories` du détail de session pour les gros backlogs.
+
+        @param request Objet HttpRequest (paramètres GET `page` et `page_size`).
+        @param pk Clé primaire de la session.
+
+        @return Response paginée : `{'count', 'next', 'previous', 'results': [...]}`.
+        """
+        if not Session.objects.filter(pk=pk).exists():
+            return Response({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+
+        paginator = StoryPagination()
+        page = paginator.paginate_queryset(Story.objects.filter(session_id=pk).order_by('position'), request, view=self)
+        return paginator.get_paginated_response(StorySerializer(page, many=True).data)
+
+    @action(detail=True, methods=['get'])
+    @query_budget(5)
+    def state(self, request, pk=None):
+        """!
+        @brief Renvoie l'état de jeu complet d'une session en une seule requête.
+
+        Regroupe le statut, la story en cours et la liste des joueurs avec leurs votes.
+        La réponse porte un ETag fort dérivé de la version de la session : si l'en-tête
+        `If-None-Match` du client correspond encore, la réponse est un 304 vide,
+        obtenu avec une seule lecture de la colonne `version` et sans sérialisation.
+
+        @param request Objet HttpRequest (en-tête `If-None-Match` optionnel).
+        @param pk Clé primaire de la session.
+
+        @return Response :
+            - 200 OK : L'état de jeu (voir `SessionStateSerializer`), avec l'en-tête `ETag`.
+            - 304 Not Modified : Si l'état n'a pas changé depuis l'ETag fourni.
+            - 404 Not Found : Si la session n'existe pas.
+        """
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            version = Session.objects.filter(pk=pk).values_list('version', flat=True).first()
+            if version is not None:
+                etag = session_etag(pk, version)
+                etags = [e.removeprefix('W/') for e in parse_etags(if_none_match)]
+                if '*' in etags or etag in etags:
+                    return Response(status=status.HTTP_304_NOT_MODIFIED,
+                                    headers={'ETag': etag, 'Cache-Control': 'no-cache'})
+
+        session = self.get_object()
+        data = SessionStateSerializer(session).data
+        return Response(data, headers={'ETag': session_etag(session.pk, session.version),
+                                       'Cache-Control': 'no-cache'})
+
+    @action(detail=True, methods=['get'])
+    @query_budget(4)
+    def delta(self, request, pk=None):
+        """!
+        @brief Renvoie les changements d'une session depuis la version connue du client.
+
+        Remplace le rechargement de la liste des joueurs et du backlog à chaque
+        rafraîchissement : la réponse ne contient que les joueurs arrivés, partis ou dont
+        le vote a changé, et les stories clôturées depuis `since` (voir `changelog.py`).
+
+        @param request Objet HttpRequest contenant le paramètre GET `since` (int ; -1 pour un premier chargement).
+        @param pk Clé primaire de la session.
+
+        @return Response :
+            - 200 OK : `{'version', 'full', 'status', 'raz', 'joueurs', 'partis', 'stories'}` ;
+              `full` vaut True si la réponse est un instantané complet (`since` trop ancien).
+            - 400 Bad Request : Si `since` est absent ou invalide.
+            - 404 Not Found : Si la session n'existe pas.
+        """
+        try:
+            since = int(request.query_params['since'])
+        except (KeyError, ValueError):
+            return Response({'error': 'Paramètre since invalide'}, status=status.HTTP_400_BAD_REQUEST)
+
+        data = changelog.delta(pk, since)
+        if data is None:
+            return Response({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data, headers={'Cache-Control': 'no-cache'})
+
+    @action(detail=True, methods=['get'])
+    @query_budget(2)
+    def progress(self, request, pk=None):
+        """!
+        @brief Renvoie l'avancement du vote en cours (endpoint léger).
+
+        Lu depuis le décompte en cache (`tally`), sans parcourir la liste des joueurs :
+        une seule lecture de la version de la session quand le cache est à jour.
+
+        @param request Objet HttpRequest.
+        @param pk Clé primaire de la session.
+
+        @return Response :
+            - 200 OK : `{'version', 'nb_joueurs', 'nb_votes', 'tous_ont_vote'}` (`tous_ont_vote` est faux sans joueur).
+            - 404 Not Found : Si la session n'existe pas.
+        """
+        decompte = tally.get_tally(pk)
+        if decompte is None:
+            return Response({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+
+        nb_joueurs = len(decompte['joueurs'])
+        return Response({
+            'version': decompte['version'],
+            'nb_joueurs': nb_joueurs,
+            'nb_votes': decompte['nb_votes'],
+            'tous_ont_vote': nb_joueurs > 0 and decompte['nb_votes'] == nb_joueurs,
+        })
+
     @action(detail=True, methods=['post'])
+    @query_budget(3)
     def close_session(self, request, pk=None):
         """!
         @brief Ferme définitivement une session.
@@ -108,15 +383,16 @@ class SessionViewSet(viewsets.ModelViewSet):
         @param pk Clé primaire de la session.
         @return Response JSON confirmant la fermeture.
         """
-        session = self.get_object()
-        if request.data.get('status') == 'closed':
-            session.status = 'closed' # Evite la saisie directe depuis le frontend
-            session.save()
-            return Response({'status': 'Session fermée'})
-        return Response({'error': 'Statut invalide'}, status=status.HTTP_400_BAD_REQUEST)
+        if request.data.get('status') != 'closed':
+            return Response({'error': 'Statut invalide'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Statut et version écrits par un seul UPDATE ; 0 ligne touchée = session inconnue
+        if not publish(pk, 'close_session', {'status': 'closed'}, status='closed'):
+            return Response({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'status': 'Session fermée'})
 
 
-class PartieViewSet(viewsets.ModelViewSet):
+class PartieViewSet(ResponseCacheMixin, ReplicaReadMixin, QueryBudgetMixin, viewsets.ModelViewSet):
     """!
     @brief VueSet pour la gestion des participants (joueurs).
     
@@ -126,23 +402,68 @@ class PartieViewSet(viewsets.ModelViewSet):
     queryset = Partie.objects.all()
     serializer_class = PartieSerializer
 
+    ## @brief Budgets de requêtes SQL des actions standard (voir `budgets.py`).
+    ## La liste compte la lecture de version du cache de réponses (seule requête s'il est à jour) ;
+    ## la création et la modification, l'écriture du vote (`Vote`) quand `carte_choisie` est fourni ;
+    ## les écritures, la publication de la nouvelle version (version, relecture et journal) ; déplacer un
+    ## joueur dans une autre session publie aussi dans l'ancienne.
+    query_budgets = {
+        'list': 2, 'retrieve': 1, 'create': 7,
+        'update': 10, 'partial_update': 10, 'destroy': 5,
+    }
+
+    ## @brief Lectures de polling servies par un réplica s'il y en a (voir `routers.py`).
+    replica_read_actions = frozenset({'list'})
+
     def get_queryset(self):
         """!
         @brief Filtre les participants par session.
         
         Si un paramètre `id_session` est fourni dans l'URL, ne renvoie que les joueurs
-        de cette session. Sinon, renvoie tous les joueurs.
+        de cette session. Sinon, renvoie tous les joueurs. Chaque joueur porte son vote
+        de la manche en cours (`Partie.objects.with_vote()`).
         """
-        qs = super().get_queryset()
+        qs = super().get_queryset().with_vote()
         session_id = self.request.query_params.get('id_session')
         return qs.filter(id_session=session_id) if session_id else qs
+
+    def list(self, request, *args, **kwargs):
+        """!
+        @brief Joueurs d'une session (polling), servis depuis le cache de réponses tant que la session n'a pas changé.
+        """
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def perform_create(self, serializer):
+        # Écritures CRUD publiées comme les actions : nouvelle version (ETag, cache de réponses,
+        # décompte) et événement diffusé ; le delta renvoie alors un instantané complet
+        with transaction.atomic():
+            super().perform_create(serializer)
+            partie = serializer.instance
+            publish(partie.id_session_id, 'create_partie', {'username': partie.username})
+
+    def perform_update(self, serializer):
+        ancienne = (serializer.instance.id_session_id, serializer.instance.username)
+        with transaction.atomic():
+            super().perform_update(serializer)
+            partie = serializer.instance
+            publish(partie.id_session_id, 'update_partie', {'username': partie.username})
+            if ancienne[0] != partie.id_session_id:
+                # Joueur déplacé : son ancienne session change aussi
+                publish(ancienne[0], 'destroy_partie', {'username': ancienne[1]})
+
+    def perform_destroy(self, instance):
+        # Suppression rapide (sans signal post_delete) : la nouvelle version invalide le cache de réponses
+        with transaction.atomic():
+            super().perform_destroy(instance)
+            publish(instance.id_session_id, 'destroy_partie', {'username': instance.username})
     
     @action(detail=False, methods=['post'])
+    @query_budget(5)
     def vote_card(self, request):
         """!
         @brief Enregistre le vote d'un joueur.
         
-        Met à jour le champ `carte_choisie` et passe `a_vote` à True pour le joueur donné.
+        Enregistre (ou remplace) le `Vote` du joueur pour la manche en cours de la session.
 
         @param request Objet HttpRequest contenant :
             - `username` (str): Nom du joueur.
@@ -158,16 +479,12 @@ class PartieViewSet(viewsets.ModelViewSet):
         if not username or not id_session or carte_choisie is None:
             return Response({'error': 'Paramètres manquants'}, status=status.HTTP_400_BAD_REQUEST)
 
-        partie = Partie.objects.filter(username=username, id_session=id_session).first()
-        if not partie:
+        if not _cast_vote(id_session, username, carte_choisie):
             return Response({'error': 'Partie introuvable'}, status=status.HTTP_404_NOT_FOUND)
-
-        partie.carte_choisie = carte_choisie
-        partie.a_vote = True
-        partie.save()
         return Response({'status': 'Vote enregistré'}, status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['post'])
+    @query_budget(4)
     def fin_partie(self, request):
         """!
         @brief Supprime un joueur d'une session (Déconnexion).
@@ -179,61 +496,76 @@ class PartieViewSet(viewsets.ModelViewSet):
         """
         username = request.data.get('username')
         id_session = request.data.get('id_session')
-        partie = Partie.objects.filter(username=username, id_session=id_session).first()
         if not username or not id_session:
             return Response({'error': 'Paramètres manquants'}, status=status.HTTP_400_BAD_REQUEST)
 
-        if not partie:
+        # Suppression directe (un seul DELETE) : aucune ligne supprimée = joueur inconnu
+        supprimes, _ = Partie.objects.filter(username=username, id_session=id_session).delete()
+        if not supprimes:
             return Response({'error': 'Partie introuvable'}, status=status.HTTP_404_NOT_FOUND)
 
-        partie.delete()
+        publish(id_session, 'fin_partie', {'username': username})
         return Response({'status': 'Joueur supprimé de la session'}, status=status.HTTP_200_OK)
     
     @action(detail=False, methods=['post'])
+    @query_budget(7)
     def join_partie(self, request):
         """!
         @brief Inscrit un joueur dans une session.
         
         Si la session existe et n'est pas fermée, crée une entrée Partie pour ce joueur.
+        Un joueur qui revient après être parti repart sans vote dans la manche en cours.
         Passe automatiquement le statut de la session à 'in_progress'.
 
-        @param request Objet HttpRequest contenant `username` et `id_session`.
+        @param request Objet HttpRequest contenant `username` et `id_session` (code saisi, normalisé
+                       par `normalize_code` : « ab12cd » rejoint « AB12CD »).
         
         @return Response contenant :
             - `mode_de_jeu`: Le mode de jeu de la session rejointe.
             - `status`: Le statut de la session.
         """
         username = request.data.get('username')
-        id_session = request.data.get('id_session')
-        created = False
+        id_session = normalize_code(request.data.get('id_session'))
         if not username or not id_session:
             return Response({'error': 'Paramètres manquants'}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            session = Session.objects.get(pk=id_session)
-            statut = session.status
-            mode_de_jeu = session.mode_de_jeu
-            if statut != 'closed': 
-                created = Partie.objects.get_or_create(username=username, id_session=session)
-                session.status = 'in_progress'  # Mettre à jour le statut de la session
-                session.save()
-
-            return_data = {
-                'mode_de_jeu': mode_de_jeu,
-                'status': statut,
-            }
-            
-            return Response(return_data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
-
-        except Session.DoesNotExist:
+
+        # Lecture des deux seules colonnes utiles (pas du JSON des stories)
+        session = Session.objects.filter(pk=id_session).values_list('status', 'mode_de_jeu').first()
+        if session is None:
             return Response({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+        statut, mode_de_jeu = session
+
+        joined = statut != 'closed'
+        if joined:
+            with transaction.atomic():
+                # Retour d'un joueur déjà inscrit : un UPDATE suffit (il redevient actif) ; sinon INSERT
+                if not Partie.objects.filter(username=username, id_session=id_session).update(updated_at=timezone.now()):
+                    try:
+                        with transaction.atomic():
+                            Partie.objects.create(username=username, id_session_id=id_session)
+                    except IntegrityError:
+                        pass  # Inscrit entre-temps par une requête concurrente
+                    else:
+                        Vote.withdraw(id_session, username)
+                # Passage à 'in_progress' écrit dans le même UPDATE que la version, seulement si nécessaire
+                changes = {} if statut == 'in_progress' else {'status': 'in_progress'}
+                publish(id_session, 'join_partie', {'username': username, 'status': 'in_progress'}, **changes)
+
+        return_data = {
+            'mode_de_jeu': mode_de_jeu,
+            'status': statut,
+        }
+        return Response(return_data, status=status.HTTP_201_CREATED if joined else status.HTTP_200_OK)
         
     @action(detail=False, methods=['post'])
+    @query_budget(3)
     def raz_vote(self, request):
         """!
         @brief Réinitialise les votes pour une nouvelle manche.
         
-        Remet à zéro (null/False) les champs `carte_choisie` et `a_vote` 
-        pour tous les joueurs de la session donnée.
+        Passe la session à la manche suivante (`Session.round`), qui ne contient encore
+        aucun vote : un seul UPDATE, quel que soit le nombre de joueurs. Les votes des
+        manches précédentes sont conservés.
 
         @param request Objet HttpRequest contenant `id_session`.
         @return Response confirmant la réinitialisation.
@@ -241,10 +573,254 @@ class PartieViewSet(viewsets.ModelViewSet):
         id_session = request.data.get('id_session')
         if not id_session:
             return Response({'error': 'Paramètres manquants'}, status=status.HTTP_400_BAD_REQUEST)
-        try:
-            # On vérifie que la session existe
-            Session.objects.get(pk=id_session)
-            Partie.objects.filter(id_session=id_session).update(carte_choisie=None, a_vote=False)
-            return Response({'status': 'Vote réinitialisé'}, status=status.HTTP_200_OK)
-        except Session.DoesNotExist:
-            return Response({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        # La publication (UPDATE de la version et de la manche) sert aussi de test d'existence de la session
+        if not publish(id_session, 'raz_vote', round=F('round') + 1):
+            return Response({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+        return Response({'status': 'Vote réinitialisé'}, status=status.HTTP_200_OK)
+
+
+def _upload_stream(request):
+    """!
+    @brief Flux du corps d'un envoi, lisible jusqu'à la fin même sans Content-Length.
+
+    DRF tient un corps sans Content-Length (envoi par morceaux, `Transfer-Encoding: chunked`)
+    pour vide. Sous ASGI, le serveur a déjà reçu le corps entier : il est lu jusqu'à EOF.
+    Sous WSGI, l'entrée n'est lisible jusqu'à EOF que si le serveur la termine lui-même
+    (`wsgi.input_terminated`, ex: gunicorn) ; sinon sa fin ne peut pas être détectée.
+
+    @return Un objet fichier, ou None si la fin du corps ne peut pas être connue.
+    """
+    http_request = request._request
+    if http_request.META.get('CONTENT_LENGTH'):
+        return request.stream or io.BytesIO()
+    if isinstance(http_request, ASGIRequest):
+        return http_request
+    if http_request.META.get('wsgi.input_terminated'):
+        return http_request.META['wsgi.input']
+    return None
+
+
+def _cast_vote(id_session, username, carte):
+    """!
+    @brief Enregistre le vote d'un joueur et publie l'événement, en une seule transaction.
+
+    Mise à jour du joueur, vote et nouvelle version sont validés ensemble : un échec en
+    cours de route ne laisse ni vote sans version (ETag et cache de réponses périmés), ni
+    joueur rafraîchi sans vote. Partagé par les vues synchrone et asynchrone.
+
+    La version est incrémentée avant l'écriture du vote : l'UPDATE verrouille la ligne de
+    la session jusqu'au COMMIT, si bien que la manche lue par `Vote.cast` ne peut plus
+    changer sous le vote (`raz_vote` concurrent attend) et que le vote est publié dans la
+    manche où il est enregistré.
+
+    @return False si le joueur n'est pas inscrit dans la session (rien n'est écrit).
+    """
+    with transaction.atomic():
+        # Un seul UPDATE conditionnel : 0 ligne touchée = joueur inconnu dans cette session
+        if not Partie.objects.filter(username=username, id_session=id_session).update(updated_at=timezone.now()):
+            return False
+        publish(id_session, 'vote_card', {'username': username, 'carte_choisie': carte})
+        Vote.cast(id_session, username, carte)
+    return True
+
+
+def _session_snapshot(id_session):
+    """!
+    @brief Sérialise l'état de jeu complet d'une session (version synchrone).
+
+    @return Le dictionnaire de `SessionStateSerializer`, ou None si la session n'existe pas.
+    """
+    session = Session.objects.filter(pk=id_session).first()
+    return SessionStateSerializer(session).data if session else None
+
+
+async def _session_version(id_session):
+    """!
+    @brief Lit la version courante d'une session sans charger le reste de la ligne.
+
+    @return La version (int), ou None si la session n'existe pas.
+    """
+    return await Session.objects.filter(pk=id_session).values_list('version', flat=True).afirst()
+
+
+def _layer_is_shared(channel_layer):
+    """!
+    @brief Indique si la couche de messages est partagée entre processus (Redis).
+
+    La couche en mémoire ne relie que les requêtes d'un même processus : avec plusieurs
+    workers, une écriture faite par un autre worker n'y est jamais diffusée.
+    """
+    return not isinstance(channel_layer, InMemoryChannelLayer)
+
+
+@require_GET
+async def session_changes(request, pk):
+    """!
+    @brief Long-polling : attend qu'une session change de version (vue asynchrone).
+
+    Repli pour les clients dont le proxy bloque les WebSockets. La requête reste
+    en attente, sans occuper de worker, jusqu'à ce que la version de la session
+    dépasse `since` ou que `LONG_POLL_TIMEOUT` secondes s'écoulent.
+    Le réveil se fait via le groupe Channels de la session, et la version n'est relue
+    qu'à chaque événement reçu. En production (plusieurs workers), la couche doit être
+    partagée (`CHANNEL_REDIS_URL`) : toute écriture y est diffusée. Avec la couche en
+    mémoire, une écriture d'un autre worker n'arrive pas : la version est alors aussi
+    relue toutes les `LONG_POLL_INTERVAL` secondes.
+
+    @param request Objet HttpRequest contenant le paramètre GET `since` (int).
+    @param pk Clé primaire de la session.
+
+    @return JsonResponse :
+        - 200 OK : `{'version': N, 'full': False, 'events': [...]}` si les événements reçus (chacun
+          avec la `version` qu'il a produite) couvrent sans trou les versions manquées, sinon
+          `{'version': N, 'full': True, 'state': {...}}`.
+        - 204 No Content : Si rien n'a changé avant l'expiration du délai.
+        - 400 Bad Request : Si `since` est absent ou invalide.
+        - 404 Not Found : Si la session n'existe pas.
+    """
+    try:
+        since = int(request.GET['since'])
+    except (KeyError, ValueError):
+        return JsonResponse({'error': 'Paramètre since invalide'}, status=status.HTTP_400_BAD_REQUEST)
+
+    timeout = getattr(settings, 'LONG_POLL_TIMEOUT', 25)
+    channel_layer = get_channel_layer()
+    # Couche partagée : pas de relecture périodique, l'attente n'est interrompue que par un événement
+    interval = None if _layer_is_shared(channel_layer) else getattr(settings, 'LONG_POLL_INTERVAL', 1)
+    channel = await channel_layer.new_channel()
+    # Abonnement AVANT la lecture de la version : aucun événement ne peut être manqué entre les deux
+    await channel_layer.group_add(group_name(pk), channel)
+    # Événements reçus, par version produite (ceux déjà connus du client sont ignorés)
+    events = {}
+
+    def garder(message):
+        if message['version'] > since:
+            events[message['version']] = {'type': message['event'], 'data': message['data'], 'version': message['version']}
+
+    try:
+        version = await _session_version(pk)
+        if version is None:
+            return JsonResponse({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while version is not None and version <= since:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                garder(await asyncio.wait_for(channel_layer.receive(channel), min(remaining, interval or remaining)))
+            except asyncio.TimeoutError:
+                pass
+            version = await _session_version(pk)
+
+        # Récupère les événements déjà validés mais pas encore lus
+        while version is not None and any(v not in events for v in range(since + 1, version + 1)):
+            try:
+                garder(await asyncio.wait_for(channel_layer.receive(channel), 0.05))
+            except asyncio.TimeoutError:
+                break
+    finally:
+        await channel_layer.group_discard(group_name(pk), channel)
+
+    if version is None:
+        return JsonResponse({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+    if version <= since:
+        return HttpResponse(status=status.HTTP_204_NO_CONTENT)
+    # Un événement validé pendant la récupération peut dépasser la version lue
+    version = max([version, *events])
+    if all(v in events for v in range(since + 1, version + 1)):
+        return JsonResponse({'version': version, 'full': False, 'events': [events[v] for v in range(since + 1, version + 1)]})
+
+    state = await sync_to_async(_session_snapshot)(pk)
+    if state is None:
+        return JsonResponse({'error': 'Session introuvable'}, status=status.HTTP_404_NOT_FOUND)
+    return JsonResponse({'version': state['version'], 'full': True, 'state': state})
+
+
+
+## @brief Opérations acceptées par `/api/batch/` : nom de l'action -> (ViewSet, paramètre désignant la session en `pk`).
+## Les actions de `SessionViewSet` sont `detail=True` : leur `pk` est lu dans `id_session`.
+BATCH_OPERATIONS = {
+    'vote_card': (PartieViewSet, None),
+    'raz_vote': (PartieViewSet, None),
+    'fin_partie': (PartieViewSet, None),
+    'join_partie': (PartieViewSet, None),
+    'close_story': (SessionViewSet, 'id_session'),
+    'close_session': (SessionViewSet, 'id_session'),
+}
+
+
+def _sub_request(request, params):
+    """!
+    @brief Requête HTTP d'une opération du lot : celle du lot, avec `params` pour corps JSON.
+
+    Copie de la requête Django sous-jacente : les attributs posés par les middlewares
+    (utilisateur, route résolue...) sont conservés, seuls le corps et son type changent.
+    """
+    body = json.dumps(params).encode()
+    sub_request = copy.copy(request._request)
+    for cached in ('_post', '_files', 'headers'):
+        sub_request.__dict__.pop(cached, None)
+    sub_request.method = 'POST'
+    sub_request.META = {**sub_request.META, 'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(body))}
+    sub_request.content_type, sub_request.content_params = 'application/json', {}
+    sub_request._body, sub_request._stream, sub_request._read_started = body, io.BytesIO(body), False
+    return sub_request
+
+
+def _run_operation(request, op, params):
+    """!
+    @brief Exécute une opération d'un lot avec l'action existante du ViewSet correspondant.
+
+    L'action est appelée comme par le routeur (`as_view`), sur une sous-requête dont
+    `params` est le corps : authentification, permissions, gestion des erreurs et budget
+    de requêtes SQL s'appliquent comme en appel direct.
+
+    @return La Response de l'action (y compris les erreurs 400/404).
+    """
+    viewset_class, pk_param = BATCH_OPERATIONS[op]
+    kwargs = {'pk': params.get(pk_param)} if pk_param else {}
+    return viewset_class.as_view({'post': op})(_sub_request(request, params), **kwargs)
+
+
+@api_view(['POST'])
+def batch(request):
+    """!
+    @brief Exécute une liste ordonnée d'opérations de jeu en une seule requête et une seule transaction.
+
+    Évite un aller-retour HTTP (et une transaction) par action, par exemple pour
+    `raz_vote` + `close_session` + `fin_partie` en fin de partie.
+
+    @param request Objet HttpRequest contenant `operations`, une liste de
+        `{"op": <nom>, "params": {...}}` où `op` est l'une des clés de `BATCH_OPERATIONS`
+        et `params` le corps qu'attend l'action correspondante.
+
+    @return Response contenant `results` (une entrée `{op, status, data}` par opération exécutée) :
+        - 200 si toutes les opérations ont réussi ;
+        - sinon, le code de la première opération en échec : les opérations précédentes
+          sont annulées (rollback) et les suivantes ne sont pas exécutées.
+    """
+    operations = request.data.get('operations')
+    if not isinstance(operations, list) or not operations:
+        return Response({'error': 'Paramètres manquants'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(operations) > settings.BATCH_MAX_OPERATIONS:
+        return Response(
+            {'error': f"Trop d'opérations (maximum {settings.BATCH_MAX_OPERATIONS})"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    for operation in operations:
+        if not isinstance(operation, dict) or operation.get('op') not in BATCH_OPERATIONS \
+                or not isinstance(operation.get('params', {}), dict):
+            return Response({'error': 'Opération invalide', 'operation': operation}, status=status.HTTP_400_BAD_REQUEST)
+
+    results = []
+    with transaction.atomic():
+        for operation in operations:
+            response = _run_operation(request, operation['op'], operation.get('params', {}))
+            results.append({'op': operation['op'], 'status': response.status_code, 'data': response.data})
+            if response.status_code >= 400:
+                # Tout ou rien : les événements des opérations annulées ne sont jamais diffusés (on_commit)
+                transaction.set_rollback(True)
+                return Response({'error': 'Lot annulé', 'results': results}, status=response.status_code)
+    return Response({'results': results})
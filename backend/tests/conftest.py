@@ -15,12 +15,36 @@ from django.conf import settings
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 django.setup()
 
+from django.core.cache import cache
 from django.test import Client
 from rest_framework.test import APIClient
 
 
 # ==================== FIXTURES GLOBALES ====================
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """!
+    @brief Vide le cache Django avant chaque test.
+
+    Les bases de test sont remises à zéro entre deux tests, mais pas le cache
+    en mémoire (décomptes de votes, etc.) : on évite ainsi toute fuite d'état.
+    """
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def strict_query_budgets(settings):
+    """!
+    @brief Fait échouer tout test dont une action dépasse son budget de requêtes SQL.
+
+    En production, un dépassement est seulement journalisé (voir `planning_poker/budgets.py`).
+    """
+    settings.QUERY_BUDGET_STRICT = True
+
+
 @pytest.fixture
 def api_client():
     """!
@@ -7,7 +7,7 @@ Cela évite de devoir remplir manuellement chaque champ dans les tests unitaires
 """
 
 import factory
-from planning_poker.models import Session, Partie
+from planning_poker.models import Session, Partie, Vote
 
 class SessionFactory(factory.django.DjangoModelFactory):
     """!
@@ -37,6 +37,9 @@ class PartieFactory(factory.django.DjangoModelFactory):
     @brief Usine pour générer des objets `Partie` (Joueurs) de test.
     
     Crée un joueur virtuel rattaché à une session (créée automatiquement si non fournie).
+    `carte_choisie` n'est pas une colonne de `Partie` : fournie, elle crée le `Vote` du
+    joueur dans la manche en cours de la session. Le joueur créé porte ensuite les mêmes
+    attributs `carte_choisie` et `a_vote` qu'un joueur lu par `Partie.objects.with_vote()`.
     """
     class Meta:
         model = Partie
@@ -46,11 +49,29 @@ class PartieFactory(factory.django.DjangoModelFactory):
     ## @brief Nom d'utilisateur aléatoire.
     username = factory.Faker('user_name')
 
-    ## @brief Carte choisie aléatoirement (Fibonacci ou None).
-    carte_choisie = factory.Faker('random_element', elements=['1', '2', '3', '5', '8', '13', '20', None])
+    ## @brief Carte votée dans la manche en cours (aucun vote par défaut).
+    carte_choisie = None
 
-    ## @brief État du vote (False par défaut).
+    ## @brief Ignoré : déduit de `carte_choisie` (accepté pour la lisibilité des tests).
     a_vote = False
 
     ## @brief Session associée. Si non fournie, une nouvelle SessionFactory est appelée.
-    id_session = factory.SubFactory(SessionFactory)
\ No newline at end of file
+    id_session = factory.SubFactory(SessionFactory)
+
+    @classmethod
+    def _build(cls, model_class, *args, **kwargs):
+        carte = kwargs.pop('carte_choisie')
+        kwargs.pop('a_vote')
+        partie = super()._build(model_class, *args, **kwargs)
+        partie.carte_choisie, partie.a_vote = carte, carte is not None
+        return partie
+
+    @classmethod
+    def _create(cls, model_class, *args, **kwargs):
+        carte = kwargs.pop('carte_choisie')
+        kwargs.pop('a_vote')
+        partie = super()._create(model_class, *args, **kwargs)
+        if carte is not None:
+            Vote.cast(partie.id_session_id, partie.username, carte)
+        partie.carte_choisie, partie.a_vote = carte, carte is not None
+        return partie
@@ -0,0 +1,104 @@
+# tests/test_aggregation.py
+"""!
+@brief Tests unitaires du moteur de calcul des résultats (`aggregation`).
+
+Les stratégies sont testées directement sur des histogrammes `{carte: nombre}`,
+sans passer par l'API.
+"""
+
+from planning_poker import aggregation
+
+
+class TestStrategies:
+    """!
+    @brief Vérifie chaque stratégie enregistrée sur des histogrammes de votes.
+    """
+
+    def test_registry_contains_all_modes(self):
+        """!
+        @brief Vérifie que tous les modes de jeu sont enregistrés.
+        """
+        for mode in ['strict', 'median', 'average', 'majority_abs', 'majority_rel', 'min', 'max']:
+            assert mode in aggregation.STRATEGIES
+
+    def test_unknown_mode_defaults_to_average(self):
+        """!
+        @brief Vérifie qu'un mode inconnu utilise la moyenne.
+        """
+        assert aggregation.compute('fibonacci', {'2': 1, '4': 1}) == 3
+
+    def test_strict(self):
+        """!
+        @brief Unanimité, désaccord, aucun vote et carte non numérique.
+        """
+        assert aggregation.compute('strict', {'5': 3}) == 5
+        assert aggregation.compute('strict', {'5': 2, '8': 1}) == -1
+        assert aggregation.compute('strict', {}) == -1
+        assert aggregation.compute('strict', {'?': 2}) == -1
+
+    def test_median(self):
+        """!
+        @brief Médiane pondérée (impair, pair) et absence de vote numérique.
+        """
+        assert aggregation.compute('median', {'3': 1, '5': 1, '8': 1}) == 5
+        assert aggregation.compute('median', {'1': 3, '100': 1}) == 1
+        assert aggregation.compute('median', {'3': 1, '5': 1, '8': 1, '13': 1}) in [6, 7]
+        assert aggregation.compute('median', {'?': 2, 'cafe': 1}) == 0
+        assert aggregation.compute('median', {}) == 0
+
+    def test_average(self):
+        """!
+        @brief Moyenne pondérée, en ignorant les cartes non numériques.
+        """
+        assert aggregation.compute('average', {'2': 1, '4': 1, '6': 1}) == 4
+        assert aggregation.compute('average', {'2': 2, '8': 1, '?': 4}) == 4
+        assert aggregation.compute('average', {}) == 0
+
+    def test_majority_abs(self):
+        """!
+        @brief Majorité absolue atteinte, non atteinte, et sans vote.
+        """
+        assert aggregation.compute('majority_abs', {'5': 3, '8': 1}) == 5
+        assert aggregation.compute('majority_abs', {'5': 2, '8': 2}) == -1
+        assert aggregation.compute('majority_abs', {}) == 0
+
+    def test_majority_rel(self):
+        """!
+        @brief Majorité relative, avec départage déterministe des égalités.
+        """
+        assert aggregation.compute('majority_rel', {'5': 2, '8': 1, '13': 1}) == 5
+        assert aggregation.compute('majority_rel', {'8': 2, '5': 2}) == 5
+        assert aggregation.compute('majority_rel', {'?': 3, '5': 1}) == -1
+        assert aggregation.compute('majority_rel', {}) == 0
+
+    def test_min_max(self):
+        """!
+        @brief Estimations optimiste et pessimiste.
+        """
+        histogram = {'3': 1, '13': 2, '?': 1}
+        assert aggregation.compute('min', histogram) == 3
+        assert aggregation.compute('max', histogram) == 13
+        assert aggregation.compute('min', {}) == 0
+
+    def test_non_decimal_digits_are_not_numeric(self):
+        """!
+        @brief Vérifie que les cartes '²' ou '①' (chiffres pour `isdigit()`, refusés par `int()`) sont
+        traitées comme non numériques par toutes les stratégies.
+        """
+        histogram = {'²': 2, '①': 1, '5': 1}
+        for mode in aggregation.STRATEGIES:
+            aggregation.compute(mode, histogram)
+        assert aggregation.compute('strict', {'²': 3}) == -1
+        assert aggregation.compute('average', histogram) == 5
+        assert aggregation.compute('majority_rel', histogram) == -1
+
+    def test_register_new_mode(self):
+        """!
+        @brief Vérifie qu'un nouveau mode peut être ajouté sans toucher à la vue.
+        """
+        aggregation.register('count')(lambda histogram: sum(histogram.values()))
+        try:
+            assert aggregation.compute('count', {'1': 2, '3': 1}) == 3
+        finally:
+            del aggregation.STRATEGIES['count']
+
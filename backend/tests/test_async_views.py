@@ -0,0 +1,196 @@
+"""!
+@brief Tests des vues asynchrones (`planning_poker/async_views.py`).
+
+Chaque scénario est joué sur la route REST synchrone et sur la route asynchrone :
+les deux doivent renvoyer les mêmes codes et les mêmes données, et écrire la même chose.
+"""
+
+import pytest
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from planning_poker import tally
+from planning_poker.models import Partie, Session, Vote
+from tests.factories import PartieFactory, SessionFactory
+
+## @brief Noms des routes de chaque action : synchrone (ViewSet) et asynchrone.
+ROUTES = {
+    'sync': {
+        'vote_card': 'partie-vote-card', 'join_partie': 'partie-join-partie', 'raz_vote': 'partie-raz-vote',
+        'state': 'session-state', 'progress': 'session-progress',
+    },
+    'async': {
+        'vote_card': 'async-partie-vote-card', 'join_partie': 'async-partie-join-partie', 'raz_vote': 'async-partie-raz-vote',
+        'state': 'async-session-state', 'progress': 'async-session-progress',
+    },
+}
+
+
+@pytest.fixture(params=['sync', 'async'])
+def routes(request):
+    """!
+    @brief Joue le test sur les routes synchrones puis sur les routes asynchrones.
+    """
+    return ROUTES[request.param]
+
+
+@pytest.mark.django_db
+class TestParity:
+    """!
+    @brief Mêmes contrats pour les deux implémentations.
+    """
+
+    def test_vote_card(self, api_client, routes):
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+
+        response = api_client.post(reverse(routes['vote_card']), {
+            'username': 'Alice', 'id_session': session.id_session, 'carte_choisie': '8',
+        }, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'status': 'Vote enregistré'}
+        partie = Partie.objects.with_vote().get(id_session=session, username='Alice')
+        assert (partie.carte_choisie, partie.a_vote) == ('8', True)
+        assert Session.objects.get(pk=session.pk).version == session.version + 1
+
+    @pytest.mark.parametrize('data, code', [
+        ({'username': 'Alice'}, status.HTTP_400_BAD_REQUEST),
+        ({'username': 'Inconnu', 'carte_choisie': '5'}, status.HTTP_404_NOT_FOUND),
+    ])
+    def test_vote_card_errors(self, api_client, routes, data, code):
+        session = SessionFactory()
+        response = api_client.post(reverse(routes['vote_card']), {'id_session': session.id_session, **data}, format='json')
+        assert response.status_code == code
+
+    def test_join_partie(self, api_client, routes):
+        session = SessionFactory(status='open', mode_de_jeu='median')
+        data = {'username': 'Bob', 'id_session': session.id_session}
+
+        premiere = api_client.post(reverse(routes['join_partie']), data, format='json')
+        retour = api_client.post(reverse(routes['join_partie']), data, format='json')
+
+        assert premiere.status_code == retour.status_code == status.HTTP_201_CREATED
+        assert premiere.json() == {'mode_de_jeu': 'median', 'status': 'open'}
+        assert retour.json() == {'mode_de_jeu': 'median', 'status': 'in_progress'}
+        assert Partie.objects.filter(id_session=session, username='Bob').count() == 1
+
+    def test_join_with_lowercase_code(self, api_client, routes):
+        session = SessionFactory(id_session='AB12CD', status='open')
+
+        response = api_client.post(reverse(routes['join_partie']), {'username': 'Bob', 'id_session': 'ab12cd'}, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Partie.objects.filter(id_session=session, username='Bob').exists()
+
+    def test_join_closed_or_unknown(self, api_client, routes):
+        session = SessionFactory(status='closed')
+
+        fermee = api_client.post(reverse(routes['join_partie']), {'username': 'Bob', 'id_session': session.id_session}, format='json')
+        inconnue = api_client.post(reverse(routes['join_partie']), {'username': 'Bob', 'id_session': '999999'}, format='json')
+
+        assert fermee.status_code == status.HTTP_200_OK
+        assert not Partie.objects.filter(id_session=session).exists()
+        assert inconnue.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_raz_vote(self, api_client, routes):
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice', carte_choisie='5', a_vote=True)
+
+        response = api_client.post(reverse(routes['raz_vote']), {'id_session': session.id_session}, format='json')
+        inconnue = api_client.post(reverse(routes['raz_vote']), {'id_session': '999999'}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert not Partie.objects.filter(id_session=session).with_vote().filter(a_vote=True).exists()
+        assert inconnue.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_state_and_etag(self, api_client, routes):
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+
+        response = api_client.get(reverse(routes['state'], args=[session.pk]))
+        cached = api_client.get(reverse(routes['state'], args=[session.pk]), HTTP_IF_NONE_MATCH=response['ETag'])
+        inconnue = api_client.get(reverse(routes['state'], args=['999999']))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['joueurs'][0]['username'] == 'Alice'
+        assert response['ETag'] == f'"{session.pk}-{session.version}"'
+        assert cached.status_code == status.HTTP_304_NOT_MODIFIED
+        assert inconnue.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_progress(self, api_client, routes):
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice', carte_choisie='5', a_vote=True)
+        PartieFactory(id_session=session, username='Bob')
+
+        response = api_client.get(reverse(routes['progress'], args=[session.pk]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'version': session.version, 'nb_joueurs': 2, 'nb_votes': 1, 'tous_ont_vote': False}
+
+    def test_progress_without_players(self, api_client, routes):
+        session = SessionFactory()
+
+        response = api_client.get(reverse(routes['progress'], args=[session.pk]))
+
+        assert response.json()['nb_joueurs'] == 0
+        assert response.json()['tous_ont_vote'] is False
+
+
+@pytest.mark.django_db
+class TestAsyncViews:
+    """!
+    @brief Spécificités des vues asynchrones.
+    """
+
+    def test_vote_card_queries_and_tally(self, api_client):
+        """!
+        @brief Vérifie qu'un vote coûte cinq requêtes (joueur, version et sa relecture, journal, vote), dans une
+        même transaction (SAVEPOINT et sa libération en test), et met à jour le décompte en cache.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+        tally.get_tally(session.pk)
+
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.post(reverse('async-partie-vote-card'), {
+                'username': 'Alice', 'id_session': session.id_session, 'carte_choisie': '3',
+            }, format='json')
+
+        assert len(ctx.captured_queries) == 7
+        assert ctx.captured_queries[0]['sql'].startswith('SAVEPOINT')
+        assert tally.get_tally(session.pk)['histogram'] == {'3': 1}
+
+    @pytest.mark.django_db(transaction=True)
+    def test_concurrent_join_keeps_vote(self, api_client, monkeypatch):
+        """!
+        @brief Vérifie qu'un joueur inscrit entre la mise à jour et l'INSERT (requête concurrente) garde son vote.
+        """
+        session = SessionFactory(status='in_progress')
+        PartieFactory(id_session=session, username='Alice')
+        Vote.cast(session.pk, 'Alice', '5')
+
+        async def aucune_ligne(self, **kwargs):
+            return 0
+        monkeypatch.setattr(QuerySet, 'aupdate', aucune_ligne)
+
+        response = api_client.post(reverse('async-partie-join-partie'), {
+            'username': 'Alice', 'id_session': session.id_session,
+        }, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        partie = Partie.objects.with_vote().get(id_session=session, username='Alice')
+        assert partie.carte_choisie == '5'
+
+    def test_invalid_json_and_method(self, api_client):
+        """!
+        @brief Vérifie le rejet d'un corps non JSON (400) et d'une méthode non autorisée (405).
+        """
+        response = api_client.post(reverse('async-partie-raz-vote'), 'pas du json', content_type='application/json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = api_client.get(reverse('async-partie-raz-vote'))
+        assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
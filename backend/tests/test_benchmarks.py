@@ -0,0 +1,82 @@
+import pytest
+from benchmarks import report, serialization
+from benchmarks.runner import ENDPOINTS, run_suite
+
+
+class TestReport:
+    """!
+    @brief Tests des statistiques et de la comparaison des rapports de benchmark.
+    """
+
+    def test_percentile(self):
+        """!
+        @brief Vérifie l'interpolation linéaire des percentiles.
+        """
+        assert report.percentile([1, 2, 3, 4], 50) == 2.5
+        assert report.percentile([5], 99) == 5
+        assert report.percentile([], 50) == 0.0
+
+    def test_compare_flags_regressions(self):
+        """!
+        @brief Vérifie qu'une latence en hausse ou une requête SQL de plus est une régression.
+        """
+        base = {'results': [
+            {'endpoint': 'vote_card', 'players': 10, 'sessions': 100, 'p50_ms': 2.0, 'queries': 3},
+            {'endpoint': 'lobby', 'players': 10, 'sessions': 100, 'p50_ms': 2.0, 'queries': 1},
+        ]}
+        courant = {'results': [
+            {'endpoint': 'vote_card', 'players': 10, 'sessions': 100, 'p50_ms': 2.1, 'queries': 4},
+            {'endpoint': 'lobby', 'players': 10, 'sessions': 100, 'p50_ms': 2.1, 'queries': 1},
+            {'endpoint': 'state', 'players': 10, 'sessions': 100, 'p50_ms': 9.0, 'queries': 1},
+        ]}
+
+        lignes = {l['endpoint']: l['regression'] for l in report.compare(courant, base)}
+
+        assert lignes == {'vote_card': True, 'lobby': False}
+
+    def test_throughput_parity(self):
+        """!
+        @brief Vérifie la parité de débit : baisse tolérée, erreurs supplémentaires refusées.
+        """
+        rest = {'throughput_rps': 100.0, 'error_rate': 0.0}
+
+        assert report.throughput_parity({'throughput_rps': 120.0, 'error_rate': 0.0}, rest)['ok']
+        assert report.throughput_parity({'throughput_rps': 96.0, 'error_rate': 0.0}, rest)['ok']
+        assert not report.throughput_parity({'throughput_rps': 90.0, 'error_rate': 0.0}, rest)['ok']
+        assert not report.throughput_parity({'throughput_rps': 150.0, 'error_rate': 0.01}, rest)['ok']
+
+
+@pytest.mark.slow
+@pytest.mark.django_db
+class TestRunSuite:
+    """!
+    @brief Exécution réduite de la suite complète (sert de test de fumée).
+    """
+
+    def test_run_suite_smoke(self):
+        """!
+        @brief Vérifie que chaque endpoint est mesuré sans erreur sur un petit jeu de données.
+        """
+        resultats = run_suite(players=[3], sessions=[20], iterations=2)
+
+        assert {r['endpoint'] for r in resultats} == set(ENDPOINTS)
+        assert all(r['errors'] == 0 and r['n'] == 2 for r in resultats)
+        assert all(r['queries'] >= 1 for r in resultats)
+
+
+class TestSerialization:
+    """!
+    @brief Comparaison des renderers (`benchmarks/serialization.py`).
+    """
+
+    def test_compare_renderers(self):
+        payload = [{'username': f'joueur{i}', 'carte_choisie': '5', 'a_vote': True} for i in range(50)]
+
+        lignes = serialization.compare_renderers({'partie-list': payload}, iterations=2)
+
+        par_renderer = {l['renderer']: l for l in lignes}
+        assert set(par_renderer) == set(serialization.RENDERERS)
+        assert par_renderer['drf-json']['bytes_ratio'] == 1.0
+        assert par_renderer['orjson']['bytes'] == par_renderer['drf-json']['bytes']
+        assert par_renderer['msgpack']['bytes'] < par_renderer['drf-json']['bytes']
+        assert all(l['cpu_us'] >= 0 for l in lignes)
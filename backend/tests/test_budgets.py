@@ -0,0 +1,116 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from planning_poker.budgets import QueryBudgetExceeded, QueryRecorder, query_budget
+from planning_poker.models import Session
+from planning_poker.views import SessionViewSet, PartieViewSet
+from tests.factories import SessionFactory, PartieFactory
+
+
+class TightSessionViewSet(SessionViewSet):
+    """!
+    @brief ViewSet de test dont la liste a un budget volontairement trop faible.
+    """
+    query_budgets = {**SessionViewSet.query_budgets, 'list': 0}
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    """!
+    @brief Tests des budgets de requêtes SQL par action.
+    """
+
+    def test_strict_mode_raises(self):
+        """!
+        @brief Vérifie qu'un dépassement lève une exception en mode strict (tests).
+        """
+        SessionFactory()
+        vue = TightSessionViewSet.as_view({'get': 'list'})
+
+        with pytest.raises(QueryBudgetExceeded, match='planning_poker_session'):
+            vue(APIRequestFactory().get('/api/sessions/'))
+
+    def test_production_mode_logs_warning(self, settings, caplog):
+        """!
+        @brief Vérifie l'avertissement structuré (avec le SQL) hors mode strict.
+        """
+        settings.QUERY_BUDGET_STRICT = False
+        SessionFactory()
+        vue = TightSessionViewSet.as_view({'get': 'list'})
+
+        with caplog.at_level(logging.WARNING, logger='planning_poker.budgets'):
+            response = vue(APIRequestFactory().get('/api/sessions/'))
+
+        assert response.status_code == 200
+        record = caplog.records[-1]
+        assert record.query_budget['view'] == 'TightSessionViewSet.list'
+        assert record.query_budget['budget'] == 0
+        assert record.query_budget['count'] == 1
+        assert 'planning_poker_session' in record.query_budget['queries'][0]
+
+    def test_decorator_budget(self):
+        """!
+        @brief Vérifie que le budget déclaré par `@query_budget` est celui de l'action.
+        """
+        vue = PartieViewSet()
+        vue.action = 'vote_card'
+        assert vue.get_query_budget() == 5
+        vue.action = 'list'
+        assert vue.get_query_budget() == 2
+        vue.action = 'metadata'
+        assert vue.get_query_budget() is None
+
+    def test_async_view_budget(self):
+        """!
+        @brief Vérifie que le budget d'une vue asynchrone compte les requêtes faites par l'ORM asynchrone.
+        """
+        SessionFactory()
+
+        @query_budget(0)
+        async def vue(request):
+            return await Session.objects.afirst()
+
+        assert vue.query_budget == 0
+        with pytest.raises(QueryBudgetExceeded, match='vue a exécuté 1 requêtes'):
+            async_to_sync(vue)(APIRequestFactory().get('/'))
+
+    def test_fin_partie_validates_before_querying(self, api_client, django_assert_num_queries):
+        """!
+        @brief Vérifie que `fin_partie` rejette une requête incomplète sans interroger la base.
+        """
+        with django_assert_num_queries(0):
+            response = api_client.post('/api/parties/fin_partie/', {'username': 'alice'}, format='json')
+        assert response.status_code == 400
+
+    def test_join_partie_skips_status_write_when_in_progress(self, api_client):
+        """!
+        @brief Vérifie qu'un joueur rejoignant une session déjà en cours ne réécrit pas son statut.
+        """
+        session = SessionFactory(status='in_progress')
+        PartieFactory(id_session=session)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.post('/api/parties/join_partie/', {'username': 'bob', 'id_session': session.pk}, format='json')
+
+        assert response.status_code == 201
+        assert not any('"status"' in q['sql'] and q['sql'].startswith('UPDATE') for q in ctx.captured_queries)
+
+
+class TestQueryRecorder:
+    """!
+    @brief Tests de l'enregistreur de requêtes.
+    """
+
+    def test_ignores_transaction_control(self):
+        """!
+        @brief Vérifie que les SAVEPOINT (dépendant de l'imbrication des transactions) ne sont pas comptés.
+        """
+        recorder = QueryRecorder()
+        execute = lambda sql, params, many, context: None
+        for sql in ('SAVEPOINT "s1"', 'SELECT 1', 'RELEASE SAVEPOINT "s1"'):
+            recorder(execute, sql, None, False, {})
+        assert recorder.queries == ['SELECT 1']
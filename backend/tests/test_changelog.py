@@ -0,0 +1,172 @@
+"""!
+@brief Tests du journal des changements et de la synchronisation différentielle (`planning_poker/changelog.py`).
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from planning_poker import purge
+from planning_poker.models import Session, SessionChange
+from tests.factories import PartieFactory, SessionFactory
+
+
+def _post(api_client, name, data, args=None):
+    response = api_client.post(reverse(name, args=args), data, format='json')
+    assert response.status_code < 400, response.content
+    return response
+
+
+def _delta(api_client, session, since):
+    response = api_client.get(reverse('session-delta', args=[session.pk]), {'since': since})
+    assert response.status_code == status.HTTP_200_OK
+    return response.json()
+
+
+def _version(session):
+    return Session.objects.values_list('version', flat=True).get(pk=session.pk)
+
+
+@pytest.fixture
+def room():
+    """!
+    @brief Salle de cinq joueurs (sans vote) et trois stories, sans historique.
+    """
+    session = SessionFactory(stories=[{'titre': f'Story {i}'} for i in range(3)], mode_de_jeu='average', status='in_progress')
+    for nom in ('Alice', 'Bob', 'Chloe', 'David', 'Emma'):
+        PartieFactory(id_session=session, username=nom, carte_choisie=None, a_vote=False)
+    return session
+
+
+@pytest.mark.django_db
+class TestJournal:
+    """!
+    @brief Une ligne de journal par version publiée.
+    """
+
+    def test_each_event_is_recorded_with_its_version(self, api_client, room):
+        _post(api_client, 'partie-vote-card', {'username': 'Alice', 'id_session': room.pk, 'carte_choisie': '5'})
+        _post(api_client, 'partie-raz-vote', {'id_session': room.pk})
+
+        lignes = list(SessionChange.objects.filter(session=room).values_list('version', 'event', 'data'))
+
+        assert lignes == [
+            (1, 'vote_card', {'username': 'Alice', 'carte_choisie': '5'}),
+            (2, 'raz_vote', {}),
+        ]
+
+    def test_async_views_are_recorded(self, api_client, room):
+        _post(api_client, 'async-partie-vote-card', {'username': 'Bob', 'id_session': room.pk, 'carte_choisie': '8'})
+
+        change = SessionChange.objects.get(session=room)
+        assert (change.version, change.event) == (_version(room), 'vote_card')
+
+    def test_unknown_session_records_nothing(self, api_client):
+        api_client.post(reverse('partie-raz-vote'), {'id_session': '999999'}, format='json')
+        assert not SessionChange.objects.exists()
+
+
+@pytest.mark.django_db
+class TestDelta:
+    """!
+    @brief Réponses de `GET /sessions/{id}/delta/?since=N`.
+    """
+
+    def test_first_load_is_full_snapshot(self, api_client, room):
+        data = _delta(api_client, room, -1)
+
+        assert data['full'] is True
+        assert data['version'] == _version(room)
+        assert [j['username'] for j in data['joueurs']] == ['Alice', 'Bob', 'Chloe', 'David', 'Emma']
+        assert [s['position'] for s in data['stories']] == [0, 1, 2]
+
+    def test_only_changed_players(self, api_client, room):
+        since = _version(room)
+        _post(api_client, 'partie-vote-card', {'username': 'Alice', 'id_session': room.pk, 'carte_choisie': '5'})
+        _post(api_client, 'partie-fin-partie', {'username': 'Bob', 'id_session': room.pk})
+        _post(api_client, 'partie-join-partie', {'username': 'Zoe', 'id_session': room.pk})
+
+        data = _delta(api_client, room, since)
+
+        assert data['full'] is False
+        assert data['version'] == since + 3
+        assert data['joueurs'] == [
+            {'username': 'Alice', 'carte_choisie': '5', 'a_vote': True},
+            {'username': 'Zoe', 'carte_choisie': None, 'a_vote': False},
+        ]
+        assert data['partis'] == ['Bob']
+        assert data['stories'] == [] and data['raz'] is False
+
+    def test_closed_story_and_reset(self, api_client, room):
+        _post(api_client, 'partie-vote-card', {'username': 'Alice', 'id_session': room.pk, 'carte_choisie': '3'})
+        since = _version(room)
+        _post(api_client, 'session-close-story', {'story_index': 0}, args=[room.pk])
+        _post(api_client, 'partie-raz-vote', {'id_session': room.pk})
+        _post(api_client, 'session-close-session', {'status': 'closed'}, args=[room.pk])
+
+        data = _delta(api_client, room, since)
+
+        assert data['full'] is False
+        assert data['raz'] is True
+        assert data['joueurs'] == []
+        assert data['stories'] == [{'position': 0, 'titre': 'Story 0', 'contenu': '', 'valeur_finale': '3'}]
+        assert data['status'] == 'closed'
+
+    def test_up_to_date_client_gets_empty_delta(self, api_client, room, django_assert_max_num_queries):
+        _post(api_client, 'partie-vote-card', {'username': 'Alice', 'id_session': room.pk, 'carte_choisie': '5'})
+        since = _version(room)
+
+        with django_assert_max_num_queries(1):
+            data = _delta(api_client, room, since)
+
+        assert (data['full'], data['joueurs'], data['partis'], data['stories']) == (False, [], [], [])
+
+    def test_purged_journal_falls_back_to_snapshot(self, api_client, room):
+        since = _version(room)
+        _post(api_client, 'partie-vote-card', {'username': 'Alice', 'id_session': room.pk, 'carte_choisie': '5'})
+        _post(api_client, 'partie-vote-card', {'username': 'Bob', 'id_session': room.pk, 'carte_choisie': '8'})
+        SessionChange.objects.filter(session=room, version=since + 1).delete()
+
+        data = _delta(api_client, room, since)
+
+        assert data['full'] is True
+        assert len(data['joueurs']) == 5
+
+    @pytest.mark.parametrize('ecart', ['futur', 'trop_ancien'])
+    def test_unusable_since_falls_back_to_snapshot(self, api_client, room, settings, ecart):
+        settings.CHANGELOG_MAX_DELTA = 1
+        _post(api_client, 'partie-vote-card', {'username': 'Alice', 'id_session': room.pk, 'carte_choisie': '5'})
+        _post(api_client, 'partie-vote-card', {'username': 'Bob', 'id_session': room.pk, 'carte_choisie': '8'})
+        since = _version(room) + 1 if ecart == 'futur' else 0
+
+        assert _delta(api_client, room, since)['full'] is True
+
+    def test_import_forces_snapshot(self, api_client, room):
+        since = _version(room)
+        api_client.post(reverse('session-import-stories', args=[room.pk]), '{"titre": "Nouvelle"}\n',
+                        content_type='application/x-ndjson')
+
+        data = _delta(api_client, room, since)
+
+        assert data['full'] is True
+        assert [s['titre'] for s in data['stories']][-1] == 'Nouvelle'
+
+    def test_errors(self, api_client, room):
+        url = reverse('session-delta', args=[room.pk])
+        assert api_client.get(url).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(url, {'since': 'abc'}).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(reverse('session-delta', args=['999999']), {'since': 0}).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_purge_changes(api_client, room):
+    _post(api_client, 'partie-vote-card', {'username': 'Alice', 'id_session': room.pk, 'carte_choisie': '5'})
+    _post(api_client, 'partie-vote-card', {'username': 'Bob', 'id_session': room.pk, 'carte_choisie': '8'})
+    SessionChange.objects.filter(version=1).update(created_at=timezone.now() - timedelta(hours=2))
+
+    assert purge.purge_changes(dry_run=True) == 1
+    assert purge.purge_changes(batch_size=1) == 1
+    assert list(SessionChange.objects.values_list('version', flat=True)) == [2]
@@ -0,0 +1,92 @@
+import pytest
+from planning_poker import codes
+from planning_poker.models import CodeCounter, RecycledCode, Session
+from tests.factories import SessionFactory
+
+
+class TestPermutation:
+    """!
+    @brief Tests de la permutation de Feistel et de l'encodage des codes.
+    """
+
+    def test_permute_is_bijection(self):
+        """!
+        @brief Vérifie que la permutation est une bijection de l'espace (base 4 : 4^6 valeurs).
+        """
+        images = {codes.permute(i, 4, key=b'k') for i in range(4 ** 6)}
+        assert images == set(range(4 ** 6))
+
+    def test_permute_depends_on_key(self):
+        """!
+        @brief Vérifie que la suite des codes change avec la clé.
+        """
+        assert [codes.permute(i, 10, key=b'a') for i in range(10)] != [codes.permute(i, 10, key=b'b') for i in range(10)]
+
+    def test_encode(self):
+        """!
+        @brief Vérifie l'encodage sur 6 caractères avec zéros à gauche.
+        """
+        assert codes.encode(48239, codes.DIGITS) == '048239'
+        assert codes.encode(35, codes.ALNUM) == '00000Z'
+
+    def test_normalize_code(self):
+        """!
+        @brief Vérifie qu'un code saisi en minuscules ou entouré d'espaces retrouve sa forme canonique.
+        """
+        assert codes.normalize_code(' ab12cd ') == 'AB12CD'
+        assert codes.normalize_code('048239') == '048239'
+        assert codes.normalize_code(None) is None
+
+
+@pytest.mark.django_db
+class TestAllocateCode:
+    """!
+    @brief Tests de l'allocation des codes de session.
+    """
+
+    def test_codes_are_unique(self):
+        """!
+        @brief Vérifie que des créations successives n'entrent jamais en collision.
+        """
+        sessions = SessionFactory.create_batch(200)
+        ids = {s.id_session for s in sessions}
+        assert len(ids) == 200
+        assert all(len(code) == 6 and code.isdigit() for code in ids)
+        assert CodeCounter.objects.get(alphabet=codes.DIGITS).next_index == 200
+
+    def test_skips_existing_code(self):
+        """!
+        @brief Vérifie qu'un code déjà pris (session antérieure à l'allocateur) est sauté.
+        """
+        premier = codes.encode(codes.permute(0, 10), codes.DIGITS)
+        SessionFactory(id_session=premier)
+
+        session = SessionFactory()
+
+        assert session.id_session != premier
+        assert CodeCounter.objects.get(alphabet=codes.DIGITS).next_index == 2
+
+    def test_deleted_session_code_is_recycled(self):
+        """!
+        @brief Vérifie que le code d'une session supprimée est réattribué en priorité.
+        """
+        session = SessionFactory()
+        code = session.id_session
+        session.delete()
+        assert RecycledCode.objects.filter(code=code).exists()
+
+        assert SessionFactory().id_session == code
+        assert not RecycledCode.objects.exists()
+
+    def test_widens_to_alphanumeric(self, settings):
+        """!
+        @brief Vérifie le passage aux codes alphanumériques au-delà du seuil d'occupation.
+        """
+        settings.SESSION_CODE_WIDEN_AT = 0
+
+        ids = {SessionFactory().id_session for _ in range(20)}
+
+        assert len(ids) == 20
+        assert not any(code.isdigit() for code in ids)
+        assert all(set(code) <= set(codes.ALNUM) for code in ids)
+        assert Session.objects.count() == 20
@@ -0,0 +1,135 @@
+# tests/test_consumers.py
+"""!
+@brief Tests du canal WebSocket (Django Channels) d'une session.
+
+Vérifie la connexion au groupe de la session et la réception des événements
+publiés par les ViewSets après validation de leurs écritures.
+"""
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.urls import reverse
+
+from backend.asgi import application
+from tests.factories import SessionFactory, PartieFactory
+
+
+def _communicator(id_session):
+    """!
+    @brief Prépare une socket de test sur la session donnée.
+    """
+    return WebsocketCommunicator(
+        application,
+        f'/ws/sessions/{id_session}/',
+        headers=[(b'origin', b'http://localhost'), (b'host', b'localhost')],
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+class TestSessionConsumer:
+    """!
+    @brief Tests du consumer `SessionConsumer`.
+
+    Chaque scénario s'exécute dans une seule boucle asyncio (via `async_to_sync`),
+    les appels à l'API REST étant faits avec `sync_to_async`.
+    """
+
+    def test_connect_existing_session(self):
+        """!
+        @brief Vérifie qu'un joueur peut ouvrir une socket sur une session existante.
+        """
+        session = SessionFactory()
+
+        async def scenario():
+            communicator = _communicator(session.id_session)
+            connected, _ = await communicator.connect(timeout=5)
+            await communicator.disconnect()
+            return connected
+
+        assert async_to_sync(scenario)()
+
+    def test_connect_unknown_session(self):
+        """!
+        @brief Vérifie que la connexion est refusée pour une session inconnue.
+        """
+        async def scenario():
+            connected, _ = await _communicator('999999').connect(timeout=5)
+            return connected
+
+        assert not async_to_sync(scenario)()
+
+    def test_ping_pong(self):
+        """!
+        @brief Vérifie le message de maintien de connexion.
+        """
+        session = SessionFactory()
+
+        async def scenario():
+            communicator = _communicator(session.id_session)
+            await communicator.connect(timeout=5)
+            await communicator.send_json_to({'type': 'ping'})
+            message = await communicator.receive_json_from(timeout=5)
+            await communicator.disconnect()
+            return message
+
+        assert async_to_sync(scenario)() == {'type': 'pong'}
+
+    def test_vote_is_pushed(self, api_client):
+        """!
+        @brief Vérifie qu'un vote enregistré via l'API est poussé aux joueurs de la session.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+        data = {'username': 'Alice', 'id_session': session.id_session, 'carte_choisie': '8'}
+
+        async def scenario():
+            communicator = _communicator(session.id_session)
+            await communicator.connect(timeout=5)
+            await sync_to_async(api_client.post)(reverse('partie-vote-card'), data, format='json')
+            message = await communicator.receive_json_from(timeout=5)
+            await communicator.disconnect()
+            return message
+
+        assert async_to_sync(scenario)() == {
+            'type': 'vote_card',
+            'data': {'username': 'Alice', 'carte_choisie': '8'},
+            'version': session.version + 1,
+        }
+
+    def test_raz_vote_is_pushed(self, api_client):
+        """!
+        @brief Vérifie la diffusion de la remise à zéro des votes.
+        """
+        session = SessionFactory()
+
+        async def scenario():
+            communicator = _communicator(session.id_session)
+            await communicator.connect(timeout=5)
+            await sync_to_async(api_client.post)(
+                reverse('partie-raz-vote'), {'id_session': session.id_session}, format='json'
+            )
+            message = await communicator.receive_json_from(timeout=5)
+            await communicator.disconnect()
+            return message
+
+        assert async_to_sync(scenario)()['type'] == 'raz_vote'
+
+    def test_other_session_not_notified(self, api_client):
+        """!
+        @brief Vérifie qu'un joueur ne reçoit pas les événements d'une autre session.
+        """
+        session = SessionFactory()
+        autre = SessionFactory()
+
+        async def scenario():
+            communicator = _communicator(session.id_session)
+            await communicator.connect(timeout=5)
+            await sync_to_async(api_client.post)(
+                reverse('partie-raz-vote'), {'id_session': autre.id_session}, format='json'
+            )
+            nothing = await communicator.receive_nothing()
+            await communicator.disconnect()
+            return nothing
+
+        assert async_to_sync(scenario)()
@@ -0,0 +1,218 @@
+# tests/test_importers.py
+"""!
+@brief Tests de l'import en flux d'un backlog (`importers` et action `import_stories`).
+"""
+
+import io
+import json
+
+import pytest
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError
+from django.urls import reverse
+from rest_framework import status
+
+from planning_poker import importers
+from planning_poker.models import Story
+from planning_poker.views import SessionViewSet
+from tests.factories import SessionFactory
+
+
+class TestJsonArrayParser:
+    """!
+    @brief Tests de l'analyseur incrémental de tableau JSON.
+    """
+
+    def test_small_chunks(self):
+        """!
+        @brief Vérifie le découpage correct, même quand un élément est coupé entre deux lectures.
+        """
+        data = [{'titre': f'Story {i}', 'contenu': 'é' * i} for i in range(20)]
+        stream = io.BytesIO(json.dumps(data).encode('utf-8'))
+        items = [item for _, item in importers.iter_json_array(stream, chunk_size=7)]
+        assert items == data
+
+    def test_empty_array(self):
+        """!
+        @brief Un tableau vide ne produit aucun élément.
+        """
+        assert list(importers.iter_json_array(io.BytesIO(b' [ ] '))) == []
+
+    def test_not_an_array(self):
+        """!
+        @brief Un objet JSON à la racine est refusé.
+        """
+        with pytest.raises(importers.ImportSyntaxError):
+            list(importers.iter_json_array(io.BytesIO(b'{"titre": "A"}')))
+
+    def test_truncated_array(self):
+        """!
+        @brief Un tableau tronqué lève une erreur indiquant l'élément fautif.
+        """
+        with pytest.raises(importers.ImportSyntaxError) as exc:
+            list(importers.iter_json_array(io.BytesIO(b'[{"titre": "A"}, {"titre": '), chunk_size=4))
+        assert exc.value.ligne == 2
+
+
+@pytest.mark.django_db
+class TestImportStories:
+    """!
+    @brief Tests de l'action `import_stories` (POST /sessions/{id}/import_stories/).
+    """
+
+    def test_import_jsonl_with_errors(self, api_client):
+        """!
+        @brief Vérifie l'import JSON Lines : lignes valides ajoutées, lignes invalides signalées.
+        """
+        session = SessionFactory(stories=[{'titre': 'Existante'}])
+        body = '\n'.join([
+            json.dumps({'titre': 'A', 'contenu': 'a'}),
+            '',
+            '{pas du json',
+            json.dumps({'contenu': 'sans titre'}),
+            json.dumps({'titre': 'B'}),
+        ])
+        response = api_client.post(
+            reverse('session-import-stories', args=[session.id_session]),
+            data=body, content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['importees'] == 2
+        assert response.data['nb_erreurs'] == 2
+        assert [e['ligne'] for e in response.data['erreurs']] == [3, 4]
+        titres = Story.objects.filter(session=session).values_list('position', 'titre')
+        assert list(titres) == [(0, 'Existante'), (1, 'A'), (2, 'B')]
+
+    def test_import_json_array_in_batches(self, api_client, settings):
+        """!
+        @brief Vérifie l'import d'un tableau JSON écrit en plusieurs lots.
+        """
+        settings.IMPORT_BATCH_SIZE = 50
+        session = SessionFactory(stories=[])
+        data = [{'titre': f'Story {i}', 'contenu': 'x'} for i in range(120)]
+        response = api_client.post(
+            reverse('session-import-stories', args=[session.id_session]),
+            data=json.dumps(data), content_type='application/json'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data == {'importees': 120, 'nb_erreurs': 0, 'erreurs': []}
+        assert Story.objects.filter(session=session).count() == 120
+        assert Story.objects.get(session=session, position=119).titre == 'Story 119'
+
+    def test_import_malformed_array_rolls_back(self, api_client):
+        """!
+        @brief Vérifie qu'un tableau mal formé est refusé sans import partiel.
+        """
+        session = SessionFactory(stories=[])
+        response = api_client.post(
+            reverse('session-import-stories', args=[session.id_session]),
+            data='[{"titre": "A"}, {"titre": }]', content_type='application/json'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['ligne'] == 2
+        assert not Story.objects.filter(session=session).exists()
+
+    def test_import_chunked_body_without_content_length(self, api_client):
+        """!
+        @brief Vérifie qu'un corps envoyé par morceaux (sans Content-Length) est lu jusqu'au bout
+        quand le serveur WSGI termine l'entrée (`wsgi.input_terminated`).
+        """
+        session = SessionFactory()
+        body = '\n'.join(json.dumps({'titre': titre}) for titre in ('A', 'B'))
+        response = api_client.post(
+            reverse('session-import-stories', args=[session.id_session]),
+            data=body, content_type='application/x-ndjson',
+            CONTENT_LENGTH='', **{'wsgi.input_terminated': True}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['importees'] == 2
+
+    def test_import_chunked_body_under_asgi(self):
+        """!
+        @brief Vérifie que, sous ASGI, un corps sans Content-Length est lu jusqu'à EOF.
+        """
+        session = SessionFactory()
+        body = '\n'.join(json.dumps({'titre': titre}) for titre in ('A', 'B')).encode()
+        scope = {
+            'type': 'http', 'method': 'POST', 'path': f'/api/sessions/{session.pk}/import_stories/',
+            'headers': [(b'content-type', b'application/x-ndjson')],
+        }
+        view = SessionViewSet.as_view({'post': 'import_stories'})
+
+        response = view(ASGIRequest(scope, io.BytesIO(body)), pk=session.pk)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Story.objects.filter(session=session).count() == 2
+
+    def test_import_unterminated_body_without_content_length(self, api_client):
+        """!
+        @brief Vérifie le refus (411) d'un corps sans Content-Length dont la fin ne peut pas être détectée,
+        au lieu d'un import vide.
+        """
+        session = SessionFactory()
+        response = api_client.post(
+            reverse('session-import-stories', args=[session.id_session]),
+            data=json.dumps({'titre': 'A'}), content_type='application/x-ndjson', CONTENT_LENGTH=''
+        )
+
+        assert response.status_code == status.HTTP_411_LENGTH_REQUIRED
+        assert not Story.objects.filter(session=session).exists()
+
+    def test_import_unsupported_content_type(self, api_client):
+        """!
+        @brief Vérifie le refus des types de contenu non gérés.
+        """
+        session = SessionFactory()
+        response = api_client.post(
+            reverse('session-import-stories', args=[session.id_session]),
+            data='titre;contenu', content_type='text/csv'
+        )
+        assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+    def test_import_session_not_found(self, api_client):
+        """!
+        @brief Vérifie l'erreur 404 pour une session inconnue.
+        """
+        response = api_client.post(
+            reverse('session-import-stories', args=['999999']),
+            data='[]', content_type='application/json'
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_import_rejects_oversized_integer(self, api_client):
+        """!
+        @brief Vérifie qu'une `valeur_finale` entière trop longue pour la colonne est signalée, pas écrite.
+        """
+        session = SessionFactory(stories=[])
+        body = '\n'.join(json.dumps({'titre': t, 'valeur_finale': v}) for t, v in [('A', 13), ('B', 10 ** 12)])
+        response = api_client.post(
+            reverse('session-import-stories', args=[session.id_session]),
+            data=body, content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert (response.data['importees'], response.data['nb_erreurs']) == (1, 1)
+        assert response.data['erreurs'][0]['ligne'] == 2
+
+    def test_import_position_conflict_is_409(self, api_client, monkeypatch):
+        """!
+        @brief Vérifie qu'un conflit de positions (import concurrent) renvoie 409 sans import partiel.
+        """
+        session = SessionFactory(stories=[])
+
+        def en_conflit(session, items, **kwargs):
+            Story.objects.create(session=session, position=0, titre='A')
+            raise IntegrityError('UNIQUE constraint failed: planning_poker_story.session_id, planning_poker_story.position')
+
+        monkeypatch.setattr(importers, 'import_stories', en_conflit)
+        response = api_client.post(
+            reverse('session-import-stories', args=[session.id_session]),
+            data='{"titre": "A"}', content_type='application/x-ndjson'
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert not Story.objects.filter(session=session).exists()
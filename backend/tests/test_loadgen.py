@@ -0,0 +1,122 @@
+import asyncio
+
+import pytest
+from benchmarks.loadgen import HttpClient, HttpError, Stats, parse_args, run_load
+
+
+def _serve_once(reponse):
+    """!
+    @brief Lance un serveur TCP local qui répond `reponse` à chaque requête reçue.
+
+    @return Le serveur asyncio (à fermer par l'appelant).
+    """
+    async def handler(reader, writer):
+        try:
+            while True:
+                entetes = await reader.readuntil(b'\r\n\r\n')
+                longueur = int(entetes.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+                await reader.readexactly(longueur)
+                writer.write(reponse)
+                await writer.drain()
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    return asyncio.start_server(handler, '127.0.0.1', 0)
+
+
+class TestHttpClient:
+    """!
+    @brief Tests du client HTTP/1.1 minimal du générateur de charge.
+    """
+
+    def test_content_length_and_chunked(self):
+        """!
+        @brief Vérifie la lecture des corps `Content-Length` et `chunked` sur une connexion réutilisée.
+        """
+        async def scenario():
+            reponses = []
+            for brut in (
+                b'HTTP/1.1 200 OK\r\nContent-Length: 12\r\n\r\n{"ok": true}',
+                b'HTTP/1.1 201 Created\r\nTransfer-Encoding: chunked\r\n\r\n4\r\n{"a"\r\n4\r\n: 1}\r\n0\r\n\r\n',
+            ):
+                serveur = await _serve_once(brut)
+                port = serveur.sockets[0].getsockname()[1]
+                client = HttpClient(f'http://127.0.0.1:{port}')
+                reponses.append(await client.request('GET', '/x'))
+                reponses.append(await client.request('POST', '/x', {'a': 1}))
+                await client.close()
+                serveur.close()
+            return reponses
+
+        reponses = asyncio.run(scenario())
+
+        assert reponses[0] == reponses[1] == (200, b'{"ok": true}')
+        assert reponses[2] == reponses[3] == (201, b'{"a": 1}')
+
+    def test_error_classification(self):
+        """!
+        @brief Vérifie qu'une erreur 500 "database is locked" est comptée sous cette cause.
+        """
+        async def scenario():
+            corps = b'OperationalError: database is locked'
+            serveur = await _serve_once(b'HTTP/1.1 500 Internal Server Error\r\nContent-Length: %d\r\n\r\n' % len(corps) + corps)
+            port = serveur.sockets[0].getsockname()[1]
+            client = HttpClient(f'http://127.0.0.1:{port}')
+            stats = Stats()
+            with pytest.raises(HttpError):
+                await stats.call(client, 'vote_card', 'POST', '/x', {})
+            await client.close()
+            serveur.close()
+            return stats.summary(1.0)
+
+        resume = asyncio.run(scenario())
+
+        assert resume['errors'] == 1
+        assert resume['operations']['vote_card']['error_kinds'] == {'database is locked': 1}
+
+
+@pytest.mark.slow
+@pytest.mark.django_db(transaction=True)
+class TestRunLoad:
+    """!
+    @brief Simulation réduite contre un serveur de test réel (test de fumée).
+    """
+
+    def test_rooms_complete_without_errors(self, live_server):
+        """!
+        @brief Vérifie qu'une salle complète va au bout du cycle de vie sans erreur.
+
+        Un seul joueur : la base de test SQLite en mémoire ne supporte pas les écritures
+        concurrentes du serveur de test multi-thread.
+        """
+        args = parse_args([
+            '--url', live_server.url, '--rooms', '1', '--players', '1', '--stories', '2',
+            '--poll-interval', '0.05', '--think', '0.05', '--room-timeout', '30',
+        ])
+
+        resume = asyncio.run(run_load(args))
+
+        assert resume['rooms_completed'] == 1
+        assert resume['errors'] == 0
+        assert resume['operations']['close_story']['requests'] == 2
+        assert resume['throughput_rps'] > 0
+
+    def test_async_api_parity(self, live_server):
+        """!
+        @brief Vérifie que le même scénario passe sans erreur sur les vues asynchrones (`--api async`).
+
+        Seule la parité fonctionnelle est vérifiée ici : la parité de débit se mesure sous
+        un serveur ASGI réel (voir `--baseline` dans `benchmarks/loadgen.py`).
+        """
+        resumes = {}
+        for api in ('rest', 'async'):
+            args = parse_args([
+                '--url', live_server.url, '--rooms', '1', '--players', '1', '--stories', '2',
+                '--poll-interval', '0.05', '--think', '0.05', '--room-timeout', '30', '--api', api,
+            ])
+            resumes[api] = asyncio.run(run_load(args))
+
+        assert resumes['async']['rooms_completed'] == 1
+        assert resumes['async']['errors'] == 0
+        assert {nom: o['requests'] for nom, o in resumes['async']['operations'].items()} == \
+            {nom: o['requests'] for nom, o in resumes['rest']['operations'].items()}
@@ -0,0 +1,69 @@
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from tests.factories import SessionFactory, PartieFactory
+
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    """!
+    @brief Tests du middleware de métriques et de l'endpoint `/metrics`.
+    """
+
+    def test_request_is_measured(self, api_client):
+        """!
+        @brief Vérifie la latence, le code de réponse et le nombre de requêtes SQL d'une route.
+        """
+        partie = PartieFactory(username='alice')
+        labels = {'route': 'partie-vote-card', 'method': 'POST'}
+        avant = _sample('planning_poker_http_request_duration_seconds_count', **labels)
+        avant_200 = _sample('planning_poker_http_responses_total', status='200', **labels)
+        avant_sql = _sample('planning_poker_db_queries_per_request_sum', route='partie-vote-card')
+
+        api_client.post(reverse('partie-vote-card'), {'username': 'alice', 'id_session': partie.id_session_id, 'carte_choisie': '5'}, format='json')
+
+        assert _sample('planning_poker_http_request_duration_seconds_count', **labels) == avant + 1
+        assert _sample('planning_poker_http_responses_total', status='200', **labels) == avant_200 + 1
+        assert _sample('planning_poker_db_queries_per_request_sum', route='partie-vote-card') > avant_sql
+
+    def test_async_view_queries_are_counted(self, client):
+        """!
+        @brief Vérifie que les requêtes SQL d'une vue asynchrone (long-polling) sont comptées.
+        """
+        session = SessionFactory()
+        avant = _sample('planning_poker_db_queries_per_request_sum', route='session-changes')
+
+        response = client.get(reverse('session-changes', args=[session.id_session]), {'since': -1})
+
+        assert response.status_code == 200
+        assert _sample('planning_poker_db_queries_per_request_sum', route='session-changes') > avant
+
+    def test_unmatched_route(self, api_client):
+        """!
+        @brief Vérifie que les URL inconnues sont regroupées sous une seule route.
+        """
+        avant = _sample('planning_poker_http_responses_total', route='<unmatched>', method='GET', status='404')
+        api_client.get('/inconnue/123456/')
+        assert _sample('planning_poker_http_responses_total', route='<unmatched>', method='GET', status='404') == avant + 1
+
+    def test_metrics_endpoint(self, client):
+        """!
+        @brief Vérifie le format Prometheus et les jauges de sessions et joueurs actifs.
+        """
+        ouverte = SessionFactory()
+        PartieFactory.create_batch(2, id_session=ouverte)
+        fermee = SessionFactory(status='closed')
+        PartieFactory(id_session=fermee)
+
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert response['Content-Type'].startswith('text/plain')
+        corps = response.content.decode()
+        assert 'planning_poker_live_sessions 1.0' in corps
+        assert 'planning_poker_live_players 2.0' in corps
+        assert 'planning_poker_http_request_duration_seconds_bucket' in corps
@@ -1,6 +1,8 @@
 # tests/test_models.py
 import pytest
-from planning_poker.models import Session, Partie
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from planning_poker.models import Session, Partie, Story, Vote
 from tests.factories import SessionFactory, PartieFactory
 
 
@@ -124,18 +126,33 @@ class TestPartie:
     
     def test_partie_carte_choisie(self):
         """!
-        @brief Vérifie que le choix de carte et l'état de vote sont bien persistés.
+        @brief Vérifie que le vote est persisté (dans `Vote`) et relu par `with_vote()`.
         """
         session = SessionFactory()
         partie = PartieFactory(id_session=session, carte_choisie='8')
         assert partie.carte_choisie == '8'
-        
-        # Voter
-        partie.a_vote = True
-        partie.save()
-        partie.refresh_from_db()
+
+        partie = Partie.objects.with_vote().get(pk=partie.pk)
         assert partie.a_vote is True
         assert partie.carte_choisie == '8'
+
+    def test_vote_cast_replaces_current_round_vote(self):
+        """!
+        @brief Vérifie qu'un nouveau vote remplace le précédent dans la manche, sans toucher aux autres manches.
+        """
+        session = SessionFactory()
+        partie = PartieFactory(id_session=session, username='Alice', carte_choisie='3')
+        Session.objects.filter(pk=session.pk).update(round=1)
+
+        Vote.cast(session.pk, 'Alice', '5')
+        Vote.cast(session.pk, 'Alice', '8')
+
+        votes = Vote.objects.filter(session=session).order_by('round').values_list('round', 'carte')
+        assert list(votes) == [(0, '3'), (1, '8')]
+        assert Partie.objects.with_vote().get(pk=partie.pk).carte_choisie == '8'
+
+        Vote.withdraw(session.pk, 'Alice')
+        assert Partie.objects.with_vote().get(pk=partie.pk).a_vote is False
     
     def test_multiple_parties_same_session(self):
         """!
@@ -194,4 +211,103 @@ class TestPartie:
         
         for carte in cartes:
             partie = PartieFactory(id_session=session, username=f'player_{carte}', carte_choisie=carte)
-            assert partie.carte_choisie == carte
\ No newline at end of file
+            assert partie.carte_choisie == carte
+
+@pytest.mark.django_db
+class TestStory:
+    """!
+    @brief Suite de tests pour le modèle `Story` (backlog normalisé).
+    """
+
+    def test_stories_created_with_session(self):
+        """!
+        @brief Vérifie qu'une session créée avec une liste de stories crée une ligne par story.
+        """
+        session = SessionFactory(stories=[
+            {'titre': 'Login', 'contenu': 'Page de connexion'},
+            {'titre': 'Logout', 'contenu': 'Déconnexion', 'valeur_finale': 3},
+        ])
+        stories = list(Story.objects.filter(session=session))
+        assert [s.position for s in stories] == [0, 1]
+        assert stories[0].titre == 'Login'
+        assert stories[0].valeur_finale is None
+        assert stories[1].valeur_finale == '3'
+
+    def test_dict_stories_not_materialised(self):
+        """!
+        @brief Vérifie qu'un JSON qui n'est pas une liste est conservé tel quel, sans ligne Story.
+        """
+        session = SessionFactory(stories={'story1': 'Implémenter login'})
+        assert not Story.objects.filter(session=session).exists()
+
+    def test_story_as_json(self):
+        """!
+        @brief Vérifie la représentation au format historique (valeur_finale seulement si clôturée).
+        """
+        session = SessionFactory(stories=[{'titre': 'A', 'contenu': 'a'}])
+        story = Story.objects.get(session=session)
+        assert story.as_json() == {'titre': 'A', 'contenu': 'a'}
+        story.valeur_finale = '8'
+        assert story.as_json() == {'titre': 'A', 'contenu': 'a', 'valeur_finale': '8'}
+
+    def test_story_cascade_delete(self):
+        """!
+        @brief Vérifie que les stories sont supprimées avec leur session.
+        """
+        session = SessionFactory(stories=[{'titre': 'A'}, {'titre': 'B'}])
+        id_session = session.id_session
+        session.delete()
+        assert not Story.objects.filter(session_id=id_session).exists()
+
+
+@pytest.mark.django_db
+class TestDirtyFields:
+    """!
+    @brief Suite de tests du suivi des champs modifiés (`DirtyFieldsMixin`).
+    """
+
+    def test_save_writes_only_changed_fields(self):
+        """!
+        @brief Vérifie qu'un `save()` n'écrit que les champs modifiés (jamais le JSON des stories).
+        """
+        session = Session.objects.get(pk=SessionFactory(stories=[{'titre': 'A'}]).pk)
+        session.titre = 'Nouveau titre'
+
+        with CaptureQueriesContext(connection) as ctx:
+            session.save()
+
+        sql = ctx.captured_queries[-1]['sql']
+        assert sql.startswith('UPDATE') and '"titre"' in sql and '"updated_at"' in sql
+        assert '"stories"' not in sql and '"mode_de_jeu"' not in sql
+        assert Session.objects.get(pk=session.pk).titre == 'Nouveau titre'
+
+    def test_save_without_changes_is_skipped(self, django_assert_num_queries):
+        """!
+        @brief Vérifie qu'aucune requête n'est faite si rien n'a changé, y compris après un premier save.
+        """
+        partie = Partie.objects.get(pk=PartieFactory().pk)
+        partie.username = 'Zoe'
+        partie.save()
+
+        with django_assert_num_queries(0):
+            partie.save()
+
+    def test_reassigned_json_is_dirty(self):
+        """!
+        @brief Vérifie qu'une réaffectation du champ JSON est détectée.
+        """
+        session = Session.objects.get(pk=SessionFactory(stories=[{'titre': 'A'}]).pk)
+        session.stories = [{'titre': 'B'}]
+
+        assert session.get_dirty_fields() == ['stories']
+        session.save()
+        assert Session.objects.get(pk=session.pk).stories == [{'titre': 'B'}]
+
+    def test_new_instance_saves_normally(self):
+        """!
+        @brief Vérifie qu'un objet non chargé depuis la base s'enregistre entièrement.
+        """
+        session = Session(titre='Neuve', stories=[], mode_de_jeu='strict')
+        assert session.get_dirty_fields() is None
+        session.save()
+        assert Session.objects.filter(pk=session.pk, titre='Neuve').exists()
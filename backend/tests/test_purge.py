@@ -0,0 +1,156 @@
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from planning_poker import purge, tally
+from planning_poker.apps import _is_server_process
+from planning_poker.models import Partie, RecycledCode, Session, Story
+from tests.factories import SessionFactory, PartieFactory
+
+
+def _age(obj, **delta):
+    """!
+    @brief Recule la date d'activité d'une ligne (contourne `auto_now`).
+    """
+    type(obj).objects.filter(pk=obj.pk).update(updated_at=timezone.now() - timedelta(**delta))
+
+
+@pytest.mark.django_db
+class TestPurgeSessions:
+    """!
+    @brief Tests de la purge des sessions expirées.
+    """
+
+    def test_purges_only_expired_sessions(self):
+        """!
+        @brief Vérifie les deux durées de vie : fermée (30 j) et abandonnée (7 j).
+        """
+        fermee = SessionFactory(status='closed', stories=[{'titre': 'A'}])
+        PartieFactory(id_session=fermee)
+        _age(fermee, days=31)
+        abandonnee = SessionFactory(status='in_progress')
+        _age(abandonnee, days=8)
+        recente_fermee = SessionFactory(status='closed')
+        _age(recente_fermee, days=8)
+        active = SessionFactory()
+
+        assert purge.purge_sessions(batch_size=1) == 2
+
+        assert set(Session.objects.values_list('pk', flat=True)) == {recente_fermee.pk, active.pk}
+        assert not Story.objects.filter(session_id=fermee.pk).exists()
+        assert not Partie.objects.filter(id_session_id=fermee.pk).exists()
+        assert RecycledCode.objects.filter(code=fermee.pk).exists()
+
+    def test_dry_run_deletes_nothing(self):
+        """!
+        @brief Vérifie que `dry_run` compte sans supprimer.
+        """
+        session = SessionFactory(status='closed')
+        _age(session, days=31)
+
+        assert purge.purge_sessions(dry_run=True) == 1
+        assert Session.objects.filter(pk=session.pk).exists()
+
+    def test_archive(self):
+        """!
+        @brief Vérifie l'archivage JSON Lines (avec les résultats) avant suppression.
+        """
+        session = SessionFactory(status='closed', stories=[{'titre': 'A', 'valeur_finale': '5'}])
+        _age(session, days=31)
+        archive = io.StringIO()
+
+        purge.purge_sessions(archive=archive)
+
+        ligne = json.loads(archive.getvalue())
+        assert ligne['id_session'] == session.pk
+        assert ligne['stories'] == [{'titre': 'A', 'contenu': '', 'valeur_finale': '5'}]
+
+    def test_activity_refreshes_session(self, api_client):
+        """!
+        @brief Vérifie qu'une écriture (ici un vote) repousse l'expiration de la session.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='alice')
+        _age(session, days=8)
+
+        api_client.post('/api/parties/vote_card/', {'username': 'alice', 'id_session': session.pk, 'carte_choisie': '5'}, format='json')
+
+        assert purge.purge_sessions() == 0
+
+
+@pytest.mark.django_db(transaction=True)
+class TestPurgeParties:
+    """!
+    @brief Tests de la purge des joueurs inactifs.
+    """
+
+    def test_purges_idle_players_and_updates_tally(self):
+        """!
+        @brief Vérifie la suppression des joueurs inactifs et la mise à jour du décompte en cache.
+        """
+        session = SessionFactory()
+        inactif = PartieFactory(id_session=session, username='bob', carte_choisie='8', a_vote=True)
+        PartieFactory(id_session=session, username='alice')
+        _age(inactif, days=2)
+        tally.get_tally(session.pk)
+
+        assert purge.purge_parties() == 1
+
+        assert list(Partie.objects.values_list('username', flat=True)) == ['alice']
+        entry = tally.get_tally(session.pk)
+        assert set(entry['joueurs']) == {'alice'}
+        assert entry['nb_votes'] == 0
+        assert Session.objects.get(pk=session.pk).version == entry['version']
+
+    def test_player_purge_does_not_keep_session_alive(self):
+        """!
+        @brief Vérifie que la purge des joueurs ne rafraîchit pas l'activité de leur session.
+        """
+        session = SessionFactory()
+        joueur = PartieFactory(id_session=session, username='bob')
+        _age(joueur, days=8)
+        _age(session, days=8)
+
+        purge.purge_parties()
+
+        assert Session.objects.get(pk=session.pk).version == 1
+        assert purge.expired_sessions().filter(pk=session.pk).exists()
+
+
+@pytest.mark.parametrize('argv, serveur', [
+    (['manage.py', 'runserver'], True),
+    (['/usr/local/bin/daphne', '-b', '0.0.0.0', 'backend.asgi:application'], True),
+    (['/usr/lib/python3/site-packages/daphne/__main__.py', 'backend.asgi:application'], True),
+    (['/usr/local/bin/gunicorn', 'backend.wsgi'], True),
+    (['manage.py', 'migrate'], False),
+    (['/usr/local/bin/pytest', '-q'], False),
+    (['-m'], False),
+    (['benchmarks/runner.py'], False),
+])
+def test_periodic_purge_only_in_server_processes(argv, serveur):
+    assert _is_server_process(argv) is serveur
+
+
+@pytest.mark.django_db
+class TestPurgeCommand:
+    """!
+    @brief Tests de la commande `manage.py purge_sessions`.
+    """
+
+    def test_command(self, tmp_path):
+        """!
+        @brief Vérifie la commande avec archivage dans un fichier.
+        """
+        session = SessionFactory(status='closed')
+        _age(session, days=31)
+        chemin = tmp_path / 'archive.jsonl'
+        out = io.StringIO()
+
+        call_command('purge_sessions', '--archive', str(chemin), stdout=out)
+
+        assert 'Purge : 1 session(s), 0 joueur(s)' in out.getvalue()
+        assert json.loads(chemin.read_text())['id_session'] == session.pk
+        assert not Session.objects.exists()
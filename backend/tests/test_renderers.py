@@ -0,0 +1,96 @@
+"""!
+@brief Tests des renderers et parsers de l'API (`planning_poker/renderers.py`).
+"""
+
+import datetime
+import decimal
+import json
+import runpy
+from pathlib import Path
+
+import msgpack
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from planning_poker.models import Partie
+from planning_poker.renderers import ORJSONRenderer
+from tests.factories import PartieFactory, SessionFactory
+
+MSGPACK = 'application/msgpack'
+
+SETTINGS_PATH = Path(__file__).resolve().parent.parent / 'backend' / 'settings.py'
+
+
+class TestORJSONRenderer:
+    """!
+    @brief Sortie identique au `JSONRenderer` de DRF.
+    """
+
+    def test_same_bytes_as_drf(self):
+        data = {'titre': 'Été', 'stories': [{'id': 1, 'resultat': None, 'ok': True}], 'moyenne': 2.5}
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_line_separators_are_escaped(self):
+        data = {'contenu': 'ligne\u2028suite\u2029fin'}
+        rendu = ORJSONRenderer().render(data)
+
+        assert rendu == JSONRenderer().render(data)
+        assert b'\\u2028' in rendu and b'\\u2029' in rendu
+
+    def test_non_native_types_use_drf_encoder(self):
+        data = {'d': decimal.Decimal('1.50'), 'jour': datetime.date(2024, 1, 2)}
+        assert json.loads(ORJSONRenderer().render(data)) == {'d': 1.5, 'jour': '2024-01-02'}
+
+    def test_indent(self):
+        rendu = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        assert rendu == b'{\n  "a": 1\n}'
+
+
+@pytest.mark.django_db
+class TestNegotiation:
+    """!
+    @brief Choix du format par `Accept` et lecture des corps par `Content-Type`.
+    """
+
+    def test_json_by_default(self, api_client):
+        session = SessionFactory()
+        response = api_client.get(reverse('session-detail', args=[session.pk]), HTTP_ACCEPT='*/*')
+
+        assert response['Content-Type'] == 'application/json'
+        assert response.json()['id_session'] == session.pk
+
+    def test_msgpack_on_request(self, api_client):
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+        url = reverse('partie-list')
+
+        en_json = api_client.get(url, {'id_session': session.pk}).json()
+        response = api_client.get(url, {'id_session': session.pk}, HTTP_ACCEPT=MSGPACK)
+
+        assert response['Content-Type'] == MSGPACK
+        assert msgpack.unpackb(response.content) == en_json
+
+    def test_msgpack_body(self, api_client):
+        session = SessionFactory()
+        corps = msgpack.packb({'username': 'Alice', 'id_session': session.pk})
+
+        response = api_client.post(reverse('partie-join-partie'), corps, content_type=MSGPACK, HTTP_ACCEPT=MSGPACK)
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert Partie.objects.filter(id_session=session, username='Alice').exists()
+
+    @pytest.mark.parametrize('content_type, corps', [('application/json', b'{"username":'), (MSGPACK, b'\xc1')])
+    def test_invalid_body(self, api_client, content_type, corps):
+        response = api_client.post(reverse('partie-join-partie'), corps, content_type=content_type)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.parametrize('debug, navigable', [('True', True), ('False', False)])
+def test_browsable_api_only_in_debug(monkeypatch, debug, navigable):
+    monkeypatch.setenv('DEBUG', debug)
+    renderers = runpy.run_path(str(SETTINGS_PATH))['REST_FRAMEWORK']['DEFAULT_RENDERER_CLASSES']
+
+    assert renderers[0] == 'planning_poker.renderers.ORJSONRenderer'
+    assert ('rest_framework.renderers.BrowsableAPIRenderer' in renderers) is navigable
@@ -0,0 +1,229 @@
+"""!
+@brief Tests du cache de réponses de polling (`planning_poker/response_cache.py`).
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from asgiref.sync import ThreadSensitiveContext
+from django.core.cache import cache
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.mixins import ListModelMixin
+from rest_framework.test import APIClient
+
+from planning_poker import response_cache, tally
+from planning_poker.models import Session
+from tests.factories import PartieFactory, SessionFactory
+
+
+def _joueurs(api_client, session):
+    response = api_client.get(reverse('partie-list'), {'id_session': session.pk})
+    assert response.status_code == status.HTTP_200_OK
+    return {j['username']: j for j in response.json()}
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """!
+    @brief Réponses servies depuis le cache, et invalidation à chaque écriture.
+    """
+
+    def test_second_read_is_served_from_cache(self, api_client, django_assert_num_queries):
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+        avant = response_cache.stats().get('partie-list', {'hits': 0, 'misses': 0})
+
+        premiere = api_client.get(reverse('partie-list'), {'id_session': session.pk})
+        with django_assert_num_queries(1):
+            seconde = api_client.get(reverse('partie-list'), {'id_session': session.pk})
+
+        assert seconde.content == premiere.content
+        assert seconde['Content-Type'] == premiere['Content-Type']
+        apres = response_cache.stats()['partie-list']
+        assert (apres['hits'] - avant['hits'], apres['misses'] - avant['misses']) == (1, 1)
+        assert 0 < apres['hit_ratio'] < 1
+
+    def test_game_actions_bump_version(self, api_client):
+        """!
+        @brief Vérifie l'invalidation par les `update()` en masse (vote, remise à zéro), sans signal.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+        assert _joueurs(api_client, session)['Alice']['a_vote'] is False
+
+        api_client.post(reverse('partie-vote-card'), {
+            'username': 'Alice', 'id_session': session.pk, 'carte_choisie': '5',
+        }, format='json')
+        assert _joueurs(api_client, session)['Alice']['a_vote'] is True
+
+        api_client.post(reverse('partie-raz-vote'), {'id_session': session.pk}, format='json')
+        assert _joueurs(api_client, session)['Alice']['a_vote'] is False
+
+    def test_crud_writes_invalidate(self, api_client, django_capture_on_commit_callbacks):
+        """!
+        @brief Vérifie l'invalidation (après COMMIT) par les écritures CRUD.
+        """
+        session = SessionFactory(titre='Avant')
+        alice = PartieFactory(id_session=session, username='Alice')
+        detail = reverse('session-detail', args=[session.pk])
+        assert api_client.get(detail).json()['titre'] == 'Avant'
+        assert set(_joueurs(api_client, session)) == {'Alice'}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(detail, {'titre': 'Après'}, format='json')
+        assert api_client.get(detail).json()['titre'] == 'Après'
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(reverse('partie-list'), {'username': 'Bob', 'id_session': session.pk}, format='json')
+        assert set(_joueurs(api_client, session)) == {'Alice', 'Bob'}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(reverse('partie-detail', args=[alice.pk]))
+        assert set(_joueurs(api_client, session)) == {'Bob'}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(detail)
+        assert api_client.get(detail).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_crud_writes_change_version(self, api_client, django_capture_on_commit_callbacks):
+        """!
+        @brief Vérifie que les écritures CRUD de l'API changent la version : ETag de l'état et décompte à jour.
+        """
+        session = SessionFactory()
+        alice = PartieFactory(id_session=session, username='Alice')
+        etat = reverse('session-state', args=[session.pk])
+        etag = api_client.get(etat)['ETag']
+        with django_capture_on_commit_callbacks(execute=True):
+            tally.get_tally(session.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(reverse('session-detail', args=[session.pk]), {'titre': 'Après'}, format='json')
+        response = api_client.get(etat, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(reverse('partie-detail', args=[alice.pk]), {'carte_choisie': '8'}, format='json')
+        assert tally.get_tally(session.pk)['histogram'] == {'8': 1}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.delete(reverse('partie-detail', args=[alice.pk]))
+        assert tally.get_tally(session.pk)['joueurs'] == {}
+        assert Session.objects.get(pk=session.pk).version == session.version + 3
+
+    def test_coalesced_follower_gets_leader_bytes(self, api_client, monkeypatch):
+        """!
+        @brief Vérifie qu'une requête qui a attendu un calcul simultané reçoit ses octets (et est comptée).
+        """
+        class Suiveur:
+            def do(self, key, fn):
+                return fn(), True  # comme si un autre thread avait calculé la réponse
+
+        monkeypatch.setattr(response_cache, '_en_vol', Suiveur())
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+        avant = response_cache.stats().get('partie-list', {}).get('coalesced', 0)
+
+        response = api_client.get(reverse('partie-list'), {'id_session': session.pk})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [j['username'] for j in response.json()] == ['Alice']
+        assert response_cache.stats()['partie-list']['coalesced'] == avant + 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_concurrent_polls_run_the_view_once_under_asgi(self, monkeypatch):
+        """!
+        @brief Vérifie que des polls identiques simultanés, chacun dans son `ThreadSensitiveContext`
+        comme sous le gestionnaire ASGI de Django, n'exécutent la vue qu'une fois.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+        appels = []
+        liste = ListModelMixin.list
+
+        def liste_lente(self, request, *args, **kwargs):
+            appels.append(1)
+            time.sleep(0.2)  # les autres requêtes arrivent pendant le calcul
+            return liste(self, request, *args, **kwargs)
+
+        monkeypatch.setattr(ListModelMixin, 'list', liste_lente)
+        avant = response_cache.stats().get('partie-list', {}).get('coalesced', 0)
+
+        async def poll():
+            async with ThreadSensitiveContext():
+                return await AsyncClient().get(reverse('partie-list'), {'id_session': session.pk})
+
+        async def polls():
+            return await asyncio.gather(*(poll() for _ in range(5)))
+
+        # Boucle sans thread synchrone appelant (comme daphne) : sinon `async_to_sync` y ramènerait les vues
+        responses = asyncio.run(polls())
+
+        assert len(appels) == 1
+        assert [r.status_code for r in responses] == [status.HTTP_200_OK] * 5
+        assert {r.content for r in responses} == {responses[0].content}
+        assert response_cache.stats()['partie-list']['coalesced'] == avant + 4
+
+    @pytest.mark.django_db(transaction=True)
+    def test_poll_after_write_does_not_join_older_computation(self, monkeypatch):
+        """!
+        @brief Vérifie qu'un poll arrivé après une écriture validée ne reçoit pas la réponse d'un calcul
+        commencé avant elle (la version fait partie de la clé).
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+        liste = ListModelMixin.list
+        en_cours = threading.Event()
+
+        def liste_lente(self, request, *args, **kwargs):
+            response = liste(self, request, *args, **kwargs)
+            if not en_cours.is_set():
+                en_cours.set()
+                time.sleep(0.3)  # le meneur a lu l'état avant l'écriture
+            return response
+
+        monkeypatch.setattr(ListModelMixin, 'list', liste_lente)
+        client = APIClient()
+        url = reverse('partie-list')
+        meneur = {}
+        thread = threading.Thread(target=lambda: meneur.update(response=client.get(url, {'id_session': session.pk})))
+        thread.start()
+        en_cours.wait()
+        client.post(reverse('partie-join-partie'), {'username': 'Bob', 'id_session': session.pk}, format='json')
+
+        response = client.get(url, {'id_session': session.pk})
+        thread.join()
+
+        assert {j['username'] for j in meneur['response'].json()} == {'Alice'}
+        assert {j['username'] for j in response.json()} == {'Alice', 'Bob'}
+
+    def test_evicted_generation_never_reuses_old_entries(self):
+        session = SessionFactory()
+        ancienne = response_cache.generation(session.pk)
+
+        cache.delete(response_cache._generation_key(session.pk))
+
+        assert response_cache.generation(session.pk) > ancienne
+
+    def test_disabled(self, api_client, settings, django_assert_num_queries):
+        settings.RESPONSE_CACHE_TIMEOUT = 0
+        session = SessionFactory()
+
+        api_client.get(reverse('partie-list'), {'id_session': session.pk})
+        with django_assert_num_queries(2):  # version (clé de coalescence) + liste
+            response = api_client.get(reverse('partie-list'), {'id_session': session.pk})
+        assert hasattr(response, 'data')  # réponse calculée, pas relue
+
+    def test_hit_ratio_metric(self, client, api_client):
+        session = SessionFactory()
+        api_client.get(reverse('partie-list'), {'id_session': session.pk})
+        api_client.get(reverse('partie-list'), {'id_session': session.pk})
+
+        body = client.get(reverse('metrics')).content.decode()
+
+        assert 'planning_poker_response_cache_total{result="hit",route="partie-list"}' in body
+        assert 'planning_poker_response_cache_total{result="miss",route="partie-list"}' in body
@@ -0,0 +1,154 @@
+"""!
+@brief Tests de la configuration des bases et du routage principale / réplicas (`planning_poker/routers.py`).
+"""
+
+import runpy
+import sys
+from pathlib import Path
+
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.urls import reverse
+from rest_framework import status
+
+from planning_poker import routers
+from planning_poker.models import Session
+from tests.factories import PartieFactory, SessionFactory
+
+SETTINGS_PATH = Path(__file__).resolve().parent.parent / 'backend' / 'settings.py'
+
+
+class _ChoiceSpy:
+    """!
+    @brief Remplace `random` dans le routeur : note chaque choix de réplica et renvoie `default`.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def choice(self, aliases):
+        self.calls += 1
+        return 'default'
+
+
+@pytest.fixture
+def replica(settings, monkeypatch):
+    """!
+    @brief Simule un réplica : le réseau de test n'a qu'une base, le « réplica » est donc `default`.
+
+    @return L'espion qui compte les lectures routées vers le réplica.
+    """
+    settings.DATABASE_REPLICAS = ['default']
+    spy = _ChoiceSpy()
+    monkeypatch.setattr(routers, 'random', spy)
+    return spy
+
+
+class TestDatabaseSettings:
+    """!
+    @brief Construction de `DATABASES` à partir des variables d'environnement.
+    """
+
+    def _load(self, monkeypatch, **env):
+        for nom in ('DB_ENGINE', 'DB_NAME', 'DB_HOST', 'DB_POOL_MAX_SIZE', 'DB_REPLICA_HOSTS', 'DB_CONN_MAX_AGE'):
+            monkeypatch.delenv(nom, raising=False)
+        for nom, valeur in env.items():
+            monkeypatch.setenv(nom, valeur)
+        return runpy.run_path(str(SETTINGS_PATH))
+
+    def test_sqlite_by_default(self, monkeypatch):
+        config = self._load(monkeypatch)
+        assert config['DATABASES']['default']['NAME'] == config['BASE_DIR'] / 'db.sqlite3'
+        assert config['DATABASE_REPLICAS'] == []
+
+    def test_postgresql_with_replicas(self, monkeypatch):
+        config = self._load(
+            monkeypatch, DB_ENGINE='django.db.backends.postgresql', DB_NAME='poker', DB_HOST='primaire',
+            DB_PORT='5432', DB_USER='poker', DB_PASSWORD='secret', DB_REPLICA_HOSTS='replique1, replique2:5433',
+        )
+        bases = config['DATABASES']
+
+        assert bases['default']['NAME'] == 'poker'
+        assert bases['default']['CONN_MAX_AGE'] == 60
+        assert bases['default']['CONN_HEALTH_CHECKS'] is True
+        assert (bases['replica_1']['HOST'], bases['replica_1']['PORT']) == ('replique1', '5432')
+        assert (bases['replica_2']['HOST'], bases['replica_2']['PORT']) == ('replique2', '5433')
+        assert bases['replica_2']['USER'] == 'poker'
+        assert config['DATABASE_REPLICAS'] == ['replica_1', 'replica_2']
+
+    def test_pool_without_psycopg3_is_rejected(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'psycopg_pool', None)  # import impossible
+
+        with pytest.raises(ImproperlyConfigured, match='psycopg'):
+            self._load(monkeypatch, DB_ENGINE='django.db.backends.postgresql', DB_POOL_MAX_SIZE='10')
+
+
+class TestRouter:
+    """!
+    @brief Décisions du routeur, hors vues.
+    """
+
+    def test_primary_without_replica_context(self, replica):
+        router = routers.PrimaryReplicaRouter()
+        assert router.db_for_read(Session) == 'default'
+        assert replica.calls == 0
+
+    def test_write_ends_replica_reads(self, replica):
+        router = routers.PrimaryReplicaRouter()
+        jeton = routers._replica_reads.set(True)
+        try:
+            router.db_for_read(Session)
+            router.db_for_write(Session)
+            router.db_for_read(Session)
+        finally:
+            routers._replica_reads.reset(jeton)
+        assert replica.calls == 1
+
+    def test_no_migration_on_replicas(self, settings):
+        settings.DATABASE_REPLICAS = ['replica_1']
+        router = routers.PrimaryReplicaRouter()
+        assert router.allow_migrate('default', 'planning_poker')
+        assert not router.allow_migrate('replica_1', 'planning_poker')
+
+
+@pytest.mark.django_db
+class TestReplicaReads:
+    """!
+    @brief Lectures de polling sur réplica, et lecture de ses propres écritures sur la principale.
+    """
+
+    def test_polling_reads_use_replica(self, api_client, replica):
+        session = SessionFactory()
+        cache.clear()  # épingle posée par la création : on simule l'expiration du délai
+
+        assert api_client.get(reverse('partie-list'), {'id_session': session.pk}).status_code == status.HTTP_200_OK
+        assert api_client.get(reverse('session-detail', args=[session.pk])).status_code == status.HTTP_200_OK
+        assert replica.calls > 0
+
+    def test_other_actions_use_primary(self, api_client, replica):
+        session = SessionFactory()
+
+        api_client.get(reverse('session-progress', args=[session.pk]))
+        api_client.post(reverse('partie-join-partie'), {'username': 'Alice', 'id_session': session.pk}, format='json')
+
+        assert replica.calls == 0
+
+    def test_write_pins_session_on_primary(self, api_client, replica):
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='Alice')
+
+        api_client.post(reverse('partie-vote-card'), {
+            'username': 'Alice', 'id_session': session.pk, 'carte_choisie': '5',
+        }, format='json')
+        response = api_client.get(reverse('partie-list'), {'id_session': session.pk})
+
+        assert response.json()[0]['a_vote'] is True
+        assert replica.calls == 0
+
+    def test_created_session_is_pinned(self, api_client, replica):
+        response = api_client.post(reverse('session-list'), {
+            'titre': 'Sprint', 'mode_de_jeu': 'average', 'stories': [],
+        }, format='json')
+
+        assert routers.is_pinned(response.json()['id_session'])
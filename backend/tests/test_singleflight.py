@@ -0,0 +1,103 @@
+"""!
+@brief Tests de la coalescence des calculs simultanés (`planning_poker/singleflight.py`).
+"""
+
+import threading
+import time
+
+from planning_poker.singleflight import SingleFlight
+
+
+def _en_parallele(nb, cible):
+    """!
+    @brief Lance `nb` threads sur `cible(i)` et renvoie leurs résultats (ou exceptions), dans l'ordre.
+    """
+    resultats = [None] * nb
+
+    def run(i):
+        try:
+            resultats[i] = cible(i)
+        except Exception as exc:
+            resultats[i] = exc
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(nb)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return resultats
+
+
+class TestSingleFlight:
+    """!
+    @brief Un seul calcul par clé pour les appels simultanés.
+    """
+
+    def test_concurrent_calls_share_one_computation(self):
+        vol = SingleFlight()
+        appels = []
+        en_cours = threading.Event()
+
+        def calcul():
+            appels.append(1)
+            en_cours.set()
+            time.sleep(0.2)  # laisse les autres threads arriver pendant le calcul
+            return b'reponse'
+
+        def cible(i):
+            if i:
+                en_cours.wait()
+            return vol.do('cle', calcul)
+
+        resultats = _en_parallele(8, cible)
+
+        assert len(appels) == 1
+        assert [r for r, _ in resultats] == [b'reponse'] * 8
+        assert sorted(partage for _, partage in resultats) == [False] + [True] * 7
+        assert vol.in_flight() == 0
+
+    def test_distinct_keys_and_later_calls_recompute(self):
+        vol = SingleFlight()
+        compteur = iter(range(100))
+
+        assert vol.do('a', lambda: next(compteur)) == (0, False)
+        assert vol.do('b', lambda: next(compteur)) == (1, False)
+        assert vol.do('a', lambda: next(compteur)) == (2, False)
+
+    def test_error_is_shared(self):
+        vol = SingleFlight()
+        en_cours = threading.Event()
+
+        def calcul():
+            en_cours.set()
+            time.sleep(0.2)
+            raise ValueError('base indisponible')
+
+        def cible(i):
+            if i:
+                en_cours.wait()
+            return vol.do('cle', calcul)
+
+        resultats = _en_parallele(3, cible)
+
+        assert all(isinstance(r, ValueError) for r in resultats)
+        assert vol.in_flight() == 0
+
+    def test_follower_computes_itself_after_timeout(self):
+        vol = SingleFlight(timeout=0.05)
+        libere = threading.Event()
+        en_cours = threading.Event()
+
+        def lent():
+            en_cours.set()
+            libere.wait(5)
+            return 'lent'
+
+        meneur = threading.Thread(target=vol.do, args=('cle', lent))
+        meneur.start()
+        en_cours.wait()
+        try:
+            assert vol.do('cle', lambda: 'rapide') == ('rapide', False)
+        finally:
+            libere.set()
+            meneur.join()
@@ -0,0 +1,112 @@
+"""!
+@brief Tests du profil SQLite haute concurrence (`DATABASES['default']['OPTIONS']`, voir settings).
+
+Les scénarios de contention tournent sur un fichier temporaire (la base de test est en mémoire,
+où WAL et verrous de fichier ne s'appliquent pas), avec les mêmes PRAGMA que l'application.
+"""
+
+import sqlite3
+import threading
+
+import pytest
+from django.conf import settings
+from django.db import connection
+
+OPTIONS = settings.DATABASES['default'].get('OPTIONS', {})
+
+pytestmark = pytest.mark.skipif(
+    settings.DATABASES['default']['ENGINE'] != 'django.db.backends.sqlite3' or 'init_command' not in OPTIONS,
+    reason="profil SQLite désactivé",
+)
+
+
+def _connect(path):
+    """!
+    @brief Ouvre une connexion en autocommit avec les PRAGMA de l'application.
+    """
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    for commande in OPTIONS['init_command'].split(';'):
+        conn.execute(commande)
+    return conn
+
+
+@pytest.fixture
+def db_file(tmp_path):
+    path = str(tmp_path / 'contention.sqlite3')
+    conn = _connect(path)
+    conn.execute('CREATE TABLE compteur (n INTEGER)')
+    conn.execute('INSERT INTO compteur VALUES (0)')
+    conn.close()
+    return path
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_on_connection():
+    """!
+    @brief Vérifie que chaque connexion Django reçoit le profil (et les transactions IMMEDIATE).
+    """
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA synchronous')
+        assert cursor.fetchone()[0] == 1  # NORMAL
+        cursor.execute('PRAGMA busy_timeout')
+        assert cursor.fetchone()[0] > 0
+    assert connection.transaction_mode == 'IMMEDIATE'
+
+
+def test_wal_enabled(db_file):
+    conn = _connect(db_file)
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    conn.close()
+
+
+def test_deferred_read_then_write_fails(db_file):
+    """!
+    @brief Montre l'erreur corrigée : une transaction différée qui lit puis écrit échoue
+    (sans attente possible) si une autre a écrit entre-temps.
+    """
+    lecteur, ecrivain = _connect(db_file), _connect(db_file)
+    lecteur.execute('BEGIN')
+    lecteur.execute('SELECT n FROM compteur').fetchone()
+    ecrivain.execute('UPDATE compteur SET n = n + 1')
+
+    with pytest.raises(sqlite3.OperationalError, match='database is locked'):
+        lecteur.execute('UPDATE compteur SET n = n + 1')
+    lecteur.execute('ROLLBACK')
+    lecteur.close()
+    ecrivain.close()
+
+
+def test_immediate_transactions_queue(db_file):
+    """!
+    @brief Vérifie que des lectures-écritures concurrentes en transaction IMMEDIATE
+    passent toutes, l'une après l'autre, sans perte de mise à jour.
+    """
+    nb_threads, iterations = 8, 25
+    erreurs = []
+    depart = threading.Barrier(nb_threads)
+
+    def travailleur():
+        conn = _connect(db_file)
+        depart.wait()
+        try:
+            for _ in range(iterations):
+                conn.execute(f"BEGIN {OPTIONS['transaction_mode']}")
+                n = conn.execute('SELECT n FROM compteur').fetchone()[0]
+                conn.execute('UPDATE compteur SET n = ?', (n + 1,))
+                conn.execute('COMMIT')
+        except sqlite3.OperationalError as exc:
+            erreurs.append(exc)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=travailleur) for _ in range(nb_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    conn = _connect(db_file)
+    assert erreurs == []
+    assert conn.execute('SELECT n FROM compteur').fetchone()[0] == nb_threads * iterations
+    conn.close()
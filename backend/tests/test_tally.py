@@ -0,0 +1,137 @@
+# tests/test_tally.py
+"""!
+@brief Tests du décompte incrémental des votes (`tally`) et de l'endpoint `progress`.
+"""
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from planning_poker import tally
+from tests.factories import SessionFactory, PartieFactory
+
+
+@pytest.mark.django_db
+class TestTally:
+    """!
+    @brief Vérifie la reconstruction et la mise à jour incrémentale du décompte.
+    """
+
+    def test_rebuild_from_db(self):
+        """!
+        @brief Sans entrée en cache, le décompte est reconstruit depuis la base.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='alice', carte_choisie='5', a_vote=True)
+        PartieFactory(id_session=session, username='bob', carte_choisie=None, a_vote=False)
+
+        decompte = tally.get_tally(session.id_session)
+
+        assert decompte['version'] == session.version
+        assert decompte['histogram'] == {'5': 1}
+        assert decompte['nb_votes'] == 1
+        assert set(decompte['joueurs']) == {'alice', 'bob'}
+
+    def test_unknown_session(self):
+        """!
+        @brief Une session inconnue n'a pas de décompte.
+        """
+        assert tally.get_tally('999999') is None
+
+    def test_incremental_updates(self, api_client, django_capture_on_commit_callbacks,
+                                 django_assert_num_queries):
+        """!
+        @brief Les écritures mettent le décompte à jour ; la lecture ne coûte qu'une requête.
+        """
+        session = SessionFactory()
+        id_session = session.id_session
+        with django_capture_on_commit_callbacks(execute=True):
+            tally.get_tally(id_session)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(reverse('partie-join-partie'), {'username': 'alice', 'id_session': id_session}, format='json')
+            api_client.post(reverse('partie-join-partie'), {'username': 'bob', 'id_session': id_session}, format='json')
+            api_client.post(reverse('partie-vote-card'),
+                            {'username': 'alice', 'id_session': id_session, 'carte_choisie': '8'}, format='json')
+            api_client.post(reverse('partie-vote-card'),
+                            {'username': 'alice', 'id_session': id_session, 'carte_choisie': '3'}, format='json')
+
+        with django_assert_num_queries(1):
+            decompte = tally.get_tally(id_session)
+        assert decompte['histogram'] == {'3': 1}
+        assert decompte['nb_votes'] == 1
+        assert len(decompte['joueurs']) == 2
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(reverse('partie-fin-partie'), {'username': 'alice', 'id_session': id_session}, format='json')
+        with django_assert_num_queries(1):
+            decompte = tally.get_tally(id_session)
+        assert decompte['histogram'] == {}
+        assert list(decompte['joueurs']) == ['bob']
+
+    def test_raz_vote_resets(self, api_client, django_capture_on_commit_callbacks):
+        """!
+        @brief La remise à zéro vide l'histogramme mais garde les joueurs.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='alice', carte_choisie='5', a_vote=True)
+        with django_capture_on_commit_callbacks(execute=True):
+            tally.get_tally(session.id_session)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post(reverse('partie-raz-vote'), {'id_session': session.id_session}, format='json')
+
+        decompte = tally.get_tally(session.id_session)
+        assert decompte['histogram'] == {}
+        assert decompte['nb_votes'] == 0
+        assert decompte['joueurs'] == {'alice': [None, False]}
+
+    def test_stale_version_triggers_rebuild(self):
+        """!
+        @brief Une écriture non vue par le cache (autre processus) force la reconstruction.
+        """
+        session = SessionFactory()
+        tally.get_tally(session.id_session)
+        PartieFactory(id_session=session, username='alice', carte_choisie='13', a_vote=True)
+        session.version += 1
+        session.save(update_fields=['version'])
+
+        decompte = tally.get_tally(session.id_session)
+        assert decompte['histogram'] == {'13': 1}
+
+
+@pytest.mark.django_db
+class TestSessionProgress:
+    """!
+    @brief Tests de l'action `progress` (avancement du vote).
+    """
+
+    def test_progress(self, api_client):
+        """!
+        @brief Vérifie le nombre de joueurs, de votes et l'indicateur "tous ont voté".
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='alice', carte_choisie='5', a_vote=True)
+        PartieFactory(id_session=session, username='bob', carte_choisie=None, a_vote=False)
+
+        response = api_client.get(reverse('session-progress', args=[session.id_session]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'version': session.version, 'nb_joueurs': 2, 'nb_votes': 1, 'tous_ont_vote': False}
+
+    def test_progress_without_players(self, api_client):
+        """!
+        @brief Vérifie qu'une session sans joueur n'est pas considérée comme « tous ont voté ».
+        """
+        session = SessionFactory()
+
+        response = api_client.get(reverse('session-progress', args=[session.id_session]))
+
+        assert response.data == {'version': session.version, 'nb_joueurs': 0, 'nb_votes': 0, 'tous_ont_vote': False}
+
+    def test_progress_not_found(self, api_client):
+        """!
+        @brief Vérifie l'erreur 404 pour une session inconnue.
+        """
+        response = api_client.get(reverse('session-progress', args=['999999']))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -8,10 +8,22 @@ Ce fichier contient les tests fonctionnels de l'API. Il vérifie :
 - Les règles de gestion (rejoindre une session, unicité des joueurs, reset).
 """
 
+import asyncio
+from datetime import timedelta
+
 import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.layers import get_channel_layer
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
-from planning_poker.models import Session, Partie
+from planning_poker import tally, views
+from planning_poker.events import group_name
+from planning_poker.models import Session, Partie, Story, Vote
 from tests.factories import SessionFactory, PartieFactory
 
 
@@ -108,6 +120,150 @@ class TestSessionViewSet:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
+@pytest.mark.django_db
+class TestSessionStories:
+    """!
+    @brief Tests des stories normalisées (table `Story`) et de leur accès paginé.
+    """
+
+    def test_create_session_materialises_stories(self, api_client):
+        """!
+        @brief Vérifie qu'une session créée avec une liste de stories crée une ligne par story.
+        """
+        data = {
+            'titre': 'Sprint',
+            'stories': [{'titre': 'A', 'contenu': 'a'}, {'titre': 'B', 'contenu': 'b'}],
+            'mode_de_jeu': 'average',
+        }
+        response = api_client.post(reverse('session-list'), data, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['stories'] == data['stories']
+        positions = Story.objects.filter(session_id=response.data['id_session']).values_list('position', 'titre')
+        assert list(positions) == [(0, 'A'), (1, 'B')]
+
+    def test_update_session_replaces_stories(self, api_client):
+        """!
+        @brief Vérifie qu'un nouveau backlog envoyé en PATCH remplace les stories existantes.
+        """
+        session = SessionFactory(stories=[{'titre': 'A'}, {'titre': 'B'}])
+        response = api_client.patch(
+            reverse('session-detail', args=[session.id_session]),
+            {'stories': [{'titre': 'C', 'contenu': 'c'}]},
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['stories'] == [{'titre': 'C', 'contenu': 'c'}]
+        assert Story.objects.filter(session=session).count() == 1
+
+    def test_retrieve_session_query_count(self, api_client, django_assert_num_queries):
+        """!
+        @brief Vérifie que le détail d'une session précharge ses stories en une requête.
+
+        Plus la lecture de version du cache de réponses, seule requête une fois la réponse en cache.
+        """
+        session = SessionFactory(stories=[{'titre': 'A'}, {'titre': 'B'}])
+        with django_assert_num_queries(3):
+            response = api_client.get(reverse('session-detail', args=[session.id_session]))
+        assert len(response.data['stories']) == 2
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse('session-detail', args=[session.id_session]))
+        assert len(response.json()['stories']) == 2
+
+    def test_paginated_stories(self, api_client):
+        """!
+        @brief Vérifie l'accès paginé aux stories d'une session.
+        """
+        session = SessionFactory(stories=[{'titre': f'S{i}'} for i in range(5)])
+        response = api_client.get(
+            reverse('session-stories', args=[session.id_session]) + '?page=2&page_size=2'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 5
+        assert [s['titre'] for s in response.data['results']] == ['S2', 'S3']
+        assert response.data['results'][0]['position'] == 2
+
+    def test_paginated_stories_not_found(self, api_client):
+        """!
+        @brief Vérifie l'erreur 404 pour une session inconnue.
+        """
+        response = api_client.get(reverse('session-stories', args=['999999']))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestSessionLobby:
+    """!
+    @brief Tests du résumé des sessions (liste et lobby paginé par curseur).
+    """
+
+    def test_list_returns_summaries(self, api_client, django_assert_num_queries):
+        """!
+        @brief Vérifie que la liste renvoie des résumés (sans stories) en une seule requête.
+        """
+        session = SessionFactory(stories=[{'titre': 'A'}, {'titre': 'B'}])
+        PartieFactory.create_batch(3, id_session=session)
+        SessionFactory.create_batch(4)
+
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse('session-list'))
+
+        resume = next(s for s in response.data if s['id_session'] == session.id_session)
+        assert 'stories' not in resume
+        assert resume['nb_stories'] == 2
+        assert resume['nb_joueurs'] == 3
+
+    def test_lobby_cursor_pagination(self, api_client):
+        """!
+        @brief Vérifie le parcours complet du lobby page par page, sans doublon.
+        """
+        codes = {s.id_session for s in SessionFactory.create_batch(5)}
+        url = reverse('session-lobby') + '?page_size=2'
+        vus = []
+        while url:
+            response = api_client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.data['results']) <= 2
+            vus += [s['id_session'] for s in response.data['results']]
+            url = response.data['next']
+
+        assert set(vus) == codes
+        assert len(vus) == len(codes)
+
+    def test_lobby_newest_first(self, api_client):
+        """!
+        @brief Vérifie que le lobby liste les sessions les plus récentes d'abord, quel que soit leur code.
+        """
+        sessions = SessionFactory.create_batch(3)
+        for age, session in enumerate(reversed(sessions)):
+            Session.objects.filter(pk=session.pk).update(created_at=timezone.now() - timedelta(minutes=age))
+
+        response = api_client.get(reverse('session-lobby'))
+
+        assert [s['id_session'] for s in response.data['results']] == [s.id_session for s in reversed(sessions)]
+
+    def test_lobby_status_filter(self, api_client):
+        """!
+        @brief Vérifie le filtre par statut (valeurs multiples séparées par des virgules).
+        """
+        ouverte = SessionFactory(status='open')
+        en_cours = SessionFactory(status='in_progress')
+        SessionFactory(status='closed')
+
+        response = api_client.get(reverse('session-lobby') + '?status=open,in_progress')
+
+        assert {s['id_session'] for s in response.data['results']} == {ouverte.id_session, en_cours.id_session}
+
+    def test_lobby_invalid_status(self, api_client):
+        """!
+        @brief Vérifie l'erreur 400 pour un statut inconnu.
+        """
+        response = api_client.get(reverse('session-lobby') + '?status=archived')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
 @pytest.mark.django_db
 class TestSessionCloseStory:
     """!
@@ -141,6 +297,22 @@ class TestSessionCloseStory:
         assert response.data['valeur_finale'] == 5
         assert response.data['status'] == 'Validé'
     
+    def test_close_story_superscript_card(self, api_client):
+        """!
+        @brief Vérifie qu'une carte '²' (chiffre pour `isdigit()`, refusé par `int()`) est ignorée
+        par le calcul au lieu de faire échouer la clôture.
+        """
+        session = SessionFactory(mode_de_jeu='average', stories=[{'nom': 'Story 1'}])
+        PartieFactory(id_session=session, username='alice', carte_choisie='²')
+        PartieFactory(id_session=session, username='bob', carte_choisie='8')
+
+        response = api_client.post(
+            reverse('session-close-story', args=[session.id_session]), {'story_index': 0}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['valeur_finale'] == 8
+
     def test_close_story_strict_no_consensus(self, api_client):
         """!
         @brief Mode STRICT : Teste l'échec (retourne -1) en cas de désaccord.
@@ -311,6 +483,23 @@ class TestSessionCloseStory:
         assert response.status_code == status.HTTP_200_OK
         assert response.data['valeur_finale'] == 5
     
+    def test_close_story_median_no_numeric_votes(self, api_client):
+        """!
+        @brief Mode MEDIANE : sans vote numérique, le résultat vaut 0 (au lieu d'une erreur).
+        """
+        session = SessionFactory(mode_de_jeu='median', stories=[{'nom': 'Story 1'}])
+        PartieFactory(id_session=session, username='alice', carte_choisie='?')
+        PartieFactory(id_session=session, username='bob', carte_choisie=None)
+
+        response = api_client.post(
+            reverse('session-close-story', args=[session.id_session]),
+            {'story_index': 0},
+            format='json'
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['valeur_finale'] == 0
+
     def test_close_story_no_votes(self, api_client):
         """!
         @brief Teste le cas où des joueurs sont présents mais n'ont pas voté (valeurs None).
@@ -364,7 +553,7 @@ class TestSessionCloseStory:
     
     def test_close_story_updates_session_stories(self, api_client):
         """!
-        @brief Vérifie que le résultat est bien sauvegardé dans le JSON `stories` de la session.
+        @brief Vérifie que le résultat est bien sauvegardé sur la story et exposé dans `stories`.
         """
         session = SessionFactory(stories=[{'nom': 'Story 1'}, {'nom': 'Story 2'}])
         PartieFactory(id_session=session, username='alice', carte_choisie='5')
@@ -377,8 +566,52 @@ class TestSessionCloseStory:
             format='json'
         )
         
+        assert Story.objects.get(session=session, position=0).valeur_finale == '5'
+        assert Story.objects.get(session=session, position=1).valeur_finale is None
+
+        response = api_client.get(reverse('session-detail', args=[session.id_session]))
+        assert response.data['stories'][0]['valeur_finale'] == '5'
+        assert 'valeur_finale' not in response.data['stories'][1]
+
+    def test_close_story_duplicate_is_idempotent(self, api_client, monkeypatch):
+        """!
+        @brief Vérifie qu'une clôture en double renvoie le résultat existant sans recalcul ni écriture.
+        """
+        session = SessionFactory(mode_de_jeu='average', stories=[{'titre': 'Story 1'}])
+        PartieFactory(id_session=session, username='alice', carte_choisie='5')
+        url = reverse('session-close-story', args=[session.id_session])
+        api_client.post(url, {'story_index': 0}, format='json')
         session.refresh_from_db()
-        assert session.stories[0]['valeur_finale'] == '5'
+        version = session.version
+
+        def compute(*args):
+            raise AssertionError("Le résultat ne doit pas être recalculé")
+        monkeypatch.setattr('planning_poker.aggregation.compute', compute)
+        response = api_client.post(url, {'story_index': 0}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'status': 'Déjà validé', 'valeur_finale': 5}
+        session.refresh_from_db()
+        assert session.version == version
+
+    def test_close_story_concurrent_close_keeps_first_result(self, api_client, monkeypatch):
+        """!
+        @brief Vérifie qu'une clôture concurrente (validée pendant le calcul) n'est pas écrasée.
+        """
+        session = SessionFactory(mode_de_jeu='average', stories=[{'titre': 'Story 1'}])
+        PartieFactory(id_session=session, username='alice', carte_choisie='5')
+
+        def compute(*args):
+            # Un autre client clôture la story pendant notre calcul
+            Story.objects.filter(session=session, position=0).update(valeur_finale='13')
+            return 5
+        monkeypatch.setattr('planning_poker.aggregation.compute', compute)
+        response = api_client.post(
+            reverse('session-close-story', args=[session.id_session]), {'story_index': 0}, format='json'
+        )
+
+        assert response.data == {'status': 'Déjà validé', 'valeur_finale': 13}
+        assert Story.objects.get(session=session, position=0).valeur_finale == '13'
 
     def test_close_story_no_votes_found(self, api_client):
         """!
@@ -395,6 +628,23 @@ class TestSessionCloseStory:
         assert 'error' in response.data
         assert response.data['error'] == 'Aucun vote trouvé'
 
+    def test_close_story_counts_current_round_only(self, api_client):
+        """!
+        @brief Vérifie que seuls les votes de la manche en cours comptent, après une remise à zéro.
+        """
+        session = SessionFactory(mode_de_jeu='strict', stories=[{'titre': 'Story 1'}])
+        PartieFactory(id_session=session, username='alice', carte_choisie='5')
+        PartieFactory(id_session=session, username='bob', carte_choisie='3')
+        api_client.post(reverse('partie-raz-vote'), {'id_session': session.id_session}, format='json')
+        for username in ('alice', 'bob'):
+            api_client.post(reverse('partie-vote-card'), {
+                'username': username, 'id_session': session.id_session, 'carte_choisie': '8',
+            }, format='json')
+
+        response = api_client.post(reverse('session-close-story', args=[session.id_session]), {'story_index': 0}, format='json')
+
+        assert response.data['valeur_finale'] == 8
+
 
 @pytest.mark.django_db
 class TestSessionCloseSession:
@@ -430,6 +680,241 @@ class TestSessionCloseSession:
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    def test_close_session_single_update(self, api_client, django_assert_num_queries):
+        """!
+        @brief Vérifie que la fermeture tient en un seul UPDATE (statut et version ensemble), plus la
+        relecture de la version et le journal.
+        """
+        session = SessionFactory(status='in_progress')
+        with django_assert_num_queries(3):
+            api_client.post(reverse('session-close-session', args=[session.id_session]), {'status': 'closed'}, format='json')
+        session.refresh_from_db()
+        assert session.status == 'closed'
+        assert session.version == 1
+
+    def test_close_session_not_found(self, api_client):
+        """!
+        @brief Vérifie l'erreur 404 pour une session inexistante.
+        """
+        response = api_client.post(reverse('session-close-session', args=['999999']), {'status': 'closed'}, format='json')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestSessionState:
+    """!
+    @brief Tests de l'action `state` (instantané de jeu avec ETag).
+    """
+
+    def test_state_snapshot(self, api_client):
+        """!
+        @brief Vérifie que l'instantané regroupe session, story en cours et joueurs.
+        """
+        session = SessionFactory(stories=[{'titre': 'S1', 'valeur_finale': '5'}, {'titre': 'S2'}])
+        PartieFactory(id_session=session, username='alice', carte_choisie='8', a_vote=True)
+        PartieFactory(id_session=session, username='bob', carte_choisie=None, a_vote=False)
+
+        response = api_client.get(reverse('session-state', args=[session.id_session]))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['status'] == session.status
+        assert response.data['story_index'] == 1
+        assert response.data['story'] == {'titre': 'S2', 'contenu': ''}
+        assert response.data['nb_stories'] == 2
+        joueurs = {j['username']: j for j in response.data['joueurs']}
+        assert joueurs['alice']['a_vote'] is True
+        assert joueurs['bob']['carte_choisie'] is None
+        assert response['ETag'] == f'"{session.id_session}-{session.version}"'
+
+    def test_state_not_modified(self, api_client, django_assert_num_queries):
+        """!
+        @brief Vérifie qu'un ETag à jour donne un 304 avec une seule requête SQL.
+        """
+        session = SessionFactory()
+        url = reverse('session-state', args=[session.id_session])
+        etag = api_client.get(url)['ETag']
+
+        with django_assert_num_queries(1):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+
+    def test_state_etag_changes_after_vote(self, api_client):
+        """!
+        @brief Vérifie qu'un vote incrémente la version et invalide l'ETag.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='alice')
+        url = reverse('session-state', args=[session.id_session])
+        etag = api_client.get(url)['ETag']
+
+        api_client.post(
+            reverse('partie-vote-card'),
+            {'username': 'alice', 'id_session': session.id_session, 'carte_choisie': '3'},
+            format='json'
+        )
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+        assert response.data['joueurs'][0]['carte_choisie'] == '3'
+
+    def test_state_version_bumped_by_writes(self, api_client):
+        """!
+        @brief Vérifie que chaque action d'écriture incrémente la version de la session.
+        """
+        session = SessionFactory(stories=[{'titre': 'S1'}])
+        id_session = session.id_session
+        api_client.post(reverse('partie-join-partie'), {'username': 'alice', 'id_session': id_session}, format='json')
+        api_client.post(reverse('partie-vote-card'),
+                        {'username': 'alice', 'id_session': id_session, 'carte_choisie': '5'}, format='json')
+        api_client.post(reverse('session-close-story', args=[id_session]), {'story_index': 0}, format='json')
+        api_client.post(reverse('partie-raz-vote'), {'id_session': id_session}, format='json')
+        api_client.post(reverse('partie-fin-partie'), {'username': 'alice', 'id_session': id_session}, format='json')
+
+        session.refresh_from_db()
+        assert session.version == 5
+
+    def test_state_session_not_found(self, api_client):
+        """!
+        @brief Vérifie l'erreur 404 pour une session inconnue, même avec un ETag.
+        """
+        response = api_client.get(reverse('session-state', args=['999999']), HTTP_IF_NONE_MATCH='"999999-0"')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestSessionChanges:
+    """!
+    @brief Tests de la vue asynchrone de long-polling `changes`.
+    """
+
+    @pytest.mark.django_db
+    def test_changes_returns_immediately_when_behind(self, api_client):
+        """!
+        @brief Vérifie qu'un client en retard reçoit tout de suite l'état complet.
+        """
+        session = SessionFactory(version=3)
+        response = api_client.get(reverse('session-changes', args=[session.id_session]) + '?since=1')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['full'] is True
+        assert response.json()['version'] == 3
+        assert response.json()['state']['id_session'] == session.id_session
+
+    @pytest.mark.django_db
+    def test_changes_timeout(self, api_client, settings):
+        """!
+        @brief Vérifie le 204 quand rien ne change avant l'expiration du délai.
+        """
+        settings.LONG_POLL_TIMEOUT = 0.2
+        settings.LONG_POLL_INTERVAL = 0.1
+        session = SessionFactory()
+        response = api_client.get(
+            reverse('session-changes', args=[session.id_session]) + f'?since={session.version}'
+        )
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize('shared', [True, False])
+    def test_changes_polls_db_only_without_shared_layer(self, api_client, settings, monkeypatch, shared):
+        """!
+        @brief Vérifie que la version n'est relue périodiquement qu'avec une couche de messages non partagée.
+
+        Avec une couche partagée : une lecture avant l'attente et une à l'expiration du délai.
+        """
+        settings.LONG_POLL_TIMEOUT = 0.3
+        settings.LONG_POLL_INTERVAL = 0.05
+        session = SessionFactory()
+        lectures = []
+        lire_version = views._session_version
+
+        async def compter(pk):
+            lectures.append(pk)
+            return await lire_version(pk)
+        monkeypatch.setattr(views, '_session_version', compter)
+        monkeypatch.setattr(views, '_layer_is_shared', lambda channel_layer: shared)
+
+        response = api_client.get(reverse('session-changes', args=[session.id_session]) + f'?since={session.version}')
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        if shared:
+            assert len(lectures) == 2
+        else:
+            assert len(lectures) >= 5
+
+    @pytest.mark.django_db
+    def test_changes_invalid_since(self, api_client):
+        """!
+        @brief Vérifie l'erreur 400 si `since` est absent ou non numérique.
+        """
+        session = SessionFactory()
+        url = reverse('session-changes', args=[session.id_session])
+        assert api_client.get(url).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(url + '?since=abc').status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.django_db
+    def test_changes_session_not_found(self, api_client):
+        """!
+        @brief Vérifie l'erreur 404 pour une session inconnue.
+        """
+        response = api_client.get(reverse('session-changes', args=['999999']) + '?since=0')
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.django_db(transaction=True)
+    def test_changes_wakes_up_on_vote(self, api_client, settings):
+        """!
+        @brief Vérifie qu'une requête en attente est réveillée par un vote et ne renvoie que ce vote.
+        """
+        settings.LONG_POLL_TIMEOUT = 5
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='alice')
+        url = reverse('session-changes', args=[session.id_session]) + f'?since={session.version}'
+        vote = {'username': 'alice', 'id_session': session.id_session, 'carte_choisie': '13'}
+
+        async def scenario():
+            attente = asyncio.ensure_future(AsyncClient().get(url))
+            await asyncio.sleep(0.2)
+            await sync_to_async(api_client.post)(reverse('partie-vote-card'), vote, format='json')
+            return await attente
+
+        response = async_to_sync(scenario)()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {
+            'version': session.version + 1,
+            'full': False,
+            'events': [{'type': 'vote_card', 'data': {'username': 'alice', 'carte_choisie': '13'}, 'version': session.version + 1}],
+        }
+
+    @pytest.mark.django_db(transaction=True)
+    def test_changes_with_missing_version_falls_back_to_snapshot(self, api_client, settings):
+        """!
+        @brief Vérifie qu'un événement déjà connu est ignoré et qu'une version manquante donne l'état complet.
+        """
+        settings.LONG_POLL_TIMEOUT = 5
+        session = SessionFactory(version=5)
+        url = reverse('session-changes', args=[session.id_session]) + '?since=5'
+
+        def message(version):
+            return {'type': 'session.event', 'event': 'vote_card', 'data': {'username': 'alice', 'carte_choisie': '3'}, 'version': version}
+
+        async def scenario():
+            attente = asyncio.ensure_future(AsyncClient().get(url))
+            await asyncio.sleep(0.2)
+            await sync_to_async(Session.objects.filter(pk=session.pk).update)(version=7)
+            couche = get_channel_layer()
+            await couche.group_send(group_name(session.id_session), message(5))  # déjà connu du client
+            await couche.group_send(group_name(session.id_session), message(7))  # la version 6 n'arrive jamais
+            return await attente
+
+        response = async_to_sync(scenario)()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['full'] is True
+        assert response.json()['version'] == 7
+
 
 @pytest.mark.django_db
 class TestPartieViewSet:
@@ -496,7 +981,7 @@ class TestPartieViewSet:
         )
         
         assert response.status_code == status.HTTP_200_OK
-        partie.refresh_from_db()
+        partie = Partie.objects.with_vote().get(pk=partie.pk)
         assert partie.carte_choisie == '13'
         assert partie.a_vote is True
     
@@ -540,7 +1025,7 @@ class TestPartieVoteCard:
         )
         
         assert response.status_code == status.HTTP_200_OK
-        partie.refresh_from_db()
+        partie = Partie.objects.with_vote().get(pk=partie.pk)
         assert partie.carte_choisie == '8'
         assert partie.a_vote is True
     
@@ -558,6 +1043,42 @@ class TestPartieVoteCard:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'error' in response.data
     
+    def test_vote_card_single_update(self, api_client, django_assert_num_queries):
+        """!
+        @brief Vérifie que le vote tient en cinq requêtes : UPDATE du joueur, version de la session
+        (UPDATE et relecture), journal et vote, dans une même transaction (SAVEPOINT et sa libération en test).
+        """
+        partie = PartieFactory(username='alice', carte_choisie=None)
+        with django_assert_num_queries(7):
+            response = api_client.post(
+                reverse('partie-vote-card'),
+                {'username': 'alice', 'id_session': partie.id_session_id, 'carte_choisie': '8'},
+                format='json'
+            )
+        assert response.status_code == status.HTTP_200_OK
+        partie = Partie.objects.with_vote().get(pk=partie.pk)
+        assert partie.carte_choisie == '8' and partie.a_vote
+
+    def test_vote_card_failure_rolls_back_vote(self, api_client, monkeypatch):
+        """!
+        @brief Vérifie qu'un échec de la publication annule aussi le vote : ni vote sans nouvelle version, ni version sans vote.
+        """
+        partie = PartieFactory(username='alice')
+        version = partie.id_session.version
+
+        def record(*args, **kwargs):
+            raise RuntimeError("journal indisponible")
+        monkeypatch.setattr('planning_poker.changelog.record', record)
+
+        with pytest.raises(RuntimeError):
+            api_client.post(
+                reverse('partie-vote-card'),
+                {'username': 'alice', 'id_session': partie.id_session_id, 'carte_choisie': '8'},
+                format='json'
+            )
+        assert not Vote.objects.filter(session_id=partie.id_session_id).exists()
+        assert Session.objects.get(pk=partie.id_session_id).version == version
+
     def test_vote_card_partie_not_found(self, api_client):
         """!
         @brief Vérifie l'erreur 404 si le joueur n'existe pas dans la session.
@@ -758,10 +1279,55 @@ class TestPartieRazVote:
         assert response.status_code == status.HTTP_200_OK
         
         # Vérifier que tous les votes sont réinitialisés
-        parties = Partie.objects.filter(id_session=session)
+        parties = Partie.objects.filter(id_session=session).with_vote()
         for partie in parties:
             assert partie.carte_choisie is None
             assert partie.a_vote is False
+
+    def test_raz_vote_starts_new_round(self, api_client, django_assert_num_queries):
+        """!
+        @brief Vérifie que la remise à zéro ne touche aucun joueur : la session passe à la manche
+        suivante (version, relecture et journal : trois requêtes quel que soit le nombre de joueurs).
+        """
+        session = SessionFactory()
+        for i in range(20):
+            PartieFactory(id_session=session, username=f'joueur{i}', carte_choisie='5')
+
+        with django_assert_num_queries(3):
+            response = api_client.post(reverse('partie-raz-vote'), {'id_session': session.id_session}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        session.refresh_from_db()
+        assert session.round == 1
+        assert not Partie.objects.filter(id_session=session).with_vote().filter(a_vote=True).exists()
+
+    def test_previous_rounds_are_kept(self, api_client):
+        """!
+        @brief Vérifie que les votes des manches précédentes restent consultables, même après le départ du joueur.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='alice', carte_choisie='5')
+        api_client.post(reverse('partie-raz-vote'), {'id_session': session.id_session}, format='json')
+        api_client.post(reverse('partie-vote-card'), {
+            'username': 'alice', 'id_session': session.id_session, 'carte_choisie': '8',
+        }, format='json')
+        api_client.post(reverse('partie-fin-partie'), {'username': 'alice', 'id_session': session.id_session}, format='json')
+
+        votes = Vote.objects.filter(session=session).order_by('round').values_list('round', 'username', 'carte')
+        assert list(votes) == [(0, 'alice', '5'), (1, 'alice', '8')]
+
+    def test_returning_player_has_no_vote(self, api_client):
+        """!
+        @brief Vérifie qu'un joueur parti puis revenu dans la même manche repart sans vote.
+        """
+        session = SessionFactory(status='in_progress')
+        PartieFactory(id_session=session, username='alice', carte_choisie='5')
+        api_client.post(reverse('partie-fin-partie'), {'username': 'alice', 'id_session': session.id_session}, format='json')
+
+        api_client.post(reverse('partie-join-partie'), {'username': 'alice', 'id_session': session.id_session}, format='json')
+
+        alice = Partie.objects.with_vote().get(id_session=session, username='alice')
+        assert (alice.carte_choisie, alice.a_vote) == (None, False)
     
     def test_raz_vote_missing_session_id(self, api_client):
         """!
@@ -797,6 +1363,25 @@ class TestPartieRazVote:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
+    def test_vote_locks_session_before_reading_round(self, api_client):
+        """!
+        @brief Vérifie que le vote verrouille la session (UPDATE de la version) avant de lire la manche :
+        une remise à zéro concurrente attend la fin du vote au lieu de s'intercaler entre le vote et sa publication.
+        """
+        session = SessionFactory()
+        PartieFactory(id_session=session, username='alice')
+
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.post(reverse('partie-vote-card'), {
+                'username': 'alice', 'id_session': session.pk, 'carte_choisie': '8',
+            }, format='json')
+
+        sql = [q['sql'] for q in ctx.captured_queries]
+        verrou = next(i for i, q in enumerate(sql) if q.startswith('UPDATE "planning_poker_session"'))
+        vote = next(i for i, q in enumerate(sql) if q.startswith('INSERT INTO "planning_poker_vote"'))
+        assert verrou < vote
+
+
 @pytest.mark.django_db
 class TestPartieUniqueTogether:
     """!
@@ -821,4 +1406,122 @@ class TestPartieUniqueTogether:
         response = api_client.post(reverse('partie-list'), data, format='json')
         
         # Accepter 400 ou 409 selon votre implémentation
-        assert response.status_code in [status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT]
\ No newline at end of file
+        assert response.status_code in [status.HTTP_400_BAD_REQUEST, status.HTTP_409_CONFLICT]
+
+@pytest.mark.django_db
+class TestBatch:
+    """!
+    @brief Tests de l'endpoint de lot (/api/batch/) : plusieurs actions en une transaction.
+    """
+
+    def test_fin_de_partie_en_un_appel(self, api_client):
+        """!
+        @brief Vérifie l'enchaînement raz_vote + close_session + fin_partie et les résultats par opération.
+        """
+        session = SessionFactory(status='in_progress')
+        PartieFactory(id_session=session, username='Alice', carte_choisie='5', a_vote=True)
+        PartieFactory(id_session=session, username='Bob', carte_choisie='8', a_vote=True)
+
+        response = api_client.post(reverse('batch'), {'operations': [
+            {'op': 'raz_vote', 'params': {'id_session': session.id_session}},
+            {'op': 'close_session', 'params': {'id_session': session.id_session, 'status': 'closed'}},
+            {'op': 'fin_partie', 'params': {'id_session': session.id_session, 'username': 'Alice'}},
+        ]}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [r['op'] for r in response.data['results']] == ['raz_vote', 'close_session', 'fin_partie']
+        assert all(r['status'] == 200 for r in response.data['results'])
+        assert response.data['results'][1]['data'] == {'status': 'Session fermée'}
+        session.refresh_from_db()
+        assert session.status == 'closed'
+        bob = Partie.objects.with_vote().get(id_session=session)
+        assert bob.username == 'Bob' and bob.a_vote is False
+
+    def test_close_story_et_vote(self, api_client):
+        """!
+        @brief Vérifie les opérations sur une session (`pk` lu dans `id_session`) mêlées aux votes.
+        """
+        session = SessionFactory(status='in_progress', mode_de_jeu='strict', stories=[{'titre': 'Login', 'contenu': ''}])
+        PartieFactory(id_session=session, username='Alice')
+
+        response = api_client.post(reverse('batch'), {'operations': [
+            {'op': 'vote_card', 'params': {'id_session': session.id_session, 'username': 'Alice', 'carte_choisie': '5'}},
+            {'op': 'close_story', 'params': {'id_session': session.id_session, 'story_index': 0}},
+        ]}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][1]['status'] == 200
+        assert Story.objects.get(session=session, position=0).valeur_finale == '5'
+
+    def test_echec_annule_tout_le_lot(self, api_client):
+        """!
+        @brief Vérifie qu'une opération en échec annule les précédentes et arrête le lot.
+        """
+        session = SessionFactory(status='in_progress')
+
+        response = api_client.post(reverse('batch'), {'operations': [
+            {'op': 'close_session', 'params': {'id_session': session.id_session, 'status': 'closed'}},
+            {'op': 'fin_partie', 'params': {'id_session': session.id_session, 'username': 'Inconnu'}},
+            {'op': 'join_partie', 'params': {'id_session': session.id_session, 'username': 'Bob'}},
+        ]}, format='json')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert [r['status'] for r in response.data['results']] == [200, 404]
+        session.refresh_from_db()
+        assert session.status == 'in_progress'
+        assert not Partie.objects.filter(id_session=session).exists()
+
+    def test_lot_annule_ne_met_pas_le_decompte_en_cache(self, api_client, django_capture_on_commit_callbacks):
+        """!
+        @brief Vérifie que le décompte lu par `close_story` dans un lot annulé (vote non validé) n'est pas mis en cache.
+        """
+        session = SessionFactory(status='in_progress', stories=[{'titre': 'Login', 'contenu': ''}])
+        PartieFactory(id_session=session, username='Alice')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(reverse('batch'), {'operations': [
+                {'op': 'vote_card', 'params': {'id_session': session.id_session, 'username': 'Alice', 'carte_choisie': '5'}},
+                {'op': 'close_story', 'params': {'id_session': session.id_session, 'story_index': 0}},
+                {'op': 'fin_partie', 'params': {'id_session': session.id_session, 'username': 'Inconnu'}},
+            ]}, format='json')
+
+        assert [r['status'] for r in response.data['results']] == [200, 200, 404]
+        assert cache.get(tally._key(session.id_session)) is None
+        assert tally.get_tally(session.id_session)['histogram'] == {}
+
+    def test_session_inconnue_pour_close_story(self, api_client):
+        """!
+        @brief Vérifie que le 404 levé par `get_object` devient un résultat d'opération.
+        """
+        response = api_client.post(reverse('batch'), {'operations': [
+            {'op': 'close_story', 'params': {'id_session': '999999', 'story_index': 0}},
+        ]}, format='json')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.data['results'][0]['op'] == 'close_story'
+
+    @pytest.mark.parametrize('operations', [
+        None,
+        [],
+        [{'op': 'destroy', 'params': {}}],
+        [{'op': 'vote_card', 'params': 'pas un objet'}],
+    ])
+    def test_lot_invalide(self, api_client, operations):
+        """!
+        @brief Vérifie le rejet (400) d'un lot vide, mal formé ou contenant une action non autorisée.
+        """
+        response = api_client.post(reverse('batch'), {'operations': operations}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_trop_d_operations(self, api_client, settings):
+        """!
+        @brief Vérifie la limite `BATCH_MAX_OPERATIONS`.
+        """
+        settings.BATCH_MAX_OPERATIONS = 2
+        session = SessionFactory()
+        operations = [{'op': 'raz_vote', 'params': {'id_session': session.id_session}}] * 3
+
+        response = api_client.post(reverse('batch'), {'operations': operations}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Session.objects.get(pk=session.pk).version == session.version
@@ -3,7 +3,7 @@ import {Box, Container, Typography, Stack, Button, TextField, Card, CardContent,
 import PlayArrowIcon from '@mui/icons-material/PlayArrow';
 import AddIcon from '@mui/icons-material/Add';
 import RefreshIcon from '@mui/icons-material/Refresh';
-import { fetchSessions, joinPartie } from '../services/api';
+import { fetchLobby, joinPartie } from '../services/api';
 
 const componentStyles = {
     refreshButton: {
@@ -14,12 +14,6 @@ const componentStyles = {
         '&:hover': { 
             boxShadow: 3 
         }
-    },
-    storyBox: {
-        border: '2px solid',
-        borderColor: 'grey.300',
-        p: 1,
-        borderRadius: 1
     }
 };
 
@@ -27,17 +21,19 @@ const componentStyles = {
 
 export default function AccueilUser() {
   const [sessions, setSessions] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(false);
   const [joinCode, setJoinCode] = useState('');
   const [creating, setCreating] = useState(false);
 
 
-// Appel l'API pour récupérer les sessions de la bdd
-  const loadSessions = async () => {
+// Appel l'API pour récupérer les sessions de la bdd (première page, ou page suivante si `more`)
+  const loadSessions = async (more = false) => {
     setLoading(true);
     try {
-      const data = await fetchSessions();
-      setSessions(data);
+      const data = await fetchLobby(more ? nextPage : null);
+      setSessions(prev => (more ? [...prev, ...data.results] : data.results));
+      setNextPage(data.next);
     } finally {
       setLoading(false);
     }
@@ -51,7 +47,9 @@ export default function AccueilUser() {
 
   // Appel l'API pour envoyer le code session et le username puis redirige vers la page partie
   const handleJoin = async () => {
-    if (!joinCode.trim()) return;
+    // Code normalisé comme côté serveur : les codes alphanumériques sont en majuscules
+    const code = joinCode.trim().toUpperCase();
+    if (!code) return;
     // Envoi a l'api partie l'id_session et le username (depuis cookie)
     const username = document.cookie
       .split('; ')
@@ -61,15 +59,15 @@ export default function AccueilUser() {
       console.warn('Username cookie not found');
     } else {
       try {
-        const res = await joinPartie(joinCode, username);
+        const res = await joinPartie(code, username);
 
         if (res?.status === 'closed') {
           console.log('Session closed, redirecting to results');
-          window.location.href = `/partie/${joinCode}/resultats`;
+          window.location.href = `/partie/${code}/resultats`;
           return; // si tu mets pas de return ici, il continue et ouvre la page partie...
         } else {
           const gameMode = res?.mode_de_jeu || 'strict';
-          window.location.href = `/partie/${joinCode}?mode=${gameMode}`; // + gamemode !!
+          window.location.href = `/partie/${code}?mode=${gameMode}`; // + gamemode !!
         }
         // Ouvre la page partie
       //window.location.href = `/partie/${joinCode}`;
@@ -80,7 +78,7 @@ export default function AccueilUser() {
     setJoinCode('');
   };
   
- // Charge les sessions au montage du composant (grace au fetchSessions plus haut)
+ // Charge les sessions au montage du composant (grace au loadSessions plus haut)
   useEffect(() => {
     loadSessions(); 
   }, []);
@@ -143,7 +141,7 @@ export default function AccueilUser() {
                 <Button
                   size="small"
                   variant="outlined"
-                  onClick={loadSessions}
+                  onClick={() => loadSessions()}
                   startIcon={<RefreshIcon />}
                   disabled={loading}
                   sx={componentStyles.refreshButton}
@@ -191,27 +189,25 @@ export default function AccueilUser() {
                       {getStatusChip(s.status)} 
                     </Stack>
 
-                    {/* Affichage des stories */}
-                    <Stack spacing={1} mt={2}>
-                      {s.stories && s.stories.map((story, index) => (
-                        <Box key={story.titre + index} sx={componentStyles.storyBox}>
-                          <Typography variant="subtitle2" fontWeight={500}>
-                            {story.titre}
-                          </Typography>
-                          <Typography variant="body2" color="text.secondary">
-                            {story.contenu}
-                          </Typography>
-                          <Typography variant="caption" color="text.secondary">
-                            Valeur: {story.valeur_finale}
-                          </Typography>
-                        </Box>
-                      ))}
+                    {/* Résumé : le détail des stories est chargé par la page de la partie */}
+                    <Stack direction="row" spacing={1} mt={2}>
+                      <Chip size="small" variant="outlined" label={`${s.nb_stories} stories`} />
+                      <Chip size="small" variant="outlined" label={`${s.nb_joueurs} joueurs`} />
                     </Stack>
                   </CardContent>
                 </Card>
               ))}
             </Stack>
 
+            {/* Page suivante du lobby */}
+            {nextPage && (
+              <Box display="flex" justifyContent="center" mt={2}>
+                <Button size="small" onClick={() => loadSessions(true)} disabled={loading}>
+                  Charger plus
+                </Button>
+              </Box>
+            )}
+
           </CardContent>
         </Card>
       </Stack>
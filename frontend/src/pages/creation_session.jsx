@@ -44,6 +44,8 @@ export default function ModeSelection() {
         { value: 'average', label: 'Moyenne' },
         { value: 'majority_abs', label: 'Majorité Absolue' },
         { value: 'majority_rel', label: 'Majorité Relative' },
+        { value: 'min', label: 'Minimum (Optimiste)' },
+        { value: 'max', label: 'Maximum (Pessimiste)' },
     ];
     const [titreSession, setTitreSession] = useState("");
 
@@ -4,8 +4,9 @@ import { useParams, useNavigate } from 'react-router-dom'; // AJOUT useNavigate
 import { Container, Stack, Box, Typography, Chip, Divider } from '@mui/material';
 
 // Imports Logic & Services
-import { fetchSessionById, fetchVotes, closeStory, finPartie, voteCard, razVote } from '../services/api';
+import { fetchSessionById, fetchSessionDelta, waitForChanges, closeStory, finPartie, voteCard, razVote } from '../services/api';
 import { getCardSet } from '../services/card';
+import { subscribeToSession } from '../services/socket';
 
 // Imports Composants
 import StoryDisplay from '../components/partie/StoryDisplay';
@@ -28,12 +29,16 @@ export default function GameSession() {
     // const [isAllVoted, setIsAllVoted] = useState(false); // Indique si tous les joueurs ont voté
     // const [storyClosed, setStoryClosed] = useState(0); // Indique si la story a été fermée
     const storyClosedRef = useRef(0);
+    // État synchronisé par delta : joueurs connus (par nom) et version correspondante
+    const joueursRef = useRef(new Map());
+    const versionRef = useRef(-1);
     // ----------------------
 
     const [selectedCard, setSelectedCard] = useState(null); 
     const [votes, setVotes] = useState({}); 
     const [showVotes, setShowVotes] = useState(false); 
     const [loading, setLoading] = useState(true);
+    const [socketConnected, setSocketConnected] = useState(false);
     // Variable dérivée : la story actuelle dépend de l'index
     const currentStory = allStories[storyIndex] || null;
     const cardSet = getCardSet(gameMode);
@@ -60,8 +65,25 @@ export default function GameSession() {
     const refreshGameState = useCallback(async () => {
         if (!id_session) return;
         try {
-            // Récupérer les votes actuels
-            const dataPartie = await fetchVotes(id_session);
+            // Récupérer seulement les changements depuis la dernière version connue
+            const delta = await fetchSessionDelta(id_session, versionRef.current);
+            if (!delta || delta.version < versionRef.current) return; // erreur, ou réponse dépassée
+            const joueurs = delta.full ? new Map() : joueursRef.current;
+            if (delta.raz) {
+                joueurs.forEach(player => { player.carte_choisie = null; player.a_vote = false; });
+            }
+            delta.joueurs.forEach(player => joueurs.set(player.username, player));
+            delta.partis.forEach(name => joueurs.delete(name));
+            joueursRef.current = joueurs;
+            versionRef.current = delta.version;
+            if (delta.stories.length) {
+                setAllStories(prev => {
+                    const next = delta.full ? [] : [...prev];
+                    delta.stories.forEach(story => { next[story.position] = story; });
+                    return next;
+                });
+            }
+            const dataPartie = [...joueurs.values()];
             const votesMap = {};
             if (Array.isArray(dataPartie)) {
                 dataPartie.forEach(player => {
@@ -92,17 +114,18 @@ export default function GameSession() {
     // --- GESTION DU BOUTON SUIVANT ---
     const handleNextStory = async () => {
         try {
-            await razVote(id_session);
             const nextIndex = storyIndex + 1;
             
             // ENSUITE on nettoie l'interface pour le tour suivant
             if (nextIndex < allStories.length) {
+                await razVote(id_session);
                 setStoryIndex(nextIndex);
                 setShowVotes(false);
                 setSelectedCard(null); // <-- Le reset se fait ici, APRES l'envoi
                 setVotes({});
             } else {
-                await finPartie(id_session, username);
+                // Dernière story : remise à zéro + fermeture + départ en une seule requête
+                await finPartie(id_session, username, { razVote: true });
                 navigate(`/partie/${id_session}/resultats`);
             }
         } catch (err) {
@@ -110,12 +133,43 @@ export default function GameSession() {
         }
     };
 
-    // Cycles de vie Chargé au demarrage et polling toutes les 2s
+    // Cycles de vie : chargement initial
     useEffect(() => {
         fetchSessionData(); // charge les données initiales 1 fois
-        const intervalId = setInterval(refreshGameState, 2000); // polling toutes les 2s
-        return () => clearInterval(intervalId); // cleanup au démontage
-    }, [fetchSessionData, refreshGameState]);
+    }, [fetchSessionData]);
+
+    // Référence vers la dernière version du rafraîchissement (évite de rouvrir la socket à chaque story)
+    const refreshRef = useRef(refreshGameState);
+    useEffect(() => {
+        refreshRef.current = refreshGameState;
+    }, [refreshGameState]);
+
+    // Temps réel : on ne rafraîchit l'état que lorsque le serveur signale un changement
+    useEffect(() => {
+        refreshRef.current();
+        return subscribeToSession(id_session, () => refreshRef.current(), setSocketConnected);
+    }, [id_session]);
+
+    // Repli : long-polling uniquement si la socket est indisponible (proxy qui bloque les WebSockets)
+    useEffect(() => {
+        if (socketConnected) return;
+        const controller = new AbortController();
+        const attendreChangements = async () => {
+            let version = -1; // le premier appel renvoie immédiatement l'état courant
+            while (!controller.signal.aborted) {
+                const result = await waitForChanges(id_session, version, controller.signal);
+                if (result === null) {
+                    // Erreur réseau : on patiente avant de réessayer
+                    await new Promise(resolve => setTimeout(resolve, 2000));
+                } else if (result.version !== undefined) {
+                    version = result.version;
+                    refreshRef.current();
+                }
+            }
+        };
+        attendreChangements();
+        return () => controller.abort(); // cleanup au démontage
+    }, [socketConnected, id_session]);
 
     // Handlers
     const handleCardClick = async (value) => {
@@ -2,21 +2,20 @@
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api'; 
 import axios from "axios";  
 /**
- * Récupère la liste des sessions existantes depuis le backend.
- * @returns {Promise<Array>} Liste des sessions.
+ * Récupère une page du lobby (résumés de sessions paginés par curseur).
+ * @param {string|null} next URL complète de la page suivante (champ `next` de la réponse), ou null pour la première page.
+ * @returns {Promise<{results: Array, next: string|null}>} Sessions de la page et lien vers la suivante.
  */
-export const fetchSessions = async () => {
+export const fetchLobby = async (next = null) => {
   try {
-    const response = await fetch(`${API_BASE_URL}/sessions/`);
+    const response = await fetch(next || `${API_BASE_URL}/sessions/lobby/`);
     if (!response.ok) {
       throw new Error(`Erreur HTTP: ${response.status}`);
     }
-    const sessions = await response.json();
-    console.log("Sessions récupérées:", sessions);
-    return sessions;
+    return await response.json();
   } catch (error) {
-    console.error("Erreur lors de la récupération des sessions:", error);
-    return []; 
+    console.error("Erreur lors de la récupération du lobby:", error);
+    return { results: [], next: null };
   }
 };
 
@@ -88,17 +87,37 @@ export const fetchSessionById = async (id_session) => {
 };
 
 
-// Récupérer les votes pour une session donnée
-export const fetchVotes = async (id_session) => {
+// Récupérer uniquement ce qui a changé depuis la version `since` (-1 : état complet)
+// Renvoie { version, full, status, raz, joueurs, partis, stories } ; si `full` vaut true,
+// la réponse remplace tout l'état connu (client trop en retard), sinon elle s'y applique.
+export const fetchSessionDelta = async (id_session, since) => {
   try {
-    // On appelle l'endpoint 'parties' avec le filtre id_session
-    const response = await axios.get(`${API_BASE_URL}/parties/`, { 
-        params: { id_session: id_session } 
-    });
-    return response.data;
+    const response = await fetch(`${API_BASE_URL}/sessions/${id_session}/delta/?since=${since}`, { cache: 'no-store' });
+    if (!response.ok) {
+      throw new Error(`Erreur HTTP: ${response.status}`);
+    }
+    return await response.json();
+  } catch (error) {
+    console.error("Erreur lors de la récupération des changements:", error);
+    return null;
+  }
+};
+
+// Long-polling : attend que la version de la session dépasse `since` (repli si la WebSocket est bloquée)
+// Renvoie le corps JSON ({ version, full, ... }), {} si rien n'a changé (204), ou null en cas d'erreur.
+export const waitForChanges = async (id_session, since, signal) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/sessions/${id_session}/changes/?since=${since}`, { signal });
+    if (response.status === 204) return {};
+    if (!response.ok) {
+      throw new Error(`Erreur HTTP: ${response.status}`);
+    }
+    return await response.json();
   } catch (error) {
-    console.error("Erreur lors de la récupération des votes:", error);
-    return []; // Retourne un tableau vide en cas d'erreur pour ne pas casser le front
+    if (error.name !== 'AbortError') {
+      console.error("Erreur lors de l'attente des changements:", error);
+    }
+    return null;
   }
 };
 
@@ -142,25 +161,40 @@ export const closeStory = async (id_session, storyIndex) => {
   }
 };
 
-export const finPartie = async (id_session, username) => {
+/**
+ * Exécute plusieurs actions de jeu en une seule requête (et une seule transaction côté serveur).
+ * En cas d'échec d'une opération, aucune n'est appliquée.
+ * @param {Array<{op: string, params: object}>} operations
+ * @returns {Promise<Array<{op: string, status: number, data: object}>>} Résultats, dans l'ordre.
+ */
+export const runBatch = async (operations) => {
   try {
-    const finishRes = await fetch(`${API_BASE_URL}/sessions/${id_session}/close_session/`, {
+    const response = await fetch(`${API_BASE_URL}/batch/`, {
       method: 'POST',
       headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ status: "closed" }),
+      body: JSON.stringify({ operations }),
     });
-    if (!finishRes.ok) throw new Error('Erreur fin partie');
-    const finishData = await finishRes.json();
-
-    const deleteRes = await fetch(`${API_BASE_URL}/parties/fin_partie/`, {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ id_session, username }),
-    });
-    if (!deleteRes.ok) throw new Error('Erreur suppression partie');
-    const deleteData = await deleteRes.json().catch(() => null);
+    if (!response.ok) throw new Error('Erreur lot d\'opérations');
+    const data = await response.json();
+    return data.results;
+  } catch (error) {
+    console.error("Erreur runBatch:", error);
+    throw error;
+  }
+};
 
-    return { finish: finishData, delete: deleteData };
+export const finPartie = async (id_session, username, { razVote = false } = {}) => {
+  try {
+    // Remise à zéro (optionnelle), fermeture et départ du joueur en un seul aller-retour
+    const operations = [
+      { op: 'close_session', params: { id_session, status: "closed" } },
+      { op: 'fin_partie', params: { id_session, username } },
+    ];
+    if (razVote) operations.unshift({ op: 'raz_vote', params: { id_session } });
+    const results = await runBatch(operations);
+    const [finish, removal] = results.slice(-2);
+
+    return { finish: finish.data, delete: removal.data };
   } catch (error) {
     console.error("Erreur finPartie:", error);
     throw error;
@@ -0,0 +1,53 @@
+// src/services/socket.js
+const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api';
+// Par défaut, la socket est servie par le même hôte que l'API (http -> ws, https -> wss)
+const WS_BASE_URL = import.meta.env.VITE_WS_BASE_URL
+  || API_BASE_URL.replace(/^http/, 'ws').replace(/\/api\/?$/, '');
+
+/**
+ * Ouvre le canal temps réel d'une session et relaye ses événements.
+ * Les écritures restent faites via l'API REST : la socket ne sert qu'à être notifié.
+ * @param {string} id_session - Code de la session.
+ * @param {Function} onEvent - Appelée avec chaque message `{ type, data }`.
+ * @param {Function} onStatusChange - Appelée avec `true` (connecté) ou `false` (déconnecté).
+ * @returns {Function} Fonction de fermeture de la socket.
+ */
+export const subscribeToSession = (id_session, onEvent, onStatusChange = () => {}) => {
+  let socket = null;
+  let closedByClient = false;
+  let retryTimeout = null;
+  let retryDelay = 1000;
+
+  const connect = () => {
+    socket = new WebSocket(`${WS_BASE_URL}/ws/sessions/${id_session}/`);
+
+    socket.onopen = () => {
+      retryDelay = 1000;
+      onStatusChange(true);
+    };
+
+    socket.onmessage = (message) => {
+      try {
+        onEvent(JSON.parse(message.data));
+      } catch (error) {
+        console.error("Message WebSocket invalide:", error);
+      }
+    };
+
+    socket.onclose = () => {
+      onStatusChange(false);
+      if (closedByClient) return;
+      // Reconnexion avec un délai croissant (max 30s)
+      retryTimeout = setTimeout(connect, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, 30000);
+    };
+  };
+
+  connect();
+
+  return () => {
+    closedByClient = true;
+    clearTimeout(retryTimeout);
+    if (socket) socket.close();
+  };
+};